@@ -0,0 +1,511 @@
+"""
+Local stand-ins for the Confluence and Azure OpenAI APIs, used by the sync benchmark.
+
+Both servers run in a background thread on 127.0.0.1 and serve only the endpoints the
+clients in backend/src/clients call, with the response fields those clients read.
+Every request can be delayed, failed with a 5xx or throttled with a 429 (with Retry-After)
+according to a FaultProfile, so retries, rate limiting and adaptive concurrency are exercised
+the same way as against the real services.
+
+Pages come from a SyntheticCorpus generated on demand from the page number, so corpora of
+100k pages cost no memory up front.
+"""
+
+import json
+import random
+import threading
+import time
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pydantic import BaseModel
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# Page size of the fake Confluence v2 listings, matching the limit=250 requested by the clients.
+CONFLUENCE_PAGE_SIZE = 250
+# Words the synthetic page bodies are made of.
+_WORDS = (
+    "release deployment pipeline service customer invoice report quarterly roadmap incident "
+    "postmortem onboarding architecture database migration latency throughput security review "
+    "policy retention backup dashboard metric alert owner team sprint backlog contract budget"
+).split()
+
+
+class FaultProfile(BaseModel):
+    """Latency and failures injected into every request of a fake service."""
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit: float = 0.0
+    retry_after_seconds: float = 1.0
+
+
+class SyntheticCorpus:
+    def __init__(self, num_pages: int, num_spaces: int | None = None, body_kb: float = 4.0, seed: int = 0):
+        """
+        Deterministic Confluence content: spaces, page trees and storage-format bodies.
+
+        Page n belongs to space n % num_spaces. Within a space, pages form a tree with up to
+        ten children per page, so both wide and deep hierarchies appear in larger corpora.
+
+        Args:
+            num_pages: Total number of pages.
+            num_spaces: Number of spaces. Defaults to one space per 1000 pages.
+            body_kb: Approximate size of each page body.
+            seed: Seed of the generated text; the same seed always yields the same corpus.
+        """
+        self.num_pages = num_pages
+        self.num_spaces = num_spaces or max(1, num_pages // 1000)
+        self.body_kb = body_kb
+        self.seed = seed
+        self.created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def page_ids(self) -> list[str]:
+        return [self.page_id(n) for n in range(self.num_pages)]
+
+    def page_id(self, n: int) -> str:
+        return str(1_000_000 + n)
+
+    def page_number(self, page_id: str) -> int | None:
+        try:
+            n = int(page_id) - 1_000_000
+        except ValueError:
+            return None
+        return n if 0 <= n < self.num_pages else None
+
+    def space_id(self, s: int) -> str:
+        return str(10_000 + s)
+
+    def space_number(self, space_id: str) -> int | None:
+        try:
+            s = int(space_id) - 10_000
+        except ValueError:
+            return None
+        return s if 0 <= s < self.num_spaces else None
+
+    def space(self, s: int) -> dict:
+        return {"id": self.space_id(s), "key": f"SP{s}", "name": f"Space {s}", "type": "global", "status": "current"}
+
+    def space_page_count(self, s: int) -> int:
+        return len(range(s, self.num_pages, self.num_spaces))
+
+    def space_page(self, s: int, k: int) -> int:
+        """Page number of the k-th page of space s."""
+        return s + k * self.num_spaces
+
+    def page_summary(self, n: int) -> dict:
+        """The page as returned by the v2 page listings."""
+        k = n // self.num_spaces
+        parent = self.space_page(n % self.num_spaces, (k - 1) // 10) if k else None
+        return {
+            "id": self.page_id(n),
+            "status": "current",
+            "title": f"Page {n}",
+            "spaceId": self.space_id(n % self.num_spaces),
+            "parentId": self.page_id(parent) if parent is not None else None,
+            "parentType": "page" if parent is not None else None,
+            "version": {"number": 1, "createdAt": self.modified_at(n)},
+        }
+
+    def modified_at(self, n: int) -> str:
+        return (self.created_at + timedelta(seconds=n)).isoformat().replace("+00:00", "Z")
+
+    def page_content(self, n: int) -> dict:
+        """The page as returned by /wiki/rest/api/content/{id}?expand=body.storage,version,space."""
+        return {
+            "id": self.page_id(n),
+            "type": "page",
+            "status": "current",
+            "title": f"Page {n}",
+            "version": {"number": 1},
+            "space": self.space(n % self.num_spaces),
+            "body": {"storage": {"value": self.page_body(n), "representation": "storage"}},
+        }
+
+    def page_body(self, n: int) -> str:
+        """Storage-format HTML with headings, paragraphs, lists, a table, links and images."""
+        rng = random.Random(self.seed * 1_000_003 + n)
+
+        def sentence() -> str:
+            return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 18))).capitalize() + "."
+
+        parts = [f"<h1>Page {n}</h1>"]
+        size = 0
+        while size < self.body_kb * 1024:
+            section = [
+                f"<h2>{sentence()}</h2>",
+                f"<p>{sentence()} {sentence()} <a href=\"https://example.com/{rng.randint(1, 999)}\">{rng.choice(_WORDS)}</a> {sentence()}</p>",
+                "<ul>" + "".join(f"<li>{sentence()}</li>" for _ in range(rng.randint(2, 5))) + "</ul>",
+                "<table><tbody>" + "".join(
+                    f"<tr><th>{rng.choice(_WORDS)}</th><td>{rng.randint(0, 10_000)}</td><td>{sentence()}</td></tr>"
+                    for _ in range(rng.randint(2, 4))
+                ) + "</tbody></table>",
+                f"<ac:image><ri:attachment ri:filename=\"diagram-{n}-{rng.randint(1, 99)}.png\" /></ac:image>",
+            ]
+            parts.extend(section)
+            size += sum(len(part) for part in section)
+        return "".join(parts)
+
+
+class _FakeServer:
+    def __init__(self, name: str, faults: FaultProfile | None = None, seed: int = 0):
+        self.name = name
+        self.faults = faults or FaultProfile()
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_started = time.monotonic()
+        self._window_count = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_FakeServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(sorted(self.stats.items()))
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        parts = urlsplit(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        delay = max(self.faults.latency_ms + self._uniform(-1, 1) * self.faults.jitter_ms, 0.0) / 1000
+        time.sleep(delay)
+
+        fault = self._fault()
+        with self._lock:
+            self.stats["requests"] += 1
+            if fault:
+                self.stats[f"status_{fault}"] += 1
+        if fault == 429:
+            self._send(handler, 429, {"error": {"code": "429", "message": "Too many requests."}}, self._retry_after_headers())
+            return
+        if fault:
+            self._send(handler, fault, {"error": {"code": str(fault), "message": "Injected server error."}})
+            return
+
+        try:
+            status, payload = self.route(method, parts.path, query, body, handler.headers)
+        except Exception as e:
+            status, payload = 500, {"error": {"code": "500", "message": f"Fake {self.name} failed: {e}"}}
+        if status != 200:
+            with self._lock:
+                self.stats[f"status_{status}"] += 1
+        self._send(handler, status, payload)
+
+    def route(self, method: str, path: str, query: dict[str, str], body: bytes, headers) -> tuple[int, dict]:
+        raise NotImplementedError
+
+    def _fault(self) -> int | None:
+        """Returns the status of the injected failure for this request, if any."""
+        with self._lock:
+            if self.faults.rate_limit > 0:
+                now = time.monotonic()
+                if now - self._window_started >= 1.0:
+                    self._window_started, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.faults.rate_limit:
+                    return 429
+            roll = self._rng.random()
+        if roll < self.faults.throttle_rate:
+            return 429
+        if roll < self.faults.throttle_rate + self.faults.error_rate:
+            return 503
+        return None
+
+    def _retry_after_headers(self) -> dict[str, str]:
+        return {"Retry-After": f"{self.faults.retry_after_seconds:g}"}
+
+    def _uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._rng.uniform(low, high)
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class FakeConfluenceServer(_FakeServer):
+    def __init__(self, corpus: SyntheticCorpus, faults: FaultProfile | None = None, seed: int = 0):
+        """
+        Serves a SyntheticCorpus through the Confluence endpoints used by the page and catalog clients:
+        /wiki/api/v2/spaces, /wiki/api/v2/spaces/{id}/pages, /wiki/api/v2/pages and /wiki/rest/api/content/{id}.
+        """
+        super().__init__("confluence", faults, seed)
+        self.corpus = corpus
+
+    def route(self, method, path, query, body, headers):
+        segments = path.strip("/").split("/")
+        if method != "GET":
+            return 405, {"message": "Method not allowed."}
+
+        if segments[:4] == ["wiki", "rest", "api", "content"] and len(segments) == 5:
+            n = self.corpus.page_number(segments[4])
+            if n is None:
+                return 404, {"message": f"Page {segments[4]} not found."}
+            return 200, self.corpus.page_content(n)
+
+        if segments[:3] != ["wiki", "api", "v2"]:
+            return 404, {"message": f"Unknown path {path}."}
+        resource = segments[3:]
+
+        if resource == ["spaces"]:
+            return 200, self._paginated(path, query, self.corpus.num_spaces, self.corpus.space)
+
+        if len(resource) == 3 and resource[0] == "spaces" and resource[2] == "pages":
+            s = self.corpus.space_number(resource[1])
+            if s is None:
+                return 404, {"message": f"Space {resource[1]} not found."}
+            return 200, self._paginated(
+                path, query, self.corpus.space_page_count(s),
+                lambda k: self.corpus.page_summary(self.corpus.space_page(s, k))
+            )
+
+        if resource == ["pages"]:
+            if "id" in query:
+                numbers = [self.corpus.page_number(page_id) for page_id in query["id"].split(",")]
+                return 200, {"results": [self.corpus.page_summary(n) for n in numbers if n is not None], "_links": {}}
+            # Sorted by -modified-date: the most recently created page first.
+            last = self.corpus.num_pages - 1
+            return 200, self._paginated(path, query, self.corpus.num_pages, lambda i: self.corpus.page_summary(last - i))
+
+        return 404, {"message": f"Unknown path {path}."}
+
+    def _paginated(self, path: str, query: dict[str, str], total: int, item) -> dict:
+        """One page of a cursor-paginated v2 listing; the cursor is the offset of the next item."""
+        limit = min(int(query.get("limit", CONFLUENCE_PAGE_SIZE)), CONFLUENCE_PAGE_SIZE)
+        start = int(query.get("cursor", 0))
+        end = min(start + limit, total)
+        links = {}
+        if end < total:
+            links["next"] = f"{path}?{urlencode({**query, 'cursor': end})}"
+        return {"results": [item(i) for i in range(start, end)], "_links": links}
+
+
+class FakeAzureServer(_FakeServer):
+    def __init__(
+        self,
+        faults: FaultProfile | None = None,
+        indexing_ms: float = 500.0,
+        indexing_failure_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        In-memory Azure OpenAI files and vector stores API, as called by AzureVectorStoreManager.
+
+        Uploaded file contents are counted and discarded. A file batch stays in progress for
+        indexing_ms after it is created; each of its files then fails with indexing_failure_rate.
+        """
+        super().__init__("azure", faults, seed)
+        self.indexing_ms = indexing_ms
+        self.indexing_failure_rate = indexing_failure_rate
+        self.files: dict[str, dict] = {}
+        self.vector_stores: dict[str, dict] = {}
+        self.store_files: dict[str, dict[str, dict]] = {}
+        self.batches: dict[str, dict] = {}
+        self._ids = Counter()
+
+    def create_vector_store(self, name: str) -> str:
+        vector_store_id = self._new_id("vs")
+        with self._lock:
+            self.vector_stores[vector_store_id] = {
+                "id": vector_store_id, "object": "vector_store", "name": name, "status": "completed",
+                "created_at": int(time.time()), "last_active_at": int(time.time()), "usage_bytes": 0, "metadata": {}
+            }
+            self.store_files[vector_store_id] = {}
+        return vector_store_id
+
+    def _retry_after_headers(self) -> dict[str, str]:
+        return {
+            "Retry-After": f"{self.faults.retry_after_seconds:g}",
+            "retry-after-ms": f"{self.faults.retry_after_seconds * 1000:g}"
+        }
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            self._ids[prefix] += 1
+            return f"{prefix}-{self._ids[prefix]:08d}"
+
+    def route(self, method, path, query, body, headers):
+        segments = path.strip("/").split("/")
+        if segments[:1] != ["openai"]:
+            return 404, {"error": {"message": f"Unknown path {path}."}}
+        resource = segments[1:]
+
+        if resource == ["files"] and method == "POST":
+            return 200, self._create_file(body, headers)
+        if resource == ["files"] and method == "GET":
+            with self._lock:
+                files = [f for f in self.files.values() if f["purpose"] == query.get("purpose", f["purpose"])]
+            return 200, self._list(files, query)
+        if len(resource) == 2 and resource[0] == "files" and method == "GET":
+            file = self.files.get(resource[1])
+            return (200, file) if file else (404, {"error": {"message": f"No such file {resource[1]}."}})
+
+        if resource == ["vector_stores"] and method == "GET":
+            with self._lock:
+                vector_stores = [self._vector_store(vs) for vs in self.vector_stores]
+            return 200, self._list(vector_stores, query)
+        if resource[:1] != ["vector_stores"] or len(resource) < 3 or resource[1] not in self.vector_stores:
+            return 404, {"error": {"message": f"Unknown path {path}."}}
+
+        vector_store_id, rest = resource[1], resource[2:]
+        if rest == ["files"] and method == "GET":
+            with self._lock:
+                files = list(self.store_files[vector_store_id].values())
+            return 200, self._list(files, query)
+        if len(rest) == 2 and rest[0] == "files" and method == "DELETE":
+            with self._lock:
+                removed = self.store_files[vector_store_id].pop(rest[1], None)
+            if removed is None:
+                return 404, {"error": {"message": f"No such file {rest[1]}."}}
+            return 200, {"id": rest[1], "object": "vector_store.file.deleted", "deleted": True}
+        if rest == ["file_batches"] and method == "POST":
+            return 200, self._create_batch(vector_store_id, json.loads(body)["file_ids"])
+        if len(rest) == 2 and rest[0] == "file_batches" and method == "GET":
+            batch = self.batches.get(rest[1])
+            return (200, self._batch(batch)) if batch else (404, {"error": {"message": f"No such batch {rest[1]}."}})
+        if len(rest) == 3 and rest[0] == "file_batches" and rest[2] == "files" and method == "GET":
+            batch = self.batches.get(rest[1])
+            if batch is None:
+                return 404, {"error": {"message": f"No such batch {rest[1]}."}}
+            self._batch(batch)
+            with self._lock:
+                files = [
+                    self.store_files[vector_store_id].get(file_id) or {"id": file_id, "status": "failed"}
+                    for file_id in batch["file_ids"]
+                ]
+            if "filter" in query:
+                files = [f for f in files if f["status"] == query["filter"]]
+            return 200, self._list(files, query)
+
+        return 404, {"error": {"message": f"Unknown path {path}."}}
+
+    def _create_file(self, body: bytes, headers) -> dict:
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode("utf-8") + body
+        )
+        filename, size, purpose = "upload.json", 0, "assistants"
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                filename = part.get_filename() or filename
+                size = len(part.get_payload(decode=True) or b"")
+            elif part.get_param("name", header="content-disposition") == "purpose":
+                purpose = part.get_content().strip()
+
+        file = {
+            "id": self._new_id("file"), "object": "file", "bytes": size, "created_at": int(time.time()),
+            "filename": filename, "purpose": purpose, "status": "processed"
+        }
+        with self._lock:
+            self.files[file["id"]] = file
+            self.stats["uploaded_bytes"] += size
+        return file
+
+    def _create_batch(self, vector_store_id: str, file_ids: list[str]) -> dict:
+        batch = {
+            "id": self._new_id("vsfb"), "vector_store_id": vector_store_id, "file_ids": file_ids,
+            "created_at": int(time.time()), "ready_at": time.monotonic() + self.indexing_ms / 1000, "indexed": False
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+        return self._batch(batch)
+
+    def _batch(self, batch: dict) -> dict:
+        """The batch as returned by the API, attaching its files to the store once indexing is over."""
+        with self._lock:
+            if not batch["indexed"] and time.monotonic() >= batch["ready_at"]:
+                for file_id in batch["file_ids"]:
+                    status = "failed" if self._rng.random() < self.indexing_failure_rate else "completed"
+                    if status == "completed":
+                        self.store_files[batch["vector_store_id"]][file_id] = {
+                            "id": file_id, "object": "vector_store.file", "created_at": batch["created_at"],
+                            "vector_store_id": batch["vector_store_id"], "status": status,
+                            "usage_bytes": self.files.get(file_id, {}).get("bytes", 0), "last_error": None
+                        }
+                batch["indexed"] = True
+            total = len(batch["file_ids"])
+            completed = sum(file_id in self.store_files[batch["vector_store_id"]] for file_id in batch["file_ids"])
+        counts = (
+            {"in_progress": 0, "completed": completed, "failed": total - completed, "cancelled": 0, "total": total}
+            if batch["indexed"] else
+            {"in_progress": total, "completed": 0, "failed": 0, "cancelled": 0, "total": total}
+        )
+        return {
+            "id": batch["id"], "object": "vector_store.files_batch", "created_at": batch["created_at"],
+            "vector_store_id": batch["vector_store_id"],
+            "status": "completed" if batch["indexed"] else "in_progress", "file_counts": counts
+        }
+
+    def _vector_store(self, vector_store_id: str) -> dict:
+        files = self.store_files[vector_store_id]
+        return {
+            **self.vector_stores[vector_store_id],
+            "file_counts": {"in_progress": 0, "completed": len(files), "failed": 0, "cancelled": 0, "total": len(files)}
+        }
+
+    def _list(self, items: list[dict], query: dict[str, str]) -> dict:
+        """One page of a cursor-paginated list; items are ordered by ID and the cursor is the last ID seen."""
+        items = sorted(items, key=lambda item: item["id"])
+        if "after" in query:
+            items = [item for item in items if item["id"] > query["after"]]
+        limit = int(query.get("limit", 20))
+        data = items[:limit]
+        return {
+            "object": "list",
+            "data": data,
+            "first_id": data[0]["id"] if data else None,
+            "last_id": data[-1]["id"] if data else None,
+            "has_more": len(items) > limit
+        }
@@ -0,0 +1,141 @@
+"""
+Benchmark of the HTML preprocessing done by ConfluencePageClient.structure_single_page.
+
+Compares the single-pass rewrite_storage_html against the former BeautifulSoup implementation
+(parse, walk the tree for <ac:image>, walk it again for <a>, serialize) on a corpus of real
+storage-format pages, and checks that both produce identical output.
+
+The corpus is a directory of pages, one per file: either the raw `body.storage.value`
+(.html / .xml) or the JSON returned by /wiki/rest/api/content/{id}?expand=body.storage.
+Use --fetch to download pages from the configured Confluence instance into the corpus first.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.structure_page_benchmark --corpus cache/storage_corpus
+    python -m backend.benchmarks.structure_page_benchmark --corpus cache/storage_corpus --fetch 12345 67890
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup, NavigableString
+from pathlib import Path
+
+from backend.src.clients.confluence.confluence_storage_rewriter import rewrite_storage_html
+
+
+def legacy_structure_html(value: str) -> str:
+    """The BeautifulSoup preprocessing structure_single_page used before rewrite_storage_html."""
+    soup = BeautifulSoup(f"<html><body>{value}</body></html>", "html.parser")
+
+    for ac_image in soup.find_all("ac:image"):
+        ri_attachment = ac_image.find("ri:attachment")
+        filename = ri_attachment["ri:filename"] if ri_attachment and ri_attachment.has_attr("ri:filename") else "unknown_image"
+        placeholder = soup.new_tag("p")
+        placeholder.string = f"IMAGE: {filename}"
+        ac_image.replace_with(placeholder)
+
+    for link in soup.find_all("a"):
+        url = link.get("href", "unknown_link")
+        parent = link.parent
+        if parent.name == "p":
+            link.replace_with(NavigableString(f"LINK: {url}"))
+        else:
+            placeholder = soup.new_tag("p")
+            placeholder.string = f"LINK: {url}"
+            link.replace_with(placeholder)
+
+    return str(soup)
+
+
+def single_pass_structure_html(value: str) -> str:
+    return rewrite_storage_html(f"<html><body>{value}</body></html>")
+
+
+def fetch_corpus(corpus_dir: Path, page_ids: list[str]) -> None:
+    """Saves the storage-format body of each page to the corpus directory."""
+    from backend.src.clients.confluence.confluence_page_client import ConfluencePageClient
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    result = ConfluencePageClient().get_pages_content(page_ids)
+    for page in result.successful_pages:
+        (corpus_dir / f"{page.id}.html").write_text(page.value, encoding="utf-8")
+    print(f"Saved {len(result.successful_pages)} pages to {corpus_dir} ({len(result.failed_page_ids)} failed).")
+
+
+def load_corpus(corpus_dir: Path) -> dict[str, str]:
+    """Returns the storage-format body of every page in the corpus, keyed by file name."""
+    pages: dict[str, str] = {}
+    for path in sorted(corpus_dir.iterdir()):
+        if path.suffix in (".html", ".xml"):
+            pages[path.name] = path.read_text(encoding="utf-8")
+        elif path.suffix == ".json":
+            data = json.loads(path.read_text(encoding="utf-8"))
+            value = data.get("body", {}).get("storage", {}).get("value")
+            if value:
+                pages[path.name] = value
+    return pages
+
+
+def time_run(structure_html, pages: dict[str, str], repeat: int) -> dict[str, float]:
+    """Returns the best of `repeat` runs of each page, in seconds."""
+    timings: dict[str, float] = {}
+    for name, value in pages.items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            structure_html(value)
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best
+    return timings
+
+
+def summarize(label: str, timings: dict[str, float], total_bytes: int) -> float:
+    values = sorted(timings.values())
+    total = sum(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    print(
+        f"{label:<13} total {total * 1000:9.1f} ms | median {statistics.median(values) * 1000:7.2f} ms | "
+        f"p95 {p95 * 1000:7.2f} ms | {total_bytes / total / 1024 / 1024:6.2f} MB/s"
+    )
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, required=True, help="Directory of storage-format pages.")
+    parser.add_argument("--fetch", nargs="*", default=[], metavar="PAGE_ID", help="Download these pages into the corpus first.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page; the fastest is kept.")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_corpus(args.corpus, args.fetch)
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No pages found in {args.corpus}.")
+        return 1
+
+    total_bytes = sum(len(value.encode("utf-8")) for value in pages.values())
+    print(f"Corpus: {len(pages)} pages, {total_bytes / 1024 / 1024:.2f} MB\n")
+
+    mismatches = [
+        name for name, value in pages.items()
+        if legacy_structure_html(value) != single_pass_structure_html(value)
+    ]
+
+    legacy_total = summarize("beautifulsoup", time_run(legacy_structure_html, pages, args.repeat), total_bytes)
+    single_pass_total = summarize("single-pass", time_run(single_pass_structure_html, pages, args.repeat), total_bytes)
+    print(f"\nSpeedup: {legacy_total / single_pass_total:.2f}x")
+
+    if mismatches:
+        print(f"\nOutput differs for {len(mismatches)} pages: {', '.join(mismatches[:20])}")
+        return 1
+    print("Output identical for all pages.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+End-to-end benchmark of catalog builds and syncs against local Confluence and Azure stand-ins.
+
+For every corpus size, starts a FakeConfluenceServer serving a SyntheticCorpus and an empty
+FakeAzureServer, then runs through the real clients, pipeline and Docling conversion pool:
+    catalog  ConfluenceCatalog.get_full_catalog
+    ingest   ingest_confluence_pages of every page into an empty vector store
+    resync   ingest_confluence_pages of the same pages again (all unchanged)
+
+Results are written as JSON: wall time, pages per second, per-stage timings, request counts and
+injected failures per service, final concurrency limits and peak RSS of the process and its
+conversion workers. Keep the result files to track regressions over time.
+
+The vector store index and conversion cache live in a temporary directory, so runs do not touch
+the application's caches and every conversion is measured. Set LOG_LEVEL=WARNING to keep
+per-page logging out of the measurements.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.sync_benchmark --pages 1000 10000
+    python -m backend.benchmarks.sync_benchmark --pages 100000 --scenarios catalog --latency-ms 50 --throttle-rate 0.02
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.benchmarks.fake_services import FakeAzureServer, FakeConfluenceServer, FaultProfile, SyntheticCorpus
+from backend.src.clients.azure.azure_client import AzureVectorStoreManager
+from backend.src.clients.confluence.confluence_base_client import BaseConfluenceClient
+from backend.src.orchestrators.app_resources import AppResources
+from backend.src.orchestrators.confluence_to_vectorstore_ingestion import ingest_confluence_pages
+from backend.src.processors.conversion_cache import ConversionCache
+from backend.src.processors.docling_converter import DoclingConversionPool
+from backend.src.utils.concurrency import concurrency_limiters
+from backend.src.utils.sync_progress import SYNC_STAGES, SyncProgress
+from backend.src.utils.vector_store_index import VectorStoreIndex
+
+SCENARIOS = ("catalog", "ingest", "resync")
+
+
+class StageTimer(SyncProgress):
+    """SyncProgress that also records when each sync phase started and when each stage first and last advanced."""
+
+    def __init__(self):
+        super().__init__()
+        self.phases: dict[str, float] = {}
+        self.first_at: dict[str, float] = {}
+        self.last_at: dict[str, float] = {}
+
+    def set_stage(self, stage: str) -> None:
+        self.phases.setdefault(stage, time.perf_counter())
+        super().set_stage(stage)
+
+    def advance(self, stage: str, count: int = 1, outcome: str = "done") -> None:
+        if count > 0:
+            now = time.perf_counter()
+            self.first_at.setdefault(stage, now)
+            self.last_at[stage] = now
+        super().advance(stage, count, outcome)
+
+    def timings(self, started: float) -> dict:
+        """Phase start offsets and per-stage active time, in seconds from `started`."""
+        snapshot = self.snapshot()["stages"]
+        stages = {}
+        for stage in SYNC_STAGES:
+            counts = {key: snapshot[stage][key] for key in ("total", "done", "failed", "skipped")}
+            if stage in self.first_at:
+                active = self.last_at[stage] - self.first_at[stage]
+                counts.update({
+                    "first_at": round(self.first_at[stage] - started, 3),
+                    "last_at": round(self.last_at[stage] - started, 3),
+                    "per_second": round(counts["done"] / active, 2) if active > 0 else None
+                })
+            stages[stage] = counts
+        return {
+            "phases": {phase: round(at - started, 3) for phase, at in self.phases.items()},
+            "stages": stages
+        }
+
+
+class PeakRssSampler:
+    def __init__(self, interval: float = 0.1):
+        """Samples the resident memory of this process and of its children (conversion workers) in the background."""
+        self.interval = interval
+        self.peak_process = 0
+        self.peak_total = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def result(self) -> dict:
+        return {
+            "process_mb": round(self.peak_process / 1024 / 1024, 1),
+            "with_workers_mb": round(self.peak_total / 1024 / 1024, 1)
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        rss = self._process.memory_info().rss
+        total = rss
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak_process = max(self.peak_process, rss)
+        self.peak_total = max(self.peak_total, total)
+
+
+def run_corpus(num_pages: int, args: argparse.Namespace) -> dict:
+    """Runs the selected scenarios against fresh fake services serving a corpus of num_pages pages."""
+    corpus = SyntheticCorpus(num_pages, num_spaces=args.spaces, body_kb=args.body_kb, seed=args.seed)
+    confluence_faults = FaultProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, rate_limit=args.confluence_rate_limit, retry_after_seconds=args.retry_after
+    )
+    azure_faults = confluence_faults.model_copy(update={"rate_limit": args.azure_rate_limit})
+    run: dict = {"pages": num_pages, "spaces": corpus.num_spaces, "scenarios": {}}
+
+    with tempfile.TemporaryDirectory(prefix="sync-benchmark-") as workdir, \
+            FakeConfluenceServer(corpus, confluence_faults, seed=args.seed) as confluence, \
+            FakeAzureServer(azure_faults, indexing_ms=args.indexing_ms, seed=args.seed) as azure, \
+            PeakRssSampler() as rss:
+        vector_store_id = azure.create_vector_store(f"benchmark-{num_pages}")
+        resources = AppResources(
+            confluence_base_client=BaseConfluenceClient(url=confluence.url, username="benchmark", api_token="benchmark"),
+            azure_client=AzureVectorStoreManager(
+                api_version=args.azure_api_version, endpoint=azure.url, api_key="benchmark",
+                index=VectorStoreIndex(str(Path(workdir) / "vector_store_index.db"))
+            ),
+            conversion_pool=DoclingConversionPool(
+                max_workers=args.docling_workers, cache=ConversionCache(str(Path(workdir) / "conversions"))
+            )
+        )
+        try:
+            resources.conversion_pool.warm_up()
+            page_ids = corpus.page_ids()
+
+            for scenario in args.scenarios:
+                print(f"[{num_pages} pages] {scenario}...", flush=True)
+                requests_before = {"confluence": confluence.snapshot(), "azure": azure.snapshot()}
+                started = time.perf_counter()
+
+                if scenario == "catalog":
+                    catalog = resources.confluence_catalog.get_full_catalog()
+                    result = {"spaces": len(catalog)}
+                    timings = {}
+                else:
+                    progress = StageTimer()
+                    summary = ingest_confluence_pages(vector_store_id, page_ids, resources, progress)
+                    result = {key: len(summary[key]) for key in ("added_or_updated", "unchanged", "deleted", "failed")}
+                    timings = progress.timings(started)
+
+                seconds = time.perf_counter() - started
+                run["scenarios"][scenario] = {
+                    "seconds": round(seconds, 3),
+                    "pages_per_second": round(num_pages / seconds, 2) if seconds > 0 else None,
+                    "result": result,
+                    **timings,
+                    "requests": {
+                        "confluence": _diff(requests_before["confluence"], confluence.snapshot()),
+                        "azure": _diff(requests_before["azure"], azure.snapshot())
+                    }
+                }
+                print(f"[{num_pages} pages] {scenario}: {seconds:.2f}s, {num_pages / seconds:.1f} pages/s {result}", flush=True)
+        finally:
+            run["concurrency"] = [limiter.snapshot() for limiter in concurrency_limiters.values()]
+            resources.close()
+
+    run["peak_rss"] = rss.result()
+    return run
+
+
+def _diff(before: dict, after: dict) -> dict:
+    return {key: value - before.get(key, 0) for key, value in after.items() if value - before.get(key, 0)}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 10000, 100000], help="Corpus sizes to run.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios to run, in order.")
+    parser.add_argument("--spaces", type=int, default=None, help="Spaces per corpus. Defaults to one per 1000 pages.")
+    parser.add_argument("--body-kb", type=float, default=4.0, help="Approximate size of a page body.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus and of the injected failures.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency added to every fake request.")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Random +/- variation of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests failing with 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s, in seconds.")
+    parser.add_argument("--confluence-rate-limit", type=float, default=0.0, help="Requests per second before the fake Confluence returns 429 (0 = unlimited).")
+    parser.add_argument("--azure-rate-limit", type=float, default=0.0, help="Requests per second before the fake Azure returns 429 (0 = unlimited).")
+    parser.add_argument("--indexing-ms", type=float, default=500.0, help="Time a file batch stays in progress.")
+    parser.add_argument("--docling-workers", type=int, default=None, help="Conversion worker processes. Defaults to DOCLING_WORKERS.")
+    parser.add_argument("--azure-api-version", default="2024-05-01-preview", help="API version sent to the fake Azure.")
+    parser.add_argument("--output", type=Path, default=None, help="Result file. Defaults to cache/benchmarks/sync-<timestamp>.json.")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc)
+    output = args.output or Path("cache/benchmarks") / f"sync-{started_at:%Y%m%dT%H%M%SZ}.json"
+    results = {
+        "benchmark": "sync",
+        "started_at": started_at.isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": psutil.cpu_count(),
+        "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "runs": [run_corpus(num_pages, args) for num_pages in args.pages]
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results written to {output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
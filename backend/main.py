@@ -1,23 +1,40 @@
-# TODO: Init Azure/Confluence when app starts not in endpoints
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
 
 from typing import Any
 
-from fastapi import FastAPI
+import json
+
+from fastapi import Depends, FastAPI, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from backend.schemas import SyncNowRequest, APIResponse
-from backend.src.clients.azure.azure_client import AzureVectorStoreManager
-from backend.src.clients.confluence.confluence_catalog_client import ConfluenceCatalog
-from backend.src.orchestrators.confluence_to_vectorstore_ingestion import ingest_confluence_pages
+from backend.src.orchestrators.app_resources import AppResources
+from backend.src.orchestrators.sync_jobs import sync_job_manager
+from backend.src.utils.catalog_cache import etag_matches
+from backend.src.utils.concurrency import concurrency_limiters
 from backend.src.utils.logger_init import setup_logging
-from backend.src.utils.security import validate_user_vector_store_access
+from backend.src.utils.metrics import metrics_registry
+from backend.src.utils.profiling import PROFILE_SLOW_CATALOG_MS, profile_request, profile_store
+from backend.src.utils.security import is_admin, validate_user_vector_store_access
+from backend.src.utils.tracing import sync_trace_store, to_otlp
+from backend.src.utils.wire_format import CATALOG_FORMATS, compress, negotiate_encoding
 
 logger = setup_logging(__name__)
 
+# Pages per result page of /v1/vectorstore/{id}/pages, by default and at most.
+VECTOR_STORE_PAGES_PAGE_SIZE = int(os.getenv("VECTOR_STORE_PAGES_PAGE_SIZE", "100"))
+VECTOR_STORE_PAGES_MAX_PAGE_SIZE = int(os.getenv("VECTOR_STORE_PAGES_MAX_PAGE_SIZE", "1000"))
+# Pages per result page of /v1/confluence/spaces/{id}/pages, by default and at most.
+CATALOG_TREE_PAGE_SIZE = int(os.getenv("CATALOG_TREE_PAGE_SIZE", "200"))
+CATALOG_TREE_MAX_PAGE_SIZE = int(os.getenv("CATALOG_TREE_MAX_PAGE_SIZE", "1000"))
+# Most results returned by /v1/confluence/search.
+CATALOG_SEARCH_MAX_RESULTS = int(os.getenv("CATALOG_SEARCH_MAX_RESULTS", "100"))
+
 app = FastAPI()
 
 app.add_middleware(
@@ -27,17 +44,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-azure_client: AzureVectorStoreManager | None = None
-confluence_catalog_builder: ConfluenceCatalog | None = None
+shutdown_requested = threading.Event()
+
+def get_resources(request: Request) -> AppResources:
+    """Returns the clients and converters shared for the lifetime of the application."""
+    return request.app.state.resources
+
+def admin_token_required() -> dict[str, Any]:
+    return {
+        "status": "error",
+        "data": {},
+        "message": "This action requires a valid X-Admin-Token header."
+    }
+
+def reconcile_vector_store_index_periodically(resources: AppResources, interval_seconds: int):
+    """Periodically checks the local vector store index against Azure."""
+    while not shutdown_requested.wait(interval_seconds):
+        try:
+            resources.azure_client.reconcile_all_indexes()
+        except Exception:
+            logger.error("Vector store index reconcile failed", exc_info=True)
 
 @app.on_event("startup")
 def startup_event():
-    global azure_client, confluence_catalog_builder
-    azure_client = AzureVectorStoreManager()
-    confluence_catalog_builder = ConfluenceCatalog()
+    resources = AppResources()
+    resources.warm_up()
+    app.state.resources = resources
+
+    threading.Thread(
+        target=reconcile_vector_store_index_periodically,
+        args=(resources, int(os.getenv("VECTOR_STORE_RECONCILE_SECONDS", "3600"))),
+        name="vector-store-reconcile",
+        daemon=True
+    ).start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    shutdown_requested.set()
+    sync_job_manager.shutdown()
+    app.state.resources.close()
 
 @app.post("/v1/pages/sync-now")
-def ingest_confluence_pages_endpoint(request: SyncNowRequest) -> dict[str, Any]:
+def ingest_confluence_pages_endpoint(
+    request: SyncNowRequest,
+    profile: bool = False,
+    x_admin_token: str | None = Header(default=None),
+    resources: AppResources = Depends(get_resources)
+) -> dict[str, Any]:
+    """
+    Starts a sync job. Admins can pass profile=true (with X-Admin-Token) to run it under the
+    sampling profiler; the job status then carries the profile_id to download from /v1/profiles.
+    """
+    if profile and not is_admin(x_admin_token):
+        return admin_token_required()
+
     # TODO: Add here actual Auth Logic, own db with the credentials
     try:
         if not validate_user_vector_store_access(request.user_id, request.vector_store_id):
@@ -55,30 +115,103 @@ def ingest_confluence_pages_endpoint(request: SyncNowRequest) -> dict[str, Any]:
             }
     
     try:
-        result = ingest_confluence_pages(
+        job = sync_job_manager.submit(
             vector_store_id=request.vector_store_id,
-            page_ids=request.page_ids
+            page_ids=request.page_ids,
+            resources=resources,
+            profile=profile
         )
         return {
             "status": "success",
-            "data": result,
-            "message": "Pages synced successfully"
+            "data": {"job_id": job.id, "status": job.status},
+            "message": "Sync started. Follow its progress at /v1/pages/sync-jobs/{job_id}."
             }
     # TODO: More Specific Exception Handling
     except Exception as e:
-        logger.error("Error during ingestion", exc_info=True)
+        logger.error("Error starting ingestion", exc_info=True)
         return {
             "status": "error", 
             "data": {}, 
-            "message": f"Error during ingestion: {str(e)}"
+            "message": f"Error starting ingestion: {str(e)}"
             }
+
+
+@app.get("/v1/pages/sync-jobs/{job_id}")
+def get_sync_job(job_id: str):
+    """
+    Returns the status and live progress of a sync job.
+    Once the job succeeded, `result` holds the ingestion summary.
+    """
+    job = sync_job_manager.get(job_id)
+    if job is None:
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Sync job {job_id} not found."
+        }
+    return {
+        "status": "success",
+        "data": job.to_dict(),
+        "message": f"Sync job is {job.status}."
+    }
+
+
+@app.get("/v1/pages/sync-jobs/{job_id}/events")
+def stream_sync_job(job_id: str):
+    """Streams the progress of a sync job as Server-Sent Events until it finished."""
+    job = sync_job_manager.get(job_id)
+    if job is None:
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Sync job {job_id} not found."
+        }
+
+    def events():
+        for state in job.iter_updates():
+            if state is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/v1/pages/sync-jobs/{job_id}/trace")
+def get_sync_job_trace(job_id: str, format: str = "waterfall"):
+    """
+    Returns the trace of a finished sync job: stage, batch and per-page spans with their timings.
+
+    format=waterfall (default) lists the spans by start time with offsets in milliseconds and the
+    slowest pages per span; format=otlp returns the trace as an OpenTelemetry OTLP/JSON export request.
+    """
+    if format not in ("waterfall", "otlp"):
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Unknown trace format {format}, expected waterfall or otlp."
+        }
+    document = sync_trace_store.load(job_id)
+    if document is None:
+        job = sync_job_manager.get(job_id)
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Sync job {job_id} is still {job.status}, its trace is saved once it finished."
+            if job is not None and not job.finished else f"Trace of sync job {job_id} not found."
+        }
+    return {
+        "status": "success",
+        "data": to_otlp(document) if format == "otlp" else document,
+        "message": f"Trace with {document['span_count']} spans, {document['dropped_spans']} faster page spans dropped."
+    }
     
 
 @app.get("/v1/vector-stores")
-def get_vector_stores():
+def get_vector_stores(resources: AppResources = Depends(get_resources)):
     """Get all vector stores with their metadata."""
     try:
-        vector_stores = azure_client.list_vector_stores()
+        vector_stores = resources.azure_client.list_vector_stores()
         return {
             "status": "success",
             "data": vector_stores,
@@ -95,38 +228,117 @@ def get_vector_stores():
 
     
 @app.get("/v1/vectorstore/{vector_store_id}/pages")
-def get_vectorstore_page_ids(vector_store_id: str):
+def get_vectorstore_pages(
+    vector_store_id: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+    space: str | None = None,
+    title_prefix: str | None = None,
+    status: str | None = None,
+    synced_after: float | None = None,
+    synced_before: float | None = None,
+    resources: AppResources = Depends(get_resources)
+):
     """
-    Returns a list of Confluence page IDs currently in the vector store.
+    Returns the Confluence pages currently in the vector store, answered from the local index.
+
+    Pages are ordered by page ID and returned one result page at a time with their title, space,
+    file ID, indexing status and sync time. Pass the returned next_cursor as cursor to get the
+    next result page. Filters: space key, title prefix (case-insensitive), indexing status and
+    sync time range (synced_after / synced_before, in seconds since the epoch).
     """
+    limit = min(max(limit or VECTOR_STORE_PAGES_PAGE_SIZE, 1), VECTOR_STORE_PAGES_MAX_PAGE_SIZE)
     try:
-        page_ids = azure_client.get_existing_page_ids(vector_store_id)
+        result = resources.azure_client.list_pages(
+            vector_store_id,
+            limit,
+            cursor,
+            space_key=space,
+            title_prefix=title_prefix,
+            status=status,
+            synced_after=synced_after,
+            synced_before=synced_before
+        )
         return {
             "status": "success",
-            "data": list(page_ids),
-            "message": f"Found {len(page_ids)} page IDs in vector store."
+            "data": result.model_dump(),
+            "message": f"Returned {len(result.items)} of {result.total} pages in vector store."
+        }
+    except ValueError as e:
+        return {
+            "status": "error",
+            "data": {},
+            "message": str(e)
         }
     # TODO: More Specific Exception Handling
     except Exception as e:
+        logger.error("Failed to fetch vector store pages", exc_info=True)
         return {
             "status": "error",
-            "data": [],
-            "message": f"Failed to fetch page IDs: {str(e)}"
+            "data": {},
+            "message": f"Failed to fetch pages: {str(e)}"
         }
 
 
 @app.get("/v1/confluence/catalog")
-def get_confluence_catalog():
+def get_confluence_catalog(
+    request: Request,
+    force_refresh: bool = False,
+    format: str = "nested",
+    profile: bool = False,
+    x_admin_token: str | None = Header(default=None),
+    resources: AppResources = Depends(get_resources)
+):
     """
     Fetches the full Confluence catalog.
+
+    Served from the catalog cache; a stale catalog is returned immediately and refreshed
+    in the background. Pass force_refresh=true to rebuild before responding.
+    format=nested (default) returns the page trees; format=compact returns per space parallel
+    arrays of page IDs, titles and parent indexes, a fraction of the size.
+    Compressed with brotli or gzip per Accept-Encoding, once per catalog build.
+    Supports If-None-Match, returning 304 when the catalog is unchanged.
+    Admins can pass profile=true (with X-Admin-Token) to profile the request; slow requests
+    are profiled automatically. The profile ID is returned in the X-Profile-Id header.
     """
-    try:
-        confluence_catalog = confluence_catalog_builder.get_full_catalog()
+    if profile and not is_admin(x_admin_token):
+        return admin_token_required()
+    if format not in CATALOG_FORMATS:
         return {
-            "status": "success",
-            "data": confluence_catalog,
-            "message": "Successfully fetched Confluence catalog."
+            "status": "error",
+            "data": [],
+            "message": f"Unknown catalog format {format}, expected nested or compact."
         }
+
+    with profile_request(
+        "catalog", f"force_refresh={force_refresh}", requested=profile, slow_ms=PROFILE_SLOW_CATALOG_MS
+    ) as session:
+        response = build_catalog_response(request, force_refresh, format, resources)
+    if session.profile_id and isinstance(response, Response):
+        response.headers["X-Profile-Id"] = session.profile_id
+    return response
+
+
+def build_catalog_response(request: Request, force_refresh: bool, format: str, resources: AppResources):
+    try:
+        snapshot = resources.catalog_cache.get(force_refresh=force_refresh)
+        data, etag = (snapshot.body, snapshot.etag) if format == "nested" else snapshot.compact()
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            # Each content encoding is a different representation, so it needs its own ETag.
+            etag = f'{etag[:-1]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        # The catalog is pre-serialized once per build, so only the envelope is encoded here.
+        body = b'{"status":"success","data":%s,"message":"Successfully fetched Confluence catalog."}' % data
+        if encoding is not None:
+            # Compressed once per build and format, then served from the snapshot.
+            body = snapshot.memo((format, encoding), lambda: compress(body, encoding))
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
     # TODO: More Specific Exception Handling
     except Exception as e:
         logger.error("Failed to fetch Confluence catalog", exc_info=True)
@@ -134,4 +346,177 @@ def get_confluence_catalog():
             "status": "error",
             "data": [],
             "message": f"Failed to fetch Confluence catalog: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+@app.get("/v1/confluence/spaces")
+def get_confluence_spaces(resources: AppResources = Depends(get_resources)):
+    """
+    Lists the Confluence spaces with their page counts, without their page trees.
+
+    Page counts are null for spaces not loaded yet, unless a fresh full catalog was built.
+    Expand a space with /v1/confluence/spaces/{space_id}/pages.
+    """
+    try:
+        spaces = resources.catalog_cache.get_spaces()
+        return {
+            "status": "success",
+            "data": spaces,
+            "message": f"Successfully fetched {len(spaces)} Confluence spaces."
+        }
+    # TODO: More Specific Exception Handling
+    except Exception as e:
+        logger.error("Failed to fetch Confluence spaces", exc_info=True)
+        return {
+            "status": "error",
+            "data": [],
+            "message": f"Failed to fetch Confluence spaces: {str(e)}"
+        }
+
+
+@app.get("/v1/confluence/spaces/{space_id}/pages")
+def get_confluence_space_pages(
+    space_id: str,
+    parent_id: str | None = None,
+    depth: int = 1,
+    limit: int | None = None,
+    cursor: str | None = None,
+    resources: AppResources = Depends(get_resources)
+):
+    """
+    Returns the root pages of a space, or the children of parent_id, one result page at a time.
+
+    Each page carries its child_count and its descendants down to `depth` levels, the page
+    itself included (1: no children, 0: whole subtrees). Pass the returned next_cursor as
+    cursor to get the next result page. Only this space is fetched from Confluence unless
+    a fresh full catalog was built.
+    """
+    limit = min(max(limit or CATALOG_TREE_PAGE_SIZE, 1), CATALOG_TREE_MAX_PAGE_SIZE)
+    try:
+        tree = resources.catalog_cache.get_space(space_id)
+        if tree is None:
+            return {
+                "status": "error",
+                "data": {},
+                "message": f"Confluence space {space_id} not found."
+            }
+        if parent_id is not None and parent_id not in tree.nodes:
+            return {
+                "status": "error",
+                "data": {},
+                "message": f"Page {parent_id} not found in Confluence space {space_id}."
+            }
+        result = tree.level(parent_id, limit, cursor, depth=max(depth, 0))
+        return {
+            "status": "success",
+            "data": result,
+            "message": f"Returned {len(result['items'])} of {result['total']} pages."
+        }
+    except ValueError as e:
+        return {
+            "status": "error",
+            "data": {},
+            "message": str(e)
+        }
+    # TODO: More Specific Exception Handling
+    except Exception as e:
+        logger.error(f"Failed to fetch pages of Confluence space {space_id}", exc_info=True)
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Failed to fetch Confluence pages: {str(e)}"
+        }
+
+
+@app.get("/v1/confluence/search")
+def search_confluence_catalog(
+    q: str,
+    limit: int = 20,
+    space: str | None = None,
+    resources: AppResources = Depends(get_resources)
+):
+    """
+    Searches page titles across all spaces of the Confluence catalog, answered from an in-memory index.
+
+    Matches title words exactly, by prefix and with one typo, and titles containing the query
+    as a substring. Results are ranked and carry the breadcrumb of their ancestors.
+    Optionally restricted to one space key.
+    """
+    limit = min(max(limit, 1), CATALOG_SEARCH_MAX_RESULTS)
+    try:
+        # Builds the catalog on first use and refreshes it in the background when stale.
+        resources.catalog_cache.get()
+        results = resources.catalog_cache.search_index.search(q, limit=limit, space_key=space)
+        return {
+            "status": "success",
+            "data": results,
+            "message": f"Found {len(results)} pages matching {q!r}."
+        }
+    # TODO: More Specific Exception Handling
+    except Exception as e:
+        logger.error("Failed to search Confluence catalog", exc_info=True)
+        return {
+            "status": "error",
+            "data": [],
+            "message": f"Failed to search Confluence catalog: {str(e)}"
+        }
+
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus metrics: latency histograms and outcomes of external calls, sync stage and
+    per-page timings, pipeline queue depths, cache lookups and bytes uploaded.
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/v1/profiles")
+def list_profiles(x_admin_token: str | None = Header(default=None)):
+    """
+    Lists the stored profiles of requested and slow syncs and catalog requests, most recent first.
+
+    Profiles sample every thread of the process (threads: all), so work running at the same time
+    as the profiled request is included; thread_names lists the sampled threads, each stack's root frame.
+    """
+    if not is_admin(x_admin_token):
+        return admin_token_required()
+    profiles = profile_store.list()
+    return {
+        "status": "success",
+        "data": profiles,
+        "message": f"Found {len(profiles)} profiles."
+    }
+
+
+@app.get("/v1/profiles/{profile_id}")
+def download_profile(profile_id: str, x_admin_token: str | None = Header(default=None)):
+    """
+    Downloads a profile as collapsed stacks, one line per stack with its sample count,
+    readable by flamegraph.pl, inferno or speedscope.
+    """
+    if not is_admin(x_admin_token):
+        return admin_token_required()
+    collapsed = profile_store.load(profile_id)
+    if collapsed is None:
+        return {
+            "status": "error",
+            "data": {},
+            "message": f"Profile {profile_id} not found. Profiles are saved once the profiled request finished."
+        }
+    return Response(
+        content=collapsed,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'}
+    )
+
+
+@app.get("/v1/monitoring/concurrency")
+def get_concurrency_limits():
+    """Returns the current adaptive concurrency limit and observed latencies per external service."""
+    limits = [limiter.snapshot() for limiter in concurrency_limiters.values()]
+    return {
+        "status": "success",
+        "data": limits,
+        "message": f"Found {len(limits)} concurrency limiters."
+    }
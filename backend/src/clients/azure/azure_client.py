@@ -1,9 +1,11 @@
 # NOTE: DONE FOR MVP
 # TODO: Look into decorators for error handling
 
+import httpx
 import json
 import os
-import re
+import threading
+import time
 
 from azure.core.exceptions import (
     AzureError,
@@ -13,35 +15,116 @@ from azure.core.exceptions import (
     ServiceResponseError
     )
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
-from typing import Sequence
-from openai import AzureOpenAI, NotFoundError
+from typing import Callable, Mapping, Sequence, TypeVar
+from openai import AzureOpenAI, DefaultHttpxClient, NotFoundError
 
-from backend.src.clients.azure.azure_error_handling import handle_azure_errors
+from backend.src.clients.azure.azure_error_handling import (
+    classify_azure_create_error,
+    classify_azure_error,
+    handle_azure_errors
+    )
 
 from backend.src.clients.azure.azure_schemas import (
     AzureFileCountsSchema, 
     AzureVectorStoreSchema, 
     VectorStoreDocument, 
-    VectorStoreDocumentInput
+    VectorStoreBatchResult,
+    VectorStoreDocumentInput,
+    VectorStorePageFile,
+    VectorStorePageList,
+    VectorStoreUploadResult
     )
 
+from backend.src.utils import tracing
+from backend.src.utils.concurrency import AdaptiveConcurrencyLimiter, register_limiter
+from backend.src.utils.formatters import build_vector_store_filename, parse_vector_store_filename, sanitize_title
 from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import Counter
+from backend.src.utils.retry import RetryPolicy, TokenBucket
+from backend.src.utils.vector_store_index import VectorStoreIndex, vector_store_index
 
 logger = setup_logging(log_name=__name__)
 
+T = TypeVar("T")
+
+# Concurrent file uploads per batch, matching the default of file_batches.upload_and_poll.
+UPLOAD_CONCURRENCY = 5
+# Upload batches are capped by document count and total size, and several are uploaded at once.
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("AZURE_UPLOAD_BATCH_MAX_FILES", "100"))
+UPLOAD_BATCH_MAX_BYTES = int(os.getenv("AZURE_UPLOAD_BATCH_MAX_MB", "20")) * 1024 * 1024
+UPLOAD_BATCHES_IN_FLIGHT = int(os.getenv("AZURE_UPLOAD_BATCHES_IN_FLIGHT", "3"))
+# Background threads polling batch indexing status, and their polling interval.
+POLL_WORKERS = int(os.getenv("AZURE_POLL_WORKERS", "4"))
+POLL_INTERVAL_MS = int(os.getenv("AZURE_POLL_INTERVAL_MS", "1000"))
+# Concurrent files.retrieve calls for lookups not covered by the bulk listing.
+LOOKUP_CONCURRENCY = int(os.getenv("AZURE_LOOKUP_CONCURRENCY", "8"))
+# Concurrent vector store file deletes.
+DELETE_CONCURRENCY = int(os.getenv("AZURE_DELETE_CONCURRENCY", "8"))
+# Stores with at least this many files resolve filenames by listing all account files once.
+BULK_LOOKUP_THRESHOLD = int(os.getenv("AZURE_BULK_LOOKUP_THRESHOLD", "50"))
+# Keep-alive connections held by the Azure OpenAI HTTP client; should cover the concurrent calls above.
+POOL_SIZE = int(os.getenv("AZURE_POOL_SIZE", "32"))
+# Requests per second allowed towards Azure OpenAI, shared by all threads (0 = only honor Retry-After).
+RATE_LIMIT = float(os.getenv("AZURE_RATE_LIMIT", "20"))
+RATE_LIMIT_BURST = float(os.getenv("AZURE_RATE_LIMIT_BURST", "20"))
+# Attempts per call and the backoff bounds in seconds. The SDK's own retries are disabled in favor of these.
+MAX_ATTEMPTS = int(os.getenv("AZURE_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("AZURE_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("AZURE_RETRY_MAX_DELAY", "30"))
+# Adaptive limit on concurrent calls across uploads, lookups and deletes: grows while latency
+# is stable and halves on 429/5xx or rising latency. Batch polls are not counted.
+INITIAL_CONCURRENCY = int(os.getenv("AZURE_INITIAL_CONCURRENCY", "16"))
+MAX_CONCURRENCY = int(os.getenv("AZURE_MAX_CONCURRENCY", str(POOL_SIZE)))
+UPLOADED_BYTES = Counter("azure_uploaded_bytes_total", "Bytes of documents uploaded to Azure OpenAI.")
+
+# Maximum page sizes allowed by the vector store files and files list endpoints.
+VECTOR_STORE_FILES_PAGE_SIZE = 100
+FILES_PAGE_SIZE = 10000
+
 class AzureVectorStoreManager:
     # TODO: Look into decorators for error handling
     def __init__(
         self,
         api_version: str | None = None,
         endpoint: str | None = None,
-        api_key: str | None = None
+        api_key: str | None = None,
+        index: VectorStoreIndex | None = None,
+        http_client: httpx.Client | None = None,
+        retry_policy: RetryPolicy | None = None
     ):
-        """Initialize the Azure OpenAI client."""
+        """
+        Initialize the Azure OpenAI client.
+
+        Meant to be created once per application (see AppResources) so its connection pool
+        and background pollers are reused across syncs.
+
+        Args:
+            index: Local index of vector store files. Defaults to the shared index.
+            http_client: HTTP client used by the SDK. Defaults to one keeping AZURE_POOL_SIZE connections alive.
+            retry_policy: Retries, rate and concurrency limits applied to every call (see _call). Defaults to the AZURE_* settings.
+        """
         self.api_version = api_version or os.getenv("AZURE_API_VERSION")
         self.endpoint = endpoint or os.getenv("AZURE_ENDPOINT")
         self.api_key = api_key or os.getenv("AZURE_API_KEY")
+        self.index = index or vector_store_index
+        self._poller = ThreadPoolExecutor(max_workers=POLL_WORKERS, thread_name_prefix="azure-poll")
+        self._batch_polls: dict[str, Future] = {}
+        # Serializes index writes per vector store, so a reconcile never overwrites a concurrent sync's changes.
+        self._store_locks: dict[str, threading.RLock] = {}
+        self._store_locks_lock = threading.Lock()
+        self.retry_policy = retry_policy or RetryPolicy(
+            "Azure",
+            classify_azure_error,
+            max_attempts=MAX_ATTEMPTS,
+            base_delay=RETRY_BASE_DELAY,
+            max_delay=RETRY_MAX_DELAY,
+            limiter=TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST),
+            concurrency=register_limiter(AdaptiveConcurrencyLimiter(
+                "azure", initial_limit=INITIAL_CONCURRENCY, max_limit=MAX_CONCURRENCY
+            ))
+        )
 
         missing = [name for name, val in {
             "AZURE_API_VERSION": self.api_version,
@@ -68,10 +151,15 @@ class AzureVectorStoreManager:
                 }
             )
 
+            self.http_client = http_client or DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+            )
             self.client = AzureOpenAI(
                 api_version=self.api_version,
                 azure_endpoint=self.endpoint,
-                api_key=self.api_key
+                api_key=self.api_key,
+                http_client=self.http_client,
+                max_retries=0
             )
 
             logger.debug("AzureVectorStoreManager successfully initialized.")
@@ -89,33 +177,306 @@ class AzureVectorStoreManager:
             logger.error("Azure client error.", exc_info=True)
             raise
         
+    def _call(self, operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Makes one Azure OpenAI call through the shared rate and concurrency limits,
+        retrying rate-limited and transient failures.
+        """
+        return self.retry_policy.call(operation, lambda: func(*args, **kwargs))
+
+    def _call_create(self, operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Like _call, for non-idempotent creates: retried only when Azure cannot have created anything
+        (429, or the connection failed before the request was sent), so retries never duplicate files or batches.
+        """
+        return self.retry_policy.call(operation, lambda: func(*args, **kwargs), classify=classify_azure_create_error)
+
+    def _call_unlimited(self, operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """Like _call, but without holding a concurrency slot; for long-running calls such as batch polls."""
+        return self.retry_policy.call(operation, lambda: func(*args, **kwargs), limit_concurrency=False)
+
+    def _store_lock(self, vector_store_id: str) -> threading.RLock:
+        with self._store_locks_lock:
+            return self._store_locks.setdefault(vector_store_id, threading.RLock())
+
+    def close(self) -> None:
+        """Stops the background pollers and closes the HTTP connections."""
+        self._poller.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
     # TODO: Look into decorators for error handling
-    def upload_documents_to_vector_store(self, vector_store_id: str, documents: list[VectorStoreDocumentInput]) -> bool:
-        """Upload multiple JSON documents to a vector store in a single batch."""
-        files_to_upload: list[BytesIO] = []
+    def upload_documents_to_vector_store(
+        self,
+        vector_store_id: str,
+        documents: list[VectorStoreDocumentInput],
+        wait: bool = True
+    ) -> VectorStoreUploadResult:
+        """
+        Upload multiple JSON documents to a vector store.
 
-        for doc in documents:
-            safe_title = re.sub(r'[\\/*?:"<>|]', "-", doc["title"])
-            filename = f"{safe_title}__PAGEID__{doc['id']}.json"
+        Documents are split into batches capped by document count and total size, and several
+        batches are uploaded at once. Each batch returns as soon as its files are created and
+        attached; its indexing status is polled in the background.
 
+        Args:
+            vector_store_id: The ID of the vector store.
+            documents: The documents to upload.
+            wait: Wait until every batch finished indexing. Otherwise the returned batches are
+                "in_progress" and their final result can be collected with wait_for_batches.
+
+        Returns:
+            VectorStoreUploadResult with the status of each batch and the failed file and page IDs.
+        """
+        batches = self._split_into_batches(documents)
+        if not batches:
+            return VectorStoreUploadResult()
+
+        with ThreadPoolExecutor(
+            max_workers=min(UPLOAD_BATCHES_IN_FLIGHT, len(batches)), thread_name_prefix="azure-batch"
+        ) as executor:
+            upload_batch = tracing.in_context(lambda batch: self._upload_batch(vector_store_id, batch))
+            results = list(executor.map(upload_batch, batches))
+
+        logger.info(f"Uploaded {len(documents)} documents in {len(batches)} batches to vector store {vector_store_id}.")
+
+        if wait:
+            pending = [r.batch_id for r in results if r.batch_id and r.batch_id in self._batch_polls]
+            polled = {r.batch_id: r for r in self.wait_for_batches(pending).batches}
+            results = [polled.get(r.batch_id, r) for r in results]
+
+        return VectorStoreUploadResult.from_batches(results)
+
+    def wait_for_batches(self, batch_ids: Sequence[str]) -> VectorStoreUploadResult:
+        """
+        Wait for batches uploaded with wait=False to finish indexing.
+
+        Args:
+            batch_ids: IDs of the batches to wait for.
+
+        Returns:
+            VectorStoreUploadResult with the final status of each batch.
+        """
+        results: list[VectorStoreBatchResult] = []
+        for batch_id in batch_ids:
+            poll = self._batch_polls.pop(batch_id, None)
+            if poll is None:
+                logger.warning(f"No pending upload batch with ID {batch_id}.")
+                continue
+            results.append(poll.result())
+        return VectorStoreUploadResult.from_batches(results)
+
+    def _split_into_batches(self, documents: list[VectorStoreDocumentInput]) -> list[list[tuple[VectorStoreDocumentInput, bytes]]]:
+        """Split documents, encoded as JSON, into batches capped by count and total size."""
+        batches: list[list[tuple[VectorStoreDocumentInput, bytes]]] = []
+        current: list[tuple[VectorStoreDocumentInput, bytes]] = []
+        current_bytes = 0
+
+        for doc in documents:
             json_bytes = json.dumps(doc).encode("utf-8")
-            json_file_like = BytesIO(json_bytes)
-            json_file_like.name = filename
+            if current and (len(current) >= UPLOAD_BATCH_MAX_FILES or current_bytes + len(json_bytes) > UPLOAD_BATCH_MAX_BYTES):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append((doc, json_bytes))
+            current_bytes += len(json_bytes)
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _upload_batch(self, vector_store_id: str, batch: list[tuple[VectorStoreDocumentInput, bytes]]) -> VectorStoreBatchResult:
+        """Create the files of one batch, attach them to the vector store and start polling in the background."""
+        page_ids = [doc["id"] for doc, _ in batch]
+        size_bytes = sum(len(json_bytes) for _, json_bytes in batch)
+
+        def _create_file(item: tuple[VectorStoreDocumentInput, bytes]):
+            doc, json_bytes = item
+            filename = build_vector_store_filename(
+                doc["title"], doc["id"], doc.get("version"), doc.get("content_hash")
+            )
+
+            def create():
+                # A fresh buffer per attempt, as a failed attempt may have consumed the previous one.
+                json_file_like = BytesIO(json_bytes)
+                json_file_like.name = filename
+                return self.client.files.create(file=json_file_like, purpose="assistants")
+
+            with tracing.span("upload", page_id=doc["id"], bytes=len(json_bytes)) as span:
+                created = self._call_create("files.create", create)
+                span.set(file_id=created.id)
+            UPLOADED_BYTES.inc(len(json_bytes))
+            return created
+
+        created_files = []
+        with tracing.span("upload_batch", files=len(batch), bytes=size_bytes) as span:
+            try:
+                # Files are created individually so each page's file ID can be indexed.
+                with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="azure-upload") as executor:
+                    futures = [executor.submit(tracing.in_context(_create_file), item) for item in batch]
+                created_files = [f.result() for f in futures if f.exception() is None]
+                errors = [f.exception() for f in futures if f.exception() is not None]
+                if errors:
+                    raise errors[0]
+
+                file_batch = self._call_create(
+                    "file_batches.create",
+                    self.client.vector_stores.file_batches.create,
+                    vector_store_id=vector_store_id,
+                    file_ids=[f.id for f in created_files],
+                )
+                span.set(batch_id=file_batch.id)
+            # TODO: Refine error handling to be more specific
+            except Exception as e:
+                span.set(status="upload_failed")
+                logger.error(f"Failed to upload batch of {len(batch)} documents: {e}", exc_info=True)
+                # Files created before the failure belong to no batch; delete them so they are not left behind.
+                self._discard_files([f.id for f in created_files])
+                return VectorStoreBatchResult(
+                    status="upload_failed",
+                    page_ids=page_ids,
+                    size_bytes=size_bytes,
+                    failed_page_ids=page_ids
+                )
+
+        # Indexed once the batch finished (see _wait_for_indexing), so pages keep pointing
+        # at their previous file until the new one is searchable.
+        files = [
+            VectorStorePageFile(
+                page_id=doc["id"],
+                file_id=created.id,
+                filename=created.filename,
+                version=doc.get("version"),
+                content_hash=doc.get("content_hash"),
+                created_at=created.created_at,
+                # Reconcile can only recover the title from the filename, so it is indexed in that form.
+                title=sanitize_title(doc["title"]),
+                space_key=doc.get("space_key"),
+                status="in_progress"
+            )
+            for (doc, _), created in zip(batch, created_files)
+        ]
+
+        result = VectorStoreBatchResult(
+            batch_id=file_batch.id,
+            status=file_batch.status,
+            file_ids=[f.id for f in created_files],
+            page_ids=page_ids,
+            size_bytes=size_bytes
+        )
+        self._batch_polls[file_batch.id] = self._poller.submit(
+            tracing.in_context(self._poll_batch), vector_store_id, result, files
+        )
+        logger.info(f"Created batch {file_batch.id} with {len(batch)} files ({size_bytes} bytes).")
+        return result
 
-            files_to_upload.append(json_file_like)
+    def _poll_batch(
+        self, vector_store_id: str, pending: VectorStoreBatchResult, files: list[VectorStorePageFile]
+    ) -> VectorStoreBatchResult:
+        """Poll a batch until it finished indexing, index its files and delete the ones that failed."""
+        with tracing.span("indexing", batch_id=pending.batch_id, files=len(pending.file_ids)) as span:
+            result = self._wait_for_indexing(vector_store_id, pending)
+            span.set(status=result.status, failed=len(result.failed_file_ids))
 
+        failed = set(result.failed_file_ids)
+        if result.status in ("completed", "failed", "cancelled"):
+            # Files of a finished batch that are not listed as failed or cancelled were indexed.
+            files = [f.model_copy(update={"status": "completed"}) for f in files]
+        # An unknown outcome is indexed as in_progress; the next reconcile records the actual status.
+        with self._store_lock(vector_store_id):
+            self.index.upsert(vector_store_id, [f for f in files if f.file_id not in failed])
+            if failed:
+                self._discard_files(result.failed_file_ids, vector_store_id)
+        return result
+
+    def _wait_for_indexing(self, vector_store_id: str, pending: VectorStoreBatchResult) -> VectorStoreBatchResult:
         try:
-            file_batch = self.client.vector_stores.file_batches.upload_and_poll(
+            file_batch = self._call_unlimited(
+                "file_batches.poll",
+                self.client.vector_stores.file_batches.poll,
+                pending.batch_id,
                 vector_store_id=vector_store_id,
-                files=files_to_upload,
+                poll_interval_ms=POLL_INTERVAL_MS
             )
-            logger.info(f"Batch status: {file_batch.status}")
-            logger.info(f"Files in batch: {file_batch.file_counts}")
-            return True
-        # TODO: Refine error handling to be more specific
+            logger.info(f"Batch {pending.batch_id} status: {file_batch.status}, files: {file_batch.file_counts}")
+
+            failed_file_ids: list[str] = []
+            if file_batch.file_counts.failed or file_batch.file_counts.cancelled:
+                for status in ("failed", "cancelled"):
+                    after = None  # Pagination cursor
+                    while True:
+                        params = {"vector_store_id": vector_store_id, "filter": status, "limit": VECTOR_STORE_FILES_PAGE_SIZE}
+                        if after:
+                            params["after"] = after
+                        files = self._call(
+                            "file_batches.list_files",
+                            self.client.vector_stores.file_batches.list_files,
+                            pending.batch_id,
+                            **params
+                        )
+                        failed_file_ids.extend(f.id for f in files.data)
+                        if not files.has_more or not files.data:
+                            break
+                        after = files.data[-1].id
+            status = file_batch.status
+        except Exception as e:
+            logger.error(f"Failed to poll batch {pending.batch_id}: {e}", exc_info=True)
+            return pending.model_copy(update={"status": "unknown"})
+
+        failed = set(failed_file_ids)
+        if failed:
+            logger.warning(f"{len(failed)} files failed in batch {pending.batch_id}.")
+
+        return pending.model_copy(update={
+            "status": status,
+            "failed_file_ids": failed_file_ids,
+            "failed_page_ids": [
+                page_id for file_id, page_id in zip(pending.file_ids, pending.page_ids) if file_id in failed
+            ]
+        })
+
+    def _delete_file(self, file_id: str, vector_store_id: str | None = None) -> None:
+        """
+        Detach a file from the vector store (when given), then delete it from the account storage,
+        as detaching alone leaves the file object behind. A file that is already gone counts as deleted.
+
+        Raises:
+            openai.OpenAIError: If the file could not be detached. A failed account delete is only logged.
+        """
+        if vector_store_id is not None:
+            try:
+                self._call(
+                    "vector_stores.files.delete",
+                    self.client.vector_stores.files.delete,
+                    vector_store_id=vector_store_id,
+                    file_id=file_id
+                )
+            except NotFoundError:
+                pass
+        try:
+            self._call("files.delete", self.client.files.delete, file_id)
+        except NotFoundError:
+            pass
         except Exception as e:
-            logger.error(f"Failed to upload batch: {e}", exc_info=True)
-            raise        
+            logger.error(f"Failed to delete file {file_id} from the account storage: {e}", exc_info=True)
+
+    def _discard_files(self, file_ids: Sequence[str], vector_store_id: str | None = None) -> None:
+        """
+        Delete the files of a failed upload (see _delete_file). Best effort: failures are logged,
+        the files are not in the index either way.
+        """
+        if not file_ids:
+            return
+
+        def _discard(file_id: str) -> None:
+            try:
+                self._delete_file(file_id, vector_store_id)
+            except Exception as e:
+                logger.error(f"Failed to delete file {file_id} of a failed upload: {e}", exc_info=True)
+
+        with ThreadPoolExecutor(
+            max_workers=min(DELETE_CONCURRENCY, len(file_ids)), thread_name_prefix="azure-delete"
+        ) as executor:
+            list(executor.map(tracing.in_context(_discard), file_ids))
+        logger.info(f"Deleted {len(file_ids)} files of failed uploads.")
 
     # TODO: Look into correct Error Handling Decorator
     @handle_azure_errors
@@ -128,7 +489,7 @@ class AzureVectorStoreManager:
         """
         logger.info("Fetching list of vector stores...")
 
-        vector_stores = self.client.vector_stores.list()
+        vector_stores = self._call("vector_stores.list", self.client.vector_stores.list)
 
         if not vector_stores or not vector_stores.data:
             logger.warning("No vector stores found.")
@@ -156,55 +517,197 @@ class AzureVectorStoreManager:
         logger.debug(f"Found {len(vector_stores_list)} vector stores.")
         return vector_stores_list
 
-    # TODO: Check for performance bottleneck
-    # TODO: Look into correct Error Handling Decorator
-    @handle_azure_errors
     def list_vector_store_documents(self, vector_store_id: str) -> list[VectorStoreDocument]:
-        """Return all documents in a given vector store with their metadata."""
-        docs_list: list[VectorStoreDocument] = []
+        """
+        Return all documents in a given vector store with their metadata.
+
+        Vector store files carry no filename, so they are joined with the account's file
+        objects. The status is the indexing status of the file in the vector store. Large stores list all account files once (bulk) instead of retrieving each
+        file; remaining or small lookups are retrieved concurrently.
+
+        Raises:
+            openai.OpenAIError: If the listing fails after retries; callers (e.g. syncs) must not plan against a partial store.
+        """
+        started = time.perf_counter()
+        request_count = 0
+        store_file_ids: list[str] = []
+        store_file_statuses: dict[str, str] = {}
         after = None  # Pagination cursor
         
         while True:
             # Fetch a page of documents
+            params = {"vector_store_id": vector_store_id, "limit": VECTOR_STORE_FILES_PAGE_SIZE}
             if after:
-                documents = self.client.vector_stores.files.list(
-                    vector_store_id=vector_store_id,
-                    after=after
-                )
-            else:
-                documents = self.client.vector_stores.files.list(
-                    vector_store_id=vector_store_id
-                )
+                params["after"] = after
+            documents = self._call("vector_stores.files.list", self.client.vector_stores.files.list, **params)
+            request_count += 1
             
             if not documents or not documents.data:
                 break
             
-            # Process each document in the current page
-            for doc in documents.data:
-                try:
-                    doc_info = self.client.files.retrieve(doc.id)
-                    docs_list.append(VectorStoreDocument(
-                        id=doc_info.id,
-                        filename=doc_info.filename,
-                        object=doc_info.object,
-                        status=doc_info.status,
-                        created_at=doc_info.created_at
-                    ))
-                except NotFoundError:
-                    logger.warning(f"File with ID {doc.id} not found while listing, skipping.")
-                    continue
+            store_file_ids.extend(doc.id for doc in documents.data)
+            store_file_statuses.update((doc.id, doc.status) for doc in documents.data)
             
             # Check if there are more pages
             if documents.has_more:
                 after = documents.data[-1].id  # Use the last item's ID as cursor
             else:
                 break
+
+        files_by_id: dict = {}
+        if len(store_file_ids) >= BULK_LOOKUP_THRESHOLD:
+            files_by_id, bulk_requests = self._list_account_files()
+            request_count += bulk_requests
+
+        missing_ids = [file_id for file_id in store_file_ids if file_id not in files_by_id]
+        if missing_ids:
+            files_by_id.update(self._retrieve_files(missing_ids))
+            request_count += len(missing_ids)
+
+        docs_list: list[VectorStoreDocument] = []
+        for file_id in store_file_ids:
+            doc_info = files_by_id.get(file_id)
+            if doc_info is None:
+                logger.warning(f"File with ID {file_id} not found while listing, skipping.")
+                continue
+            docs_list.append(VectorStoreDocument(
+                id=doc_info.id,
+                filename=doc_info.filename,
+                object=doc_info.object,
+                status=store_file_statuses.get(file_id, doc_info.status),
+                created_at=doc_info.created_at
+            ))
         
-        logger.info(f"{len(docs_list)} files found in vector store {vector_store_id}.")
+        logger.info(
+            f"{len(docs_list)} files found in vector store {vector_store_id} "
+            f"({request_count} requests, {time.perf_counter() - started:.2f}s)."
+        )
         return docs_list
 
-    # TODO: Look into correct Error Handling Decorator
-    @handle_azure_errors
+    def _list_account_files(self) -> tuple[dict, int]:
+        """
+        List every file of the account with the largest page size the API allows.
+
+        Returns:
+            The file objects keyed by file ID, and the number of requests made.
+        """
+        files_by_id: dict = {}
+        request_count = 0
+        after = None
+
+        while True:
+            params = {"purpose": "assistants", "limit": FILES_PAGE_SIZE}
+            if after:
+                params["after"] = after
+            files = self._call("files.list", self.client.files.list, **params)
+            request_count += 1
+
+            if not files or not files.data:
+                break
+
+            files_by_id.update((f.id, f) for f in files.data)
+
+            if getattr(files, "has_more", False):
+                after = files.data[-1].id
+            else:
+                break
+
+        return files_by_id, request_count
+
+    def _retrieve_files(self, file_ids: list[str]) -> dict:
+        """Retrieve individual file objects concurrently, skipping files that no longer exist."""
+        def _retrieve(file_id: str):
+            try:
+                return self._call("files.retrieve", self.client.files.retrieve, file_id)
+            except NotFoundError:
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(LOOKUP_CONCURRENCY, len(file_ids)), thread_name_prefix="azure-lookup"
+        ) as executor:
+            results = executor.map(_retrieve, file_ids)
+            return {file_id: f for file_id, f in zip(file_ids, results) if f is not None}
+
+    def get_existing_pages(self, vector_store_id: str, refresh: bool = False) -> dict[str, VectorStorePageFile]:
+        """
+        Return the Confluence pages in the given vector store with the version and
+        content hash they were uploaded with.
+
+        Answers from the local vector store index; the vector store is listed (and the
+        index reconciled) only if it was never reconciled or when refresh is set.
+
+        Args:
+            vector_store_id (str): The ID of the vector store to query.
+            refresh (bool): Reconcile the index against Azure before answering.
+
+        Returns:
+            dict[str, VectorStorePageFile]: Mapping of page ID to its file in the vector store.
+
+        Raises:
+            openai.OpenAIError: If the vector store had to be listed and the listing failed.
+        """
+        if not refresh and self.index.is_reconciled(vector_store_id):
+            return self.index.get_pages(vector_store_id)
+        return self.reconcile_index(vector_store_id)
+
+    def reconcile_index(self, vector_store_id: str) -> dict[str, VectorStorePageFile]:
+        """
+        List the vector store and replace its local index entries with the result.
+
+        Holds the store's lock from listing to replacing, so syncs cannot index or delete
+        files in between and have their changes overwritten by the older listing.
+
+        Returns:
+            dict[str, VectorStorePageFile]: Mapping of page ID to its file in the vector store.
+        """
+        with self._store_lock(vector_store_id):
+            pages = self._map_documents_by_page_id(self.list_vector_store_documents(vector_store_id))
+            changes = self.index.replace(vector_store_id, pages)
+        logger.info(f"Reconciled index of vector store {vector_store_id}: {len(pages)} pages, {changes}.")
+        return pages
+
+    def reconcile_all_indexes(self) -> None:
+        """Reconcile the local index of every vector store in the account."""
+        vector_stores = self.list_vector_stores()
+        if not isinstance(vector_stores, list):
+            logger.error(f"Skipping index reconcile, failed to list vector stores: {vector_stores}")
+            return
+
+        for vector_store in vector_stores:
+            try:
+                self.reconcile_index(vector_store.id)
+            except Exception as e:
+                logger.error(f"Failed to reconcile index of vector store {vector_store.id}: {e}", exc_info=True)
+
+    @staticmethod
+    def _map_documents_by_page_id(documents: list[VectorStoreDocument]) -> dict[str, VectorStorePageFile]:
+        """
+        Map vector store documents to page files, parsing the page metadata from the filenames.
+
+        NOTE: If a page has several files (e.g. an update whose old file is still being deleted),
+        the most recently created one is kept.
+        """
+        pages: dict[str, VectorStorePageFile] = {}
+
+        for doc in documents:
+            parsed = parse_vector_store_filename(doc.filename)
+            if not parsed:
+                continue
+            current = pages.get(parsed["page_id"])
+            if current is not None and current.created_at >= doc.created_at:
+                continue
+            pages[parsed["page_id"]] = VectorStorePageFile(
+                page_id=parsed["page_id"],
+                file_id=doc.id,
+                filename=doc.filename,
+                version=parsed["version"],
+                content_hash=parsed["content_hash"],
+                created_at=doc.created_at,
+                title=parsed["title"],
+                status=doc.status
+            )
+        return pages
+
     def get_existing_page_ids(self, vector_store_id: str) -> set[str]:
         """
         Return a set of page IDs extracted from filenames in the given vector store.
@@ -214,16 +717,56 @@ class AzureVectorStoreManager:
             
         Returns:
             set[str]: A set of page IDs found in the vector store filenames."""
-        documents = self.list_vector_store_documents(vector_store_id)
-        page_ids = set()
-        for doc in documents:
-            match = re.search(r'__PAGEID__(\d+)', doc.filename)
-            if match:
-                page_ids.add(match.group(1))
-        return page_ids
+        return set(self.get_existing_pages(vector_store_id))
     
+    def list_pages(
+        self,
+        vector_store_id: str,
+        limit: int,
+        cursor: str | None = None,
+        **filters
+    ) -> VectorStorePageList:
+        """
+        Return one result page of the Confluence pages in the given vector store, with their file and sync metadata.
+
+        Answered from the local vector store index, reconciled first if it never was.
+
+        Args:
+            vector_store_id (str): The ID of the vector store to query.
+            limit (int): Maximum number of pages returned.
+            cursor (str | None): next_cursor of the previous result page.
+            **filters: space_key, title_prefix, status, synced_after and synced_before, see VectorStoreIndex.query_pages.
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        if not self.index.is_reconciled(vector_store_id):
+            self.reconcile_index(vector_store_id)
+        if filters.get("title_prefix"):
+            # Titles are indexed in their filename form.
+            filters["title_prefix"] = sanitize_title(filters["title_prefix"])
+        return self.index.query_pages(vector_store_id, limit, cursor, **filters)
+
+    def update_page_versions(self, vector_store_id: str, files: Sequence[VectorStorePageFile]) -> None:
+        """
+        Index new versions of pages whose content did not change, still pointing at their existing files.
+
+        NOTE: Filenames keep the version the file was uploaded with, so a reconcile falls back to it
+        and the next sync converts such a page again before skipping it.
+        """
+        if not files:
+            return
+        with self._store_lock(vector_store_id):
+            self.index.upsert(vector_store_id, files)
+        logger.info(f"Indexed new versions of {len(files)} unchanged pages in vector store {vector_store_id}.")
+
     # TODO: Look into correct Error Handling Decorator
-    def delete_file_by_page_id(self, vector_store_id: str, page_ids: Sequence[str]) -> dict[str, bool]:
+    def delete_file_by_page_id(
+        self,
+        vector_store_id: str,
+        page_ids: Sequence[str],
+        existing_pages: Mapping[str, VectorStorePageFile] | None = None
+    ) -> dict[str, bool]:
         """
         Delete one or more files from the vector store based on page IDs.
         Returns a dict mapping each page_id -> success (True/False).
@@ -231,36 +774,66 @@ class AzureVectorStoreManager:
         Args:
             vector_store_id (str): The ID of the vector store.
             page_ids (Sequence[str]): The page IDs whose corresponding files should be deleted.
+            existing_pages (Mapping[str, VectorStorePageFile] | None): Page ID -> file mapping the caller
+                already has (e.g. from get_existing_pages). Looked up from the index if omitted.
         
         Returns:
             dict[str, bool]: A dictionary mapping page IDs to deletion success status.
         """
+        if not page_ids:
+            return {}
+
+        if existing_pages is None:
+            existing_pages = self.get_existing_pages(vector_store_id)
+
         results: dict[str, bool] = {}
-        files = self.list_vector_store_documents(vector_store_id)
+        targets: dict[str, VectorStorePageFile] = {}
 
         for page_id in page_ids:
-            target_file = next(
-                (f for f in files if re.search(rf'__PAGEID__{page_id}(?:\.json)?$', f.filename)),
-                None
-            )
-
+            target_file = existing_pages.get(page_id)
             if not target_file:
                 logger.warning(f"No file found with page ID {page_id} in vector store {vector_store_id}.")
                 results[page_id] = False
                 continue
+            targets[page_id] = target_file
+
+        file_results = self.delete_files(vector_store_id, [f.file_id for f in targets.values()])
+        for page_id, target_file in targets.items():
+            results[page_id] = file_results.get(target_file.file_id, False)
+
+        return results
+
+    def delete_files(self, vector_store_id: str, file_ids: Sequence[str]) -> dict[str, bool]:
+        """
+        Delete files from the vector store and the account storage by file ID, concurrently with a cap.
+
+        Args:
+            vector_store_id (str): The ID of the vector store.
+            file_ids (Sequence[str]): The IDs of the files to delete.
 
+        Returns:
+            dict[str, bool]: A dictionary mapping file IDs to deletion success status.
+        """
+        if not file_ids:
+            return {}
+
+        def _delete(file_id: str) -> bool:
             try:
-                self.client.vector_stores.files.delete(
-                    vector_store_id=vector_store_id,
-                    file_id=target_file.id
-                )
-                logger.info(f"Deleted file {target_file.filename} (ID: {target_file.id}) from vector store {vector_store_id}.")
-                results[page_id] = True
+                self._delete_file(file_id, vector_store_id)
+                logger.info(f"Deleted file {file_id} from vector store {vector_store_id}.")
+                return True
             except Exception as e:
-                logger.error(
-                    f"Failed to delete file {target_file.filename} (ID: {target_file.id}): {e}",
-                    exc_info=True
-                )
-                results[page_id] = False
+                logger.error(f"Failed to delete file {file_id}: {e}", exc_info=True)
+                return False
 
-        return results
\ No newline at end of file
+        started = time.perf_counter()
+        with self._store_lock(vector_store_id), ThreadPoolExecutor(
+            max_workers=min(DELETE_CONCURRENCY, len(file_ids)), thread_name_prefix="azure-delete"
+        ) as executor:
+            results = dict(zip(file_ids, executor.map(tracing.in_context(_delete), file_ids)))
+            self.index.remove_files(vector_store_id, [file_id for file_id, success in results.items() if success])
+        logger.info(
+            f"Deleted {sum(results.values())}/{len(file_ids)} files from vector store {vector_store_id} "
+            f"in {time.perf_counter() - started:.2f}s."
+        )
+        return results
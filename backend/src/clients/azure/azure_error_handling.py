@@ -10,13 +10,20 @@ from azure.core.exceptions import (
     AzureError,
     )
 
+import httpx
+
 from functools import wraps
+from openai import APIConnectionError, APIStatusError
 from typing import Any, Callable
 
 from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.retry import RETRYABLE_STATUS_CODES, RetryDecision, parse_retry_after
 
 logger = setup_logging(log_name=__name__)
 
+# Connection failures raised before the request was sent, so the server cannot have acted on it.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
 def handle_azure_errors(func: Callable[..., Any]) -> Callable[..., dict[str, Any] | Any]:
     """Decorator that wraps Azure SDK calls with unified error handling."""
     @wraps(func)
@@ -72,4 +79,46 @@ def handle_azure_errors(func: Callable[..., Any]) -> Callable[..., dict[str, Any
                 "message": "Unexpected system error occurred."
                 }
 
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def classify_azure_error(error: Exception) -> RetryDecision:
+    """
+    Decides whether a failed Azure OpenAI call is worth retrying.
+
+    Connection errors, timeouts, 429 and transient 5xx responses are retried, honoring
+    the retry-after-ms and Retry-After headers. Other errors (e.g. 400, 404) are not.
+    """
+    if isinstance(error, APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS_CODES:
+            return RetryDecision(retry=False)
+        headers = error.response.headers
+        retry_after = None
+        if headers.get("retry-after-ms"):
+            retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+            retry_after = retry_after_ms / 1000 if retry_after_ms is not None else None
+        if retry_after is None:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+        return RetryDecision(retry=True, retry_after=retry_after)
+
+    if isinstance(error, APIConnectionError):
+        return RetryDecision(retry=True)
+
+    return RetryDecision(retry=False)
+
+
+def classify_azure_create_error(error: Exception) -> RetryDecision:
+    """
+    Decides whether a failed non-idempotent create (files.create, file_batches.create) is worth retrying.
+
+    Only failures where Azure cannot have created anything are retried: 429, and connection errors
+    raised before the request was sent. Timeouts, dropped connections and 5xx are ambiguous, as the
+    first attempt may have created the file or batch, so retrying could leave duplicates behind.
+    """
+    if isinstance(error, APIStatusError):
+        return classify_azure_error(error) if error.status_code == 429 else RetryDecision(retry=False)
+
+    if isinstance(error, APIConnectionError) and isinstance(error.__cause__, NOT_SENT_ERRORS):
+        return RetryDecision(retry=True)
+
+    return RetryDecision(retry=False)
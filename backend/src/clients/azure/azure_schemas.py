@@ -32,4 +32,46 @@ class VectorStoreDocument(BaseModel):
 class VectorStoreDocumentInput(BaseModel):
     title: str = Field(..., description="Title of the document")
     id: str = Field(..., description="Unique identifier of the document")
-    content: str = Field(..., description="Content of the document")
\ No newline at end of file
+    content: str = Field(..., description="Content of the document")
+    version: Optional[int] = Field(None, description="Confluence version number of the content")
+    content_hash: Optional[str] = Field(None, description="Hash of the converted content")
+    space_key: Optional[str] = Field(None, description="Key of the Confluence space the page belongs to")
+
+class VectorStorePageFile(BaseModel):
+    page_id: str = Field(..., description="Confluence page ID the file was created from")
+    file_id: str = Field(..., description="ID of the file in the vector store")
+    filename: str = Field(..., description="Filename of the uploaded document")
+    version: Optional[int] = Field(None, description="Confluence version number that was uploaded, if known")
+    content_hash: Optional[str] = Field(None, description="Hash of the uploaded content, if known")
+    created_at: datetime | int = Field(..., description="Timestamp when the file was created")
+    title: Optional[str] = Field(None, description="Page title, as used in the filename")
+    space_key: Optional[str] = Field(None, description="Key of the Confluence space of the page, if known")
+    status: Optional[str] = Field(None, description="Indexing status of the file: in_progress, completed, failed or cancelled")
+    synced_at: Optional[float] = Field(None, description="Time the file was uploaded or last reconciled, in seconds since the epoch")
+
+class VectorStorePageList(BaseModel):
+    items: list[VectorStorePageFile] = Field(..., description="Pages of this result page, ordered by page ID")
+    total: int = Field(..., description="Number of pages matching the filters, over all result pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next result page, None on the last one")
+
+class VectorStoreBatchResult(BaseModel):
+    batch_id: Optional[str] = Field(None, description="ID of the vector store file batch, if it was created")
+    status: str = Field(..., description="Status of the batch: in_progress, completed, failed, cancelled or upload_failed")
+    file_ids: list[str] = Field(default_factory=list, description="IDs of the files created for the batch")
+    page_ids: list[str] = Field(default_factory=list, description="Page IDs of the documents in the batch")
+    size_bytes: int = Field(0, description="Total size of the documents in the batch")
+    failed_file_ids: list[str] = Field(default_factory=list, description="IDs of the files that failed or were cancelled")
+    failed_page_ids: list[str] = Field(default_factory=list, description="Page IDs of the documents that failed")
+
+class VectorStoreUploadResult(BaseModel):
+    batches: list[VectorStoreBatchResult] = Field(default_factory=list, description="Result of each uploaded batch")
+    failed_file_ids: list[str] = Field(default_factory=list, description="IDs of all files that failed")
+    failed_page_ids: list[str] = Field(default_factory=list, description="Page IDs of all documents that failed")
+
+    @classmethod
+    def from_batches(cls, batches: list[VectorStoreBatchResult]) -> "VectorStoreUploadResult":
+        return cls(
+            batches=batches,
+            failed_file_ids=[file_id for batch in batches for file_id in batch.failed_file_ids],
+            failed_page_ids=[page_id for batch in batches for page_id in batch.failed_page_ids]
+        )
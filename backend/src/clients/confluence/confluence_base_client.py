@@ -6,20 +6,62 @@
 import os
 import requests
 
+from requests.adapters import HTTPAdapter
+
+from backend.src.clients.confluence.confluence_error_handling import classify_confluence_error
+from backend.src.utils.concurrency import AdaptiveConcurrencyLimiter, register_limiter
 from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.retry import RetryPolicy, TokenBucket
 
 logger = setup_logging(log_name=__name__)
 
+# Requests per second allowed towards Confluence, shared by all threads (0 = only honor Retry-After).
+RATE_LIMIT = float(os.getenv("CONFLUENCE_RATE_LIMIT", "25"))
+RATE_LIMIT_BURST = float(os.getenv("CONFLUENCE_RATE_LIMIT_BURST", "25"))
+# Attempts per request and the backoff bounds in seconds.
+MAX_ATTEMPTS = int(os.getenv("CONFLUENCE_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("CONFLUENCE_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("CONFLUENCE_RETRY_MAX_DELAY", "30"))
+# Adaptive limit on concurrent requests: starts at the initial value, grows while latency is stable
+# and halves on 429/5xx or rising latency. Worker pools are sized to the maximum.
+INITIAL_CONCURRENCY = int(os.getenv("CONFLUENCE_INITIAL_CONCURRENCY", "8"))
+MAX_CONCURRENCY = int(os.getenv("CONFLUENCE_MAX_CONCURRENCY", "16"))
+
 class BaseConfluenceClient:
     def __init__(
         self,
         url: str | None = None,
         username: str | None = None,
-        api_token: str | None = None
+        api_token: str | None = None,
+        pool_size: int | None = None,
+        timeout: float | None = None,
+        retry_policy: RetryPolicy | None = None
     ):
+        """
+        Confluence credentials and the HTTP session shared by the page and catalog clients.
+
+        All requests go through get(), which applies the timeout, the shared rate limit, the
+        adaptive concurrency limit and retries with backoff (see RetryPolicy).
+        """
         self.url = url or os.getenv("CONFLUENCE_URL")
         self.username = username or os.getenv("CONFLUENCE_USERNAME")
         self.api_token = api_token or os.getenv("CONFLUENCE_API_KEY")
+        # Keep-alive connections per host. The page and catalog clients share this pool,
+        # so it should be >= their combined number of concurrent workers.
+        self.pool_size = pool_size or int(os.getenv("CONFLUENCE_POOL_SIZE", "16"))
+        # (connect, read) timeout in seconds so one hanging request cannot block a worker forever.
+        self.timeout = timeout or float(os.getenv("CONFLUENCE_TIMEOUT", "30"))
+        self.retry_policy = retry_policy or RetryPolicy(
+            "Confluence",
+            classify_confluence_error,
+            max_attempts=MAX_ATTEMPTS,
+            base_delay=RETRY_BASE_DELAY,
+            max_delay=RETRY_MAX_DELAY,
+            limiter=TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST),
+            concurrency=register_limiter(AdaptiveConcurrencyLimiter(
+                "confluence", initial_limit=INITIAL_CONCURRENCY, max_limit=MAX_CONCURRENCY
+            ))
+        )
 
         missing = [name for name, val in {
             "CONFLUENCE_URL": self.url,
@@ -43,10 +85,14 @@ class BaseConfluenceClient:
                 extra={
                     "url": self.url,
                     "username": self.username,
+                    "pool_size": self.pool_size,
                 }
             )
 
             self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
             self.session.auth = (self.username, self.api_token)
             self.session.headers.update({"Accept": "application/json"})
             self.api_base_url = f"{self.url}/wiki/api/v2"
@@ -56,4 +102,34 @@ class BaseConfluenceClient:
                 "Failed to initialize Confluence client.",
                 exc_info=True
             )
-            raise
\ No newline at end of file
+            raise
+
+    def get(self, url: str, operation: str = "get", **kwargs) -> requests.Response:
+        """
+        GET a Confluence URL, retrying rate-limited and transient failures.
+
+        Args:
+            url: The URL to fetch.
+            operation: Name of the endpoint (e.g. "content.get"), used in retry logs and metrics.
+            **kwargs: Passed on to requests.Session.get.
+
+        Raises:
+            requests.RequestException: If the request still fails after the retries,
+                or fails with a non-retryable status.
+        """
+        def _get() -> requests.Response:
+            response = self.session.get(url, timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return self.retry_policy.call(operation, _get)
+
+    def close(self) -> None:
+        """Closes the session and its pooled connections."""
+        self.session.close()
+
+    @property
+    def max_concurrency(self) -> int:
+        """Upper bound of concurrent requests; worker pools larger than this only wait for a slot."""
+        concurrency = self.retry_policy.concurrency
+        return concurrency.max_limit if concurrency is not None else self.pool_size
@@ -1,13 +1,14 @@
 # NOTE: DONE FOR MVP
 # TODO: Add unit tests
 # TODO: Look into decorators for error handling
-# TODO: Performance improvements: Parallelize space page fetching
-# TODO: Add retry logic with exponential backoff for robustness
 # TODO: Better Exception Handling
 
+import os
 import requests
 
-from typing import Any, Optional, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional, TypeVar
 
 from backend.src.clients.confluence.confluence_base_client import BaseConfluenceClient
 
@@ -24,16 +25,42 @@ logger = setup_logging(__name__)
 
 T = TypeVar('T', bound=dict[str, Any])
 
+# Page statuses that remove a page from the catalog during an incremental refresh.
+REMOVED_PAGE_STATUSES = {"trashed", "deleted", "archived"}
+
 class ConfluenceCatalog:
-    def __init__(self, base_client: Optional[BaseConfluenceClient] = None):
+    def __init__(self, base_client: Optional[BaseConfluenceClient] = None, max_workers: int | None = None):
         """
         Initialize Confluence page client using a BaseConfluenceClient
         for credentials and session handling.
 
         Args:
             base_client: Optional BaseConfluenceClient instance. If None, creates new instance.
+            max_workers: Number of space listing threads. Defaults to CONFLUENCE_CATALOG_WORKERS, or the maximum
+                of the adaptive concurrency limit, which decides how many of them call Confluence at once.
         """
         self.client = base_client or BaseConfluenceClient()
+        self.max_workers = max_workers or int(os.getenv("CONFLUENCE_CATALOG_WORKERS", str(self.client.max_concurrency)))
+        # Safety margin subtracted from the watermark to absorb clock skew between us and Confluence.
+        self.watermark_overlap = timedelta(seconds=int(os.getenv("CATALOG_WATERMARK_OVERLAP_SECONDS", "120")))
+
+        # Index over the last built catalog, used to patch trees on incremental refresh.
+        self._spaces: dict[str, ConfluenceSpaceCatalog] = {}
+        self._nodes: dict[str, ConfluenceTreePage] = {}
+        self._node_space: dict[str, str] = {}
+        self._watermark: datetime | None = None
+        # Spaces copied (or built) during the running refresh, which may be patched in place;
+        # all others are shared with catalogs already returned and are copied before their first change.
+        self._owned_space_ids: set[str] = set()
+        # Spaces listed at most once per refresh, when a changed page belongs to an unknown space.
+        self._listed_spaces: dict[str, ConfluenceSpace] | None = None
+        # Pages added, moved, renamed or removed by incremental refreshes, for the search index.
+        self._changed_page_ids: set[str] = set()
+
+    @property
+    def watermark(self) -> datetime | None:
+        """Start time of the last successful full build or incremental refresh."""
+        return self._watermark
 
     def get_all_spaces(self) -> list[ConfluenceSpace]:
         """
@@ -43,7 +70,7 @@ class ConfluenceCatalog:
         """
         logger.info("Fetching all Confluence spaces...")
         spaces_url = f"{self.client.api_base_url}/spaces?limit=250"
-        raw_spaces = self._fetch_paginated_results(spaces_url)
+        raw_spaces = self._fetch_paginated_results(spaces_url, "spaces.list")
         
         spaces: list[ConfluenceSpace] = [
             {
@@ -66,7 +93,7 @@ class ConfluenceCatalog:
         logger.info(f"Fetching all pages for space ID {space_id}...")
 
         pages_url = f"{self.client.api_base_url}/spaces/{space_id}/pages?limit=250"
-        pages_raw = self._fetch_paginated_results(pages_url)
+        pages_raw = self._fetch_paginated_results(pages_url, "space_pages.list")
 
         pages: list[ConfluencePage] = [
             {"id": str(page_raw["id"]), "title": str(page_raw["title"]), "parentId": page_raw.get("parentId")}
@@ -76,68 +103,340 @@ class ConfluenceCatalog:
         logger.info(f"Found {len(pages)} pages in space {space_id}.")
         return pages
 
-    # TODO: Performance improvements: Parallelize space page fetching
     def get_full_catalog(self) -> list[ConfluenceSpaceCatalog]:
         """
         Fetches all spaces and builds a complete, structured page tree for each one.
         This is the primary method to generate the catalog for the dashboard.
 
+        Spaces are listed concurrently on a bounded thread pool; the output keeps
+        the order returned by the spaces endpoint.
+
         Returns:
             A list of spaces, each containing its name, ID, and a nested tree of its pages.
         """
         logger.info("Building the full Confluence catalog...")
 
-        catalog: list[ConfluenceSpaceCatalog] = []
+        started = datetime.now(timezone.utc)
         spaces: list[ConfluenceSpace] = self.get_all_spaces()
+        catalog: list[ConfluenceSpaceCatalog] = []
+
+        if spaces:
+            workers = min(self.max_workers, len(spaces))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="confluence-catalog") as executor:
+                catalog = list(executor.map(self._build_space_catalog, spaces))
+
+        self.load_catalog(catalog, started)
+        logger.info(f"Successfully built the full Confluence catalog for {len(catalog)} spaces.")
+        return catalog
+
+    def load_catalog(self, catalog: list[ConfluenceSpaceCatalog], watermark: datetime) -> None:
+        """
+        Indexes an already built catalog (e.g. a persisted snapshot) so it can be refreshed incrementally.
+
+        Args:
+            catalog: The catalog refreshed by refresh_catalog. It is not modified; changed spaces are copied.
+            watermark: Time the catalog was built; changes after it are fetched on the next refresh.
+        """
+        self._spaces = {space["id"]: space for space in catalog}
+        self._nodes = {}
+        self._node_space = {}
+        self._changed_page_ids = set()
+
+        for space in catalog:
+            stack = list(space["pages"])
+            while stack:
+                node = stack.pop()
+                self._nodes[node["id"]] = node
+                self._node_space[node["id"]] = space["id"]
+                stack.extend(node["children"])
+
+        self._watermark = watermark
+
+    def refresh_catalog(self) -> list[ConfluenceSpaceCatalog]:
+        """
+        Incrementally refreshes the catalog from pages modified since the last watermark.
+
+        Changed pages are patched into the existing trees instead of rebuilding them, so the
+        cost follows the rate of change rather than the total page count. Only the spaces with
+        changes are copied first; catalogs returned earlier are never modified and unchanged
+        spaces are shared with them. Falls back to a full build when no catalog has been built or loaded yet.
+
+        NOTE: Changes are detected through page versions. Operations that do not create a new
+        version (e.g. purges) are only picked up by the next full build.
+
+        Returns:
+            The refreshed catalog, in the same shape as get_full_catalog.
+        """
+        if self._watermark is None:
+            return self.get_full_catalog()
+
+        started = datetime.now(timezone.utc)
+        changes = self.get_pages_modified_since(self._watermark - self.watermark_overlap)
+        self._owned_space_ids = set()
+        self._listed_spaces = None
+
+        # Listing is newest first; apply oldest first so parents tend to exist before their children.
+        applied = sum(self._apply_page_change(change) for change in reversed(changes))
+
+        self._watermark = started
+        logger.info(f"Incremental catalog refresh applied {applied} of {len(changes)} page changes.")
+        return list(self._spaces.values())
+
+    def pop_changed_pages(self) -> dict[str, tuple[ConfluenceTreePage, str] | None]:
+        """
+        Returns the pages changed by incremental refreshes since the last call or full build,
+        mapped to their node and space ID, or None if the page was removed.
+        """
+        changed, self._changed_page_ids = self._changed_page_ids, set()
+        return {
+            page_id: (self._nodes[page_id], self._node_space[page_id]) if page_id in self._nodes else None
+            for page_id in changed
+        }
+
+    def get_pages_modified_since(self, since: datetime) -> list[dict[str, Any]]:
+        """
+        Lists pages across all spaces whose latest version was created after `since`,
+        including trashed and deleted pages, newest first.
+
+        Raises:
+            requests.RequestException: If a listing request fails, so the watermark is not advanced past missed changes.
+        """
+        pages_url = (
+            f"{self.client.api_base_url}/pages"
+            f"?sort=-modified-date&status=current,trashed,deleted,archived&limit=250"
+        )
+        changes: list[dict[str, Any]] = []
+
+        for page_raw in self._iter_paginated_results(pages_url, "pages.list"):
+            modified_at = self._parse_timestamp(page_raw.get("version", {}).get("createdAt"))
+            if modified_at is not None and modified_at < since:
+                break
+            changes.append(page_raw)
+
+        logger.info(f"Found {len(changes)} pages modified since {since.isoformat()}.")
+        return changes
+
+    def _apply_page_change(self, page_raw: dict[str, Any]) -> bool:
+        """
+        Patches a single created, updated, moved or removed page into the indexed trees.
 
-        for space in spaces:
-            pages: list[ConfluencePage] = self.get_pages_for_space(space['id'])
-            page_tree: list[ConfluenceTreePage] = self._build_page_tree(pages)
-            
-            space_catalog: ConfluenceSpaceCatalog = {
+        Returns:
+            True if the catalog changed.
+        """
+        page_id = str(page_raw["id"])
+        space_id = str(page_raw.get("spaceId", ""))
+        parent_id = page_raw.get("parentId")
+        parent_id = str(parent_id) if parent_id else None
+        node = self._nodes.get(page_id)
+
+        if page_raw.get("status") in REMOVED_PAGE_STATUSES:
+            if node is None:
+                return False
+            self._own_space(self._node_space[page_id])
+            self._remove_node(self._nodes[page_id])
+            return True
+
+        if space_id not in self._spaces and not self._add_space(space_id):
+            logger.warning(f"Skipping page {page_id}: unknown space {space_id}.")
+            return False
+
+        if node is None:
+            self._own_space(space_id)
+            node = {"id": page_id, "title": str(page_raw["title"]), "parentId": parent_id, "children": []}
+            self._nodes[page_id] = node
+            self._attach_node(node, space_id)
+            self._adopt_orphans(node, space_id)
+            self._changed_page_ids.add(page_id)
+            return True
+
+        moved_space = self._node_space[page_id] != space_id
+        moved = node["parentId"] != parent_id or moved_space
+        renamed = node["title"] != page_raw["title"]
+        if not (moved or renamed):
+            return False
+
+        self._own_space(self._node_space[page_id])
+        self._own_space(space_id)
+        node = self._nodes[page_id]  # The copy, if the space was just copied.
+        if moved:
+            self._detach_node(node)
+            node["parentId"] = parent_id
+            self._attach_node(node, space_id)
+            self._adopt_orphans(node, space_id)
+        if moved_space:
+            # The whole subtree moves with the page.
+            stack = list(node["children"])
+            while stack:
+                descendant = stack.pop()
+                self._node_space[descendant["id"]] = space_id
+                self._changed_page_ids.add(descendant["id"])
+                stack.extend(descendant["children"])
+        if renamed:
+            node["title"] = str(page_raw["title"])
+        self._changed_page_ids.add(page_id)
+        return True
+
+    def _own_space(self, space_id: str) -> None:
+        """Copies the tree of a space before its first change in a refresh, leaving returned catalogs untouched."""
+        if space_id in self._owned_space_ids:
+            return
+        space = self._spaces[space_id]
+        pages = [dict(node) for node in space["pages"]]
+        stack = list(pages)
+        while stack:
+            node = stack.pop()
+            node["children"] = [dict(child) for child in node["children"]]
+            self._nodes[node["id"]] = node
+            stack.extend(node["children"])
+        self._spaces[space_id] = {**space, "pages": pages}
+        self._owned_space_ids.add(space_id)
+
+    def _add_space(self, space_id: str) -> bool:
+        """Adds a space created after the last build, with its full page tree."""
+        if self._listed_spaces is None:
+            self._listed_spaces = {space["id"]: space for space in self.get_all_spaces()}
+        space = self._listed_spaces.get(space_id)
+        if space is None:
+            return False
+
+        space_catalog = self._build_space_catalog(space)
+        self._spaces[space_id] = space_catalog
+        self._owned_space_ids.add(space_id)
+
+        stack = list(space_catalog["pages"])
+        while stack:
+            node = stack.pop()
+            self._nodes[node["id"]] = node
+            self._node_space[node["id"]] = space_id
+            self._changed_page_ids.add(node["id"])
+            stack.extend(node["children"])
+        return True
+
+    def _siblings(self, node: ConfluenceTreePage) -> list[ConfluenceTreePage]:
+        """Returns the list a node is (or would be) attached to: its parent's children or its space's roots."""
+        parent = self._nodes.get(node["parentId"]) if node["parentId"] else None
+        if parent is not None and self._node_space.get(parent["id"]) == self._node_space[node["id"]]:
+            return parent["children"]
+        return self._spaces[self._node_space[node["id"]]]["pages"]
+
+    def _attach_node(self, node: ConfluenceTreePage, space_id: str) -> None:
+        self._node_space[node["id"]] = space_id
+        self._siblings(node).append(node)
+
+    def _detach_node(self, node: ConfluenceTreePage) -> None:
+        siblings = self._siblings(node)
+        # Compare by identity: dict equality would walk whole subtrees.
+        index = next((i for i, sibling in enumerate(siblings) if sibling is node), None)
+        if index is not None:
+            del siblings[index]
+
+    def _adopt_orphans(self, node: ConfluenceTreePage, space_id: str) -> None:
+        """Moves root pages whose parent is `node` under it (children listed before their parent)."""
+        roots = self._spaces[space_id]["pages"]
+        orphans = [root for root in roots if root["parentId"] == node["id"] and root is not node]
+        if orphans:
+            roots[:] = [root for root in roots if not (root["parentId"] == node["id"] and root is not node)]
+            node["children"].extend(orphans)
+
+    def _remove_node(self, node: ConfluenceTreePage) -> None:
+        """Removes a page; like Confluence, its children move up to the removed page's parent."""
+        siblings = self._siblings(node)
+        self._detach_node(node)
+        for child in node["children"]:
+            child["parentId"] = node["parentId"]
+            siblings.append(child)
+            self._changed_page_ids.add(child["id"])
+        self._changed_page_ids.add(node["id"])
+        del self._nodes[node["id"]]
+        del self._node_space[node["id"]]
+
+    @staticmethod
+    def _parse_timestamp(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    def get_space_catalog(self, space: ConfluenceSpace) -> ConfluenceSpaceCatalog:
+        """
+        Lists the pages of one space and builds its page tree, for loading spaces one at a time.
+
+        NOTE: Unlike the full catalog, the space is not indexed for incremental refreshes.
+
+        Raises:
+            requests.RequestException: If the pages could not be listed.
+        """
+        pages: list[ConfluencePage] = self.get_pages_for_space(space['id'])
+        page_tree: list[ConfluenceTreePage] = self._build_page_tree(pages)
+        logger.info(f"Built page tree for space '{space['name']}'.")
+
+        return {
+            "id": space["id"],
+            "name": space["name"],
+            "key": space["key"],
+            "pages": page_tree
+        }
+
+    def _build_space_catalog(self, space: ConfluenceSpace) -> ConfluenceSpaceCatalog:
+        """
+        Lists the pages of one space and builds its page tree.
+
+        NOTE: A failing space is logged and returned without pages so it does not abort the whole catalog.
+        """
+        try:
+            return self.get_space_catalog(space)
+        except Exception as e:
+            logger.error(f"Failed to build page tree for space '{space['name']}': {e}", exc_info=True)
+            return {
                 "id": space["id"],
                 "name": space["name"],
                 "key": space["key"],
-                "pages": page_tree
+                "pages": []
             }
-            catalog.append(space_catalog)
-            logger.info(f"Built page tree for space '{space['name']}'.")
-
-        logger.info("Successfully built the full Confluence catalog.")
-        return catalog
     
-    # TODO: Add retry logic with exponential backoff for robustness
-    def _fetch_paginated_results(self, url: str) -> list[T]:
+    def _fetch_paginated_results(self, url: str, operation: str) -> list[T]:
         """
         Handles pagination for Confluence API v2 endpoints by following the 'next' link.
 
+        Each request is retried with backoff by the base client, so a failure here means
+        the listing could not be completed; it is raised rather than returning a partial list.
+
         Args:
             url: The initial URL for the API endpoint.
+            operation: Name of the listing, used in retry logs and metrics.
 
         Returns:
             A list containing all results from all pages.
+
+        Raises:
+            requests.RequestException: If a page request still fails after the retries.
+        """
+        try:
+            return list(self._iter_paginated_results(url, operation))
+        # TODO: Better Exception Handling, e.g. sending a meaning full message to the frontend to try again
+        except requests.RequestException as e:
+            logger.error(f"Error during pagination for URL {url}: {e}", exc_info=True)
+            raise
+
+    def _iter_paginated_results(self, url: str, operation: str) -> Iterator[T]:
+        """
+        Lazily yields results across pages, so callers can stop early without fetching the remaining pages.
+
+        Raises:
+            requests.RequestException: If any page request fails.
         """
-        all_results: list[T] = []
         next_url: str | None = url
 
         while next_url:
-            try:
-                response = self.client.session.get(next_url)
-                response.raise_for_status()
-                data = response.json()
-                
-                all_results.extend(data.get('results', []))
-                
-                next_link = data.get('_links', {}).get('next')
-                if next_link:
-                    next_url = f"{self.client.url}{next_link}"
-                else:
-                    next_url = None
-            # TODO: Better Exception Handling, e.g. sending a meaning full message to the frontend to try again
-            except requests.RequestException as e:
-                logger.error(f"Error during pagination for URL {next_url}: {e}", exc_info=True)
-                break
-        return all_results
+            response = self.client.get(next_url, operation)
+            data = response.json()
+
+            yield from data.get('results', [])
+
+            next_link = data.get('_links', {}).get('next')
+            next_url = f"{self.client.url}{next_link}" if next_link else None
 
     def _build_page_tree(self, pages: list[ConfluencePage]) -> list[ConfluenceTreePage]:
         """
@@ -1 +1,23 @@
-# TODO: Find Confluence Specific Exceptions
\ No newline at end of file
+# TODO: Find Confluence Specific Exceptions
+
+import requests
+
+from backend.src.utils.retry import RETRYABLE_STATUS_CODES, RetryDecision, parse_retry_after
+
+def classify_confluence_error(error: Exception) -> RetryDecision:
+    """
+    Decides whether a failed Confluence request is worth retrying.
+
+    Connection errors, timeouts, 429 and transient 5xx responses are retried, honoring Retry-After.
+    Other HTTP errors (e.g. 401, 404) are returned to the caller as is.
+    """
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        if response is None or response.status_code not in RETRYABLE_STATUS_CODES:
+            return RetryDecision(retry=False)
+        return RetryDecision(retry=True, retry_after=parse_retry_after(response.headers.get("Retry-After")))
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return RetryDecision(retry=True)
+
+    return RetryDecision(retry=False)
@@ -3,82 +3,213 @@
 # TODO: Look into decorators for error handling
 # TODO: Better Exception Handling
 
+import os
 import requests
+import time
 
-from bs4 import BeautifulSoup, NavigableString
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
 
 from backend.src.clients.confluence.confluence_base_client import BaseConfluenceClient
 
+from backend.src.clients.confluence.confluence_storage_rewriter import rewrite_storage_html
 from backend.src.clients.confluence.confluence_schemas import (
     RawConfluencePageMinimal, 
     StructuredConfluencePage, 
     ConfluencePageFetchResult
     )
 
+from backend.src.utils import tracing
 from backend.src.utils.logger_init import setup_logging
 
 logger = setup_logging(__name__)
 
+# Maximum number of IDs accepted by the v2 pages listing.
+VERSION_LOOKUP_BATCH_SIZE = 250
+
 class ConfluencePageClient:
-    def __init__(self, base_client: Optional[BaseConfluenceClient] = None):
+    def __init__(self, base_client: Optional[BaseConfluenceClient] = None, max_workers: int | None = None):
         """
         Initialize Confluence page client using a BaseConfluenceClient
         for credentials and session handling.
 
         Args:
             base_client: Optional BaseConfluenceClient instance. If None, creates new instance.
+            max_workers: Number of fetch threads. Defaults to CONFLUENCE_FETCH_WORKERS, or the maximum of
+                the adaptive concurrency limit, which decides how many of them call Confluence at once.
         """
         self.client = base_client or BaseConfluenceClient()
+        self.max_workers = max_workers or int(os.getenv("CONFLUENCE_FETCH_WORKERS", str(self.client.max_concurrency)))
+
+        if self.max_workers > self.client.pool_size:
+            logger.warning(
+                f"CONFLUENCE_FETCH_WORKERS ({self.max_workers}) exceeds the connection pool size "
+                f"({self.client.pool_size}); extra connections will not be kept alive."
+            )
 
-    # TODO: Concurrent Fetching
-    def get_pages_content(self, page_ids: list[str]) -> ConfluencePageFetchResult:
+    def get_pages_content(self, page_ids: list[str], max_workers: int | None = None) -> ConfluencePageFetchResult:
         """
         Fetch and return the JSON content of multiple Confluence pages.
+
+        Pages are fetched concurrently on a bounded thread pool. The order of
+        successful pages follows the order of page_ids.
         
         Args:
             page_ids: List of Confluence page IDs to fetch.
+            max_workers: Optional override of the number of concurrent fetches.
             
         Returns:
             ConfluencePageFetchResult containing successful and failed page fetches.
         """
         successful_pages: list[RawConfluencePageMinimal] = []
         failed_page_ids: list[str] = []
+        page_latencies: dict[str, float] = {}
 
-        for page_id in page_ids:
-            try:
-                response = self.client.session.get(
-                    f"{self.client.url}/wiki/rest/api/content/{page_id}?expand=body.storage",
-                    auth=(self.client.username, self.client.api_token)
-                )
-                response.raise_for_status()
-                data = response.json()
-                value = data.get('body', {}).get('storage', {}).get('value', '')
+        if not page_ids:
+            return ConfluencePageFetchResult(successful_pages=[], failed_page_ids=[])
+
+        workers = min(max_workers or self.max_workers, len(page_ids))
+        started = time.perf_counter()
 
-                if not value.strip():
-                    logger.warning(f"Page {page_id} has empty content")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="confluence-fetch") as executor:
+            results = executor.map(self._fetch_page, page_ids)
+
+            for page_id, (page, latency) in zip(page_ids, results):
+                page_latencies[page_id] = latency
+                if page is None:
                     failed_page_ids.append(page_id)
-                    continue
-            
-                page = RawConfluencePageMinimal(
-                    id=data['id'],
-                    type=data['type'],
-                    status=data.get('status', ''),
-                    title=data['title'],
-                    value=value
-                )
-                successful_pages.append(page)
-   
-            except requests.RequestException as e:
-                logger.error(f"Error fetching page {page_id}", exc_info=True)
-                failed_page_ids.append(page_id)
-                continue
-        
+                else:
+                    successful_pages.append(page)
+
+        elapsed = time.perf_counter() - started
+        latencies = sorted(page_latencies.values())
+        logger.info(
+            f"Fetched {len(successful_pages)}/{len(page_ids)} pages in {elapsed:.2f}s "
+            f"with {workers} workers (p50 {latencies[len(latencies) // 2]:.3f}s, "
+            f"max {latencies[-1]:.3f}s)."
+        )
+
         return ConfluencePageFetchResult(
             successful_pages=successful_pages,
-            failed_page_ids=failed_page_ids
+            failed_page_ids=failed_page_ids,
+            page_latencies=page_latencies
         )
 
+    def iter_pages_content(
+        self,
+        page_ids: list[str],
+        max_workers: int | None = None
+    ) -> Iterator[tuple[str, RawConfluencePageMinimal | None, float]]:
+        """
+        Fetch pages concurrently and yield each one as soon as it is fetched.
+
+        At most twice the number of workers fetches are queued at a time, so memory
+        stays bounded when the consumer is slower than the fetches.
+
+        Args:
+            page_ids: List of Confluence page IDs to fetch.
+            max_workers: Optional override of the number of concurrent fetches.
+
+        Yields:
+            Tuples of page ID, the page (None if the fetch failed or the page is empty) and the latency in seconds.
+        """
+        if not page_ids:
+            return
+
+        workers = min(max_workers or self.max_workers, len(page_ids))
+        remaining = iter(page_ids)
+
+        fetch_page = tracing.in_context(self._fetch_page)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="confluence-fetch") as executor:
+            in_flight: dict[Future, str] = {}
+
+            def _submit_next() -> None:
+                page_id = next(remaining, None)
+                if page_id is not None:
+                    in_flight[executor.submit(fetch_page, page_id)] = page_id
+
+            for _ in range(workers * 2):
+                _submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_id = in_flight.pop(future)
+                    page, latency = future.result()
+                    _submit_next()
+                    yield page_id, page, latency
+
+    def get_page_versions(self, page_ids: list[str]) -> dict[str, int]:
+        """
+        Fetch the current version number of multiple pages without their content.
+
+        Uses the v2 pages listing filtered by ID, 250 pages per request.
+
+        Args:
+            page_ids: List of Confluence page IDs.
+
+        Returns:
+            Mapping of page ID to current version number. Pages that could not be
+            looked up are missing from the mapping.
+        """
+        versions: dict[str, int] = {}
+
+        for start in range(0, len(page_ids), VERSION_LOOKUP_BATCH_SIZE):
+            batch = page_ids[start:start + VERSION_LOOKUP_BATCH_SIZE]
+            try:
+                response = self.client.get(
+                    f"{self.client.api_base_url}/pages",
+                    "pages.list",
+                    params={"id": ",".join(batch), "limit": VERSION_LOOKUP_BATCH_SIZE}
+                )
+                for page in response.json().get("results", []):
+                    number = page.get("version", {}).get("number")
+                    if number is not None:
+                        versions[str(page["id"])] = int(number)
+            except requests.RequestException as e:
+                logger.error(f"Error fetching versions for {len(batch)} pages: {e}", exc_info=True)
+
+        logger.info(f"Fetched current versions for {len(versions)}/{len(page_ids)} pages.")
+        return versions
+
+    def _fetch_page(self, page_id: str) -> tuple[RawConfluencePageMinimal | None, float]:
+        """
+        Fetch a single page and time the round trip.
+
+        Returns:
+            The page, or None if the fetch failed or the page is empty, and the latency in seconds.
+        """
+        started = time.perf_counter()
+        try:
+            with tracing.span("fetch", page_id=page_id) as span:
+                response = self.client.get(
+                    f"{self.client.url}/wiki/rest/api/content/{page_id}?expand=body.storage,version,space",
+                    "content.get"
+                )
+                data = response.json()
+                value = data.get('body', {}).get('storage', {}).get('value', '')
+                span.set(bytes=len(response.content), version=data.get('version', {}).get('number'))
+
+            if not value.strip():
+                logger.warning(f"Page {page_id} has empty content")
+                return None, time.perf_counter() - started
+
+            page = RawConfluencePageMinimal(
+                id=data['id'],
+                type=data['type'],
+                status=data.get('status', ''),
+                title=data['title'],
+                value=value,
+                version=data.get('version', {}).get('number'),
+                space_key=data.get('space', {}).get('key')
+            )
+            return page, time.perf_counter() - started
+
+        except requests.RequestException as e:
+            logger.error(f"Error fetching page {page_id}", exc_info=True)
+            return None, time.perf_counter() - started
+
     def structure_page(self, pages: list[RawConfluencePageMinimal]) -> list[StructuredConfluencePage]:
         """
         Convert raw Confluence pages data into structured format.
@@ -89,34 +220,26 @@ class ConfluencePageClient:
         Returns:
             List of structured page information.
         """
-        structured_pages: list[StructuredConfluencePage] = []
-
-        for page in pages:
-            html_content = f"<html><body>{page.value}</body></html>"
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            for ac_image in soup.find_all("ac:image"):
-                ri_attachment = ac_image.find("ri:attachment")
-                filename = ri_attachment["ri:filename"] if ri_attachment and ri_attachment.has_attr("ri:filename") else "unknown_image"
-                placeholder = soup.new_tag("p")
-                placeholder.string = f"IMAGE: {filename}"
-                ac_image.replace_with(placeholder)
-
-            # TODO: Link description is missing not sure yet if really needed
-            for link in soup.find_all("a"):
-                url = link.get("href", "unknown_link")
-                parent = link.parent
-                if parent.name == "p":
-                    link.replace_with(NavigableString(f"LINK: {url}"))
-                else:
-                    placeholder = soup.new_tag("p")
-                    placeholder.string = f"LINK: {url}"
-                    link.replace_with(placeholder)
-            
-            structured_pages.append(StructuredConfluencePage(
-                id=page.id,
-                title=page.title,
-                type=page.type,
-                html_content=str(soup)
-            ))
-        return structured_pages
\ No newline at end of file
+        return [self.structure_single_page(page) for page in pages]
+
+    def structure_single_page(self, page: RawConfluencePageMinimal) -> StructuredConfluencePage:
+        """
+        Convert one raw Confluence page into structured format, replacing images and links with text placeholders.
+        The HTML is rewritten in a single streaming pass, see rewrite_storage_html.
+
+        Args:
+            page: Raw page data as fetched from Confluence.
+
+        Returns:
+            The structured page.
+        """
+        html_content = rewrite_storage_html(f"<html><body>{page.value}</body></html>")
+
+        return StructuredConfluencePage(
+            id=page.id,
+            title=page.title,
+            type=page.type,
+            html_content=html_content,
+            version=page.version,
+            space_key=page.space_key
+        )
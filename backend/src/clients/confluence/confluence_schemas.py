@@ -9,12 +9,16 @@ class RawConfluencePageMinimal(BaseModel):
     status: str = Field(..., description="Current status of the page")
     title: str = Field(..., description="Page title")
     value: str = Field(..., description="Page content") 
+    version: Optional[int] = Field(None, description="Version number of the fetched content")
+    space_key: Optional[str] = Field(None, description="Key of the space the page belongs to")
 
 class StructuredConfluencePage(BaseModel):
     id: str = Field(..., description="Unique identifier of the structured page")
     title: str = Field(..., description="Page title")
     type: str = Field(..., description="Type of the Confluence content")
     html_content: str = Field(..., description="HTML content of the page")
+    version: Optional[int] = Field(None, description="Version number of the page content")
+    space_key: Optional[str] = Field(None, description="Key of the space the page belongs to")
 
 class ConfluencePageFetchResult(BaseModel):
     successful_pages: list[RawConfluencePageMinimal] = Field(
@@ -23,6 +27,9 @@ class ConfluencePageFetchResult(BaseModel):
     failed_page_ids: list[str] = Field(
         ..., description="List of page IDs that failed to fetch"
     )
+    page_latencies: dict[str, float] = Field(
+        default_factory=dict, description="Fetch latency in seconds per page ID, including failed fetches"
+    )
 
 class ConfluenceSpace(BaseModel):
     id: str = Field(..., description="Unique identifier of the space")
@@ -38,4 +45,16 @@ class ConfluenceTreePage(ConfluencePage):
     children: list["ConfluenceTreePage"] = Field(default_factory=list, description="Child pages of the current page")
 
 class ConfluenceSpaceCatalog(ConfluenceSpace):
-    pages: list[ConfluenceTreePage] = Field(default_factory=list, description="Tree of pages within the space")
\ No newline at end of file
+    pages: list[ConfluenceTreePage] = Field(default_factory=list, description="Tree of pages within the space")
+
+class ConfluenceSpaceSummary(ConfluenceSpace):
+    page_count: Optional[int] = Field(None, description="Number of pages in the space, None until the space was loaded")
+
+class ConfluencePageNode(ConfluencePage):
+    child_count: int = Field(..., description="Number of direct child pages, also when they are not included")
+    children: list["ConfluencePageNode"] = Field(default_factory=list, description="Child pages included up to the requested depth")
+
+class ConfluencePageLevel(BaseModel):
+    items: list[ConfluencePageNode] = Field(default_factory=list, description="Pages of this result page, in tree order")
+    total: int = Field(..., description="Number of pages on the requested level, over all result pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next result page, None on the last one")
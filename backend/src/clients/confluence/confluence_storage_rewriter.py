@@ -0,0 +1,278 @@
+from html.parser import HTMLParser
+from typing import Optional
+
+from bs4.builder import HTMLTreeBuilder, nonwhitespace_re
+from bs4.dammit import EntitySubstitution
+from bs4.element import CharsetMetaAttributeValue, ContentMetaAttributeValue
+from bs4.formatter import HTMLFormatter
+
+# Whitespace characters BeautifulSoup collapses in whitespace-only text nodes.
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# Serialization rules of str(BeautifulSoup(..., "html.parser")), taken from bs4 itself
+# so the rewriter follows the installed version.
+_builder = HTMLTreeBuilder()
+_formatter = HTMLFormatter.REGISTRY["minimal"]
+VOID_ELEMENTS = frozenset(_builder.empty_element_tags)
+PRESERVE_WHITESPACE_TAGS = frozenset(_builder.preserve_whitespace_tags)
+CDATA_CONTAINING_TAGS = frozenset(_formatter.cdata_containing_tags)
+UNIVERSAL_LIST_ATTRIBUTES = frozenset(_builder.cdata_list_attributes.get("*", ()))
+TAG_LIST_ATTRIBUTES = {name: frozenset(attrs) for name, attrs in _builder.cdata_list_attributes.items()}
+
+ROOT_TAG_NAME = "[document]"
+
+class _OpenTag:
+    __slots__ = ("name", "start_tag", "has_children")
+
+    def __init__(self, name: str, start_tag: str):
+        self.name = name
+        self.start_tag = start_tag  # Opening tag without the closing ">"
+        self.has_children = False
+
+
+class StorageHtmlRewriter(HTMLParser):
+    def __init__(self):
+        """
+        Single-pass rewriter of Confluence storage-format HTML that replaces images and links with
+        text placeholders while the page is tokenized, without building a document tree.
+
+        The output is identical to parsing with BeautifulSoup's "html.parser" builder, replacing
+        every <ac:image> with <p>IMAGE: filename</p>, then every <a> with "LINK: url" (or
+        <p>LINK: url</p> outside a paragraph), and serializing the tree with str(soup).
+        The tokenizer is the one BeautifulSoup uses, and its tree building and serialization
+        rules (tag closing, whitespace collapsing, escaping, attribute order) are mirrored here.
+        """
+        super().__init__(convert_charrefs=False)
+        self._out: list[str] = []
+        self._stack: list[_OpenTag] = [_OpenTag(ROOT_TAG_NAME, "")]
+        self._open_counts: dict[str, int] = {}
+        self._preserve_whitespace = 0
+        self._data: list[str] = []
+        self._already_closed_void: list[str] = []
+
+        # Replaced element being skipped: its stack position and the placeholder written when it closes.
+        self._skip_at: Optional[int] = None
+        self._placeholder = ""
+        self._image_filename: Optional[str] = None
+        self._image_attachment_seen = False
+
+    def rewrite(self, html_content: str) -> str:
+        """Rewrites a complete document and returns the serialized result."""
+        self.feed(html_content)
+        self.close()
+        self._already_closed_void = []
+        self._end_data()
+        while len(self._stack) > 1:
+            self._pop()
+        return "".join(self._out)
+
+    # ----- Tokenizer events (mirroring bs4's BeautifulSoupHTMLParser) -----
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        attr_dict: dict[str, str] = {}
+        for key, value in attrs:
+            attr_dict[key] = "" if value is None else value
+
+        self._end_data()
+        self._push(tag, attr_dict)
+
+        if handle_empty_element and tag in VOID_ELEMENTS:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._already_closed_void.append(tag)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if check_already_closed and tag in self._already_closed_void:
+            self._already_closed_void.remove(tag)
+        else:
+            self._end_data()
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith("x"):
+            codepoint = int(name.lstrip("x"), 16)
+        elif name.startswith("X"):
+            codepoint = int(name.lstrip("X"), 16)
+        else:
+            codepoint = int(name)
+
+        data = None
+        if codepoint < 256:
+            # References below 256 are often meant as windows-1252.
+            try:
+                data = bytearray([codepoint]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._special_string(data, "<!--", "-->")
+
+    def handle_decl(self, decl):
+        self._special_string(decl[len("DOCTYPE "):], "<!DOCTYPE ", ">\n")
+
+    def unknown_decl(self, data):
+        if data.upper().startswith("CDATA["):
+            self._special_string(data[len("CDATA["):], "<![CDATA[", "]]>")
+        else:
+            self._special_string(data, "<?", "?>")
+
+    def handle_pi(self, data):
+        self._special_string(data, "<?", ">")
+
+    # ----- Tree building (mirroring bs4's BeautifulSoup) -----
+
+    def _special_string(self, data: str, prefix: str, suffix: str) -> None:
+        """Writes a comment, CDATA block or declaration, which are output without escaping."""
+        self._end_data()
+        self._data.append(data)
+        text = self._take_data()
+        if text is not None:
+            self._add_child()
+            self._write(prefix + text + suffix)
+
+    def _take_data(self) -> Optional[str]:
+        """Returns the pending text node, collapsing whitespace-only text, or None if there is none."""
+        if not self._data:
+            return None
+        text = "".join(self._data)
+        self._data = []
+        if not self._preserve_whitespace and not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        return text
+
+    def _end_data(self) -> None:
+        text = self._take_data()
+        if text is None:
+            return
+        self._add_child()
+        if self._stack[-1].name not in CDATA_CONTAINING_TAGS:
+            text = _formatter.substitute(text)
+        self._write(text)
+
+    def _push(self, name: str, attrs: dict[str, str]) -> None:
+        parent = self._stack[-1]
+        self._add_child()
+
+        if self._skip_at is None:
+            if name == "ac:image":
+                self._skip_at = len(self._stack)
+                self._image_filename = None
+                self._image_attachment_seen = False
+            elif name == "a":
+                # TODO: Link description is missing not sure yet if really needed
+                text = _formatter.substitute(f"LINK: {attrs.get('href', 'unknown_link')}")
+                self._skip_at = len(self._stack)
+                self._placeholder = text if parent.name == "p" else f"<p>{text}</p>"
+        elif name == "ri:attachment" and self._placeholder_pending_image() and not self._image_attachment_seen:
+            # The first attachment inside the image names it.
+            self._image_attachment_seen = True
+            self._image_filename = attrs.get("ri:filename")
+
+        tag = _OpenTag(name, self._format_start_tag(name, attrs) if self._skip_at is None else "")
+        self._stack.append(tag)
+        self._open_counts[name] = self._open_counts.get(name, 0) + 1
+        if name in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_whitespace += 1
+
+        # Void elements are written once it is known whether they end up empty (<br/>) or not.
+        if name not in VOID_ELEMENTS:
+            self._write(tag.start_tag + ">")
+
+    def _pop_to(self, name: str) -> None:
+        """Closes the most recent open tag with this name and everything opened after it. Unmatched end tags are ignored."""
+        for _ in range(len(self._stack) - 1, 0, -1):
+            if not self._open_counts.get(name):
+                break
+            if self._pop() == name:
+                break
+
+    def _pop(self) -> str:
+        position = len(self._stack) - 1
+        tag = self._stack.pop()
+        self._open_counts[tag.name] -= 1
+        if tag.name in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_whitespace -= 1
+
+        if tag.name in VOID_ELEMENTS and not tag.has_children:
+            self._write(tag.start_tag + _formatter.void_element_close_prefix + ">")
+        else:
+            self._write(f"</{tag.name}>")
+
+        if position == self._skip_at:
+            self._skip_at = None
+            if tag.name == "ac:image":
+                filename = self._image_filename if self._image_filename is not None else "unknown_image"
+                self._placeholder = f"<p>{_formatter.substitute(f'IMAGE: {filename}')}</p>"
+            self._write(self._placeholder)
+        return tag.name
+
+    def _placeholder_pending_image(self) -> bool:
+        return self._stack[self._skip_at].name == "ac:image"
+
+    def _add_child(self) -> None:
+        """Marks the current tag as non-empty, writing a void element's opening tag on its first child."""
+        parent = self._stack[-1]
+        if not parent.has_children:
+            parent.has_children = True
+            if parent.name in VOID_ELEMENTS:
+                self._write(parent.start_tag + ">")
+
+    def _write(self, piece: str) -> None:
+        if self._skip_at is None:
+            self._out.append(piece)
+
+    # ----- Serialization (mirroring bs4's Tag.decode with the "minimal" formatter) -----
+
+    def _format_start_tag(self, name: str, attrs: dict[str, str]) -> str:
+        if not attrs:
+            return f"<{name}"
+
+        tag_list_attributes = TAG_LIST_ATTRIBUTES.get(name, ())
+        _substitute_meta_charset(name, attrs)
+
+        pieces = [f"<{name}"]
+        for key in sorted(attrs):
+            value = attrs[key]
+            if key in UNIVERSAL_LIST_ATTRIBUTES or key in tag_list_attributes:
+                value = " ".join(nonwhitespace_re.findall(value))
+            pieces.append(f"{key}={_formatter.quoted_attribute_value(_formatter.attribute_value(value))}")
+        return " ".join(pieces)
+
+
+def _substitute_meta_charset(name: str, attrs: dict[str, str]) -> None:
+    """Declares UTF-8 in <meta> charset declarations, as BeautifulSoup does when serializing."""
+    if name != "meta":
+        return
+    if "charset" in attrs:
+        attrs["charset"] = CharsetMetaAttributeValue(attrs["charset"]).substitute_encoding("utf-8")
+    elif "content" in attrs and attrs.get("http-equiv", "").lower() == "content-type":
+        attrs["content"] = ContentMetaAttributeValue(attrs["content"]).substitute_encoding("utf-8")
+
+
+def rewrite_storage_html(html_content: str) -> str:
+    """
+    Replaces images and links in Confluence storage-format HTML with text placeholders in a single pass.
+
+    Args:
+        html_content: The HTML document to rewrite.
+
+    Returns:
+        The rewritten HTML, identical to the former BeautifulSoup-based rewrite.
+    """
+    return StorageHtmlRewriter().rewrite(html_content)
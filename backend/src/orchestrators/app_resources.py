@@ -0,0 +1,59 @@
+import os
+
+from backend.src.clients.azure.azure_client import AzureVectorStoreManager
+from backend.src.clients.confluence.confluence_base_client import BaseConfluenceClient
+from backend.src.clients.confluence.confluence_catalog_client import ConfluenceCatalog
+from backend.src.clients.confluence.confluence_page_client import ConfluencePageClient
+from backend.src.processors.docling_converter import DoclingConversionPool, docling_conversion_pool
+from backend.src.utils.catalog_cache import CatalogCache
+from backend.src.utils.logger_init import setup_logging
+
+logger = setup_logging(__name__)
+
+# Build the full catalog at startup when no snapshot was persisted. Off by default: spaces are
+# then only fetched as users expand them, and the full catalog on the first catalog or search request.
+CATALOG_WARM_UP = os.getenv("CATALOG_WARM_UP", "false").lower() == "true"
+
+class AppResources:
+    def __init__(
+        self,
+        confluence_base_client: BaseConfluenceClient | None = None,
+        azure_client: AzureVectorStoreManager | None = None,
+        conversion_pool: DoclingConversionPool | None = None
+    ):
+        """
+        Clients, connection pools and converters shared by every request and sync for the
+        lifetime of the application. Created once at startup and closed at shutdown.
+
+        The Confluence page and catalog clients share one session, so all Confluence calls
+        reuse the same keep-alive pool (CONFLUENCE_POOL_SIZE).
+
+        Args:
+            confluence_base_client: Confluence session and credentials. Defaults to a new BaseConfluenceClient.
+            azure_client: Azure vector store client. Defaults to a new AzureVectorStoreManager.
+            conversion_pool: Docling worker pool. Defaults to the shared conversion pool.
+        """
+        self.confluence_base_client = confluence_base_client or BaseConfluenceClient()
+        self.confluence_page_client = ConfluencePageClient(self.confluence_base_client)
+        self.confluence_catalog = ConfluenceCatalog(self.confluence_base_client)
+        self.catalog_cache = CatalogCache(self.confluence_catalog)
+        self.azure_client = azure_client or AzureVectorStoreManager()
+        self.conversion_pool = conversion_pool or docling_conversion_pool
+
+    def warm_up(self) -> None:
+        """Starts the converter workers, and builds the catalog when CATALOG_WARM_UP is set, so the first requests do not pay for it."""
+        self.conversion_pool.warm_up()
+        if CATALOG_WARM_UP and self.catalog_cache.snapshot is None:
+            self.catalog_cache.refresh_in_background()
+
+    def close(self) -> None:
+        """Stops the converter workers and closes all connection pools."""
+        for name, close in (
+            ("conversion pool", self.conversion_pool.shutdown),
+            ("Azure client", self.azure_client.close),
+            ("Confluence client", self.confluence_base_client.close)
+        ):
+            try:
+                close()
+            except Exception:
+                logger.error(f"Failed to close the {name}", exc_info=True)
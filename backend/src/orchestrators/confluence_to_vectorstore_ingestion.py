@@ -1,64 +1,349 @@
+import os
+import queue
+import threading
+import time
+import weakref
+
+from typing import Any
+
 from backend.src.clients.azure.azure_client import AzureVectorStoreManager
-from backend.src.clients.azure.azure_schemas import VectorStoreDocumentInput
+from backend.src.clients.azure.azure_schemas import VectorStoreDocumentInput, VectorStorePageFile
 from backend.src.clients.confluence.confluence_page_client import ConfluencePageClient
-from backend.src.processors.docling_converter import DoclingConverter
+from backend.src.orchestrators.app_resources import AppResources
+from backend.src.processors.docling_converter import DoclingConversionPool
+from backend.src.utils import tracing
 from backend.src.utils.deletion_cache import pending_deletion_cache
 from backend.src.utils.formatters import format_for_vector_ingestion
 from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import Gauge, Histogram
+from backend.src.utils.sync_progress import SyncProgress
 from backend.src.utils.sync_utils import build_sync_plan
+from backend.src.utils.tracing import sync_trace_store
 
 logger = setup_logging(__name__)
 
-def ingest_confluence_pages(vector_store_id: str, page_ids: list[str]) -> dict:
+# Maximum number of items waiting between two pipeline stages.
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))
+# Number of documents uploaded to the vector store per rolling batch.
+PIPELINE_UPLOAD_BATCH_SIZE = int(os.getenv("PIPELINE_UPLOAD_BATCH_SIZE", "50"))
+
+# Marks the end of a stage's output.
+_END = object()
+
+SYNC_STAGE_SECONDS = Histogram(
+    "sync_stage_duration_seconds",
+    "Wall time of each sync stage (plan, fetch, convert, upload, delete) per sync.",
+    ["stage"]
+)
+SYNC_PAGE_SECONDS = Histogram(
+    "sync_page_duration_seconds",
+    "Time spent on a single page in the fetch and structure stages.",
+    ["stage"]
+)
+SYNC_QUEUE_DEPTH = Gauge("sync_queue_depth", "Items waiting between pipeline stages, over all running syncs.", ["queue"])
+
+# Queues of the running syncs, read when metrics are rendered so the pipeline pays nothing per item.
+_active_queues: dict[str, weakref.WeakSet] = {"fetched": weakref.WeakSet(), "converted": weakref.WeakSet()}
+for _name, _queues in _active_queues.items():
+    SYNC_QUEUE_DEPTH.labels(_name).set_function(lambda queues=_queues: sum(q.qsize() for q in list(queues)))
+
+def ingest_confluence_pages(
+    vector_store_id: str,
+    page_ids: list[str],
+    resources: AppResources,
+    progress: SyncProgress | None = None,
+    trace_id: str | None = None
+) -> dict:
     """
     Orchestrate Confluence pages ingestions to the vector store.
+
+    Pages to add or update stream through fetch -> structure -> convert -> upload stages
+    connected by bounded queues, and are uploaded in rolling batches.
+    Every sync is traced (stages, batches and per-page fetch, structure, convert and upload
+    spans) and the trace is kept in the sync trace store.
     
     Args:
         vector_store_id: ID of the vector store to ingest into
         page_ids: List of Confluence page IDs to process
+        resources: Application-wide clients and converters to use
+        progress: Optional SyncProgress updated live as pages move through the stages
+        trace_id: Optional ID of the sync trace (32 hex characters), e.g. the sync job ID
         
     Returns:
         A dictionary with details about the ingestion process. Fields include:
-            - sync_plan: Details of pages added, updated, or deleted
+            - sync_plan: Details of pages added, updated, left unchanged, or deleted
             - deleted: List of page IDs that were deleted
+            - added_or_updated: List of page IDs that were uploaded
+            - unchanged: List of page IDs whose content did not change and were skipped
+            - failed: List of page IDs whose upload or indexing failed
     """
+    with tracing.start_trace(
+        "sync", trace_id, store=sync_trace_store, vector_store_id=vector_store_id, pages=len(page_ids)
+    ) as trace:
+        summary = _ingest_confluence_pages(vector_store_id, page_ids, resources, progress or SyncProgress())
+        trace.root.set(**{key: len(summary[key]) for key in ("added_or_updated", "unchanged", "deleted", "failed")})
+    return summary
+
+def _ingest_confluence_pages(
+    vector_store_id: str,
+    page_ids: list[str],
+    resources: AppResources,
+    progress: SyncProgress
+) -> dict:
+    started = time.perf_counter()
     pending_deletion_cache.clear_expired()
 
-    vector_manager = AzureVectorStoreManager()
-    confluence_client = ConfluencePageClient()
-    converter = DoclingConverter()
+    vector_manager = resources.azure_client
+    confluence_client = resources.confluence_page_client
 
-    existing_page_ids = vector_manager.get_existing_page_ids(vector_store_id)
-    active_page_ids = existing_page_ids - pending_deletion_cache.get_ids()
-    sync_plan = build_sync_plan(page_ids, active_page_ids)
-    logger.info(f"Sync plan: {sync_plan}")
+    with tracing.span("plan") as span:
+        existing_pages = vector_manager.get_existing_pages(vector_store_id)
+        active_page_ids = set(existing_pages) - pending_deletion_cache.get_ids()
 
-    contents_to_add: list[VectorStoreDocumentInput] = []
-    if sync_plan["add_or_update"]:
-        processing_result = confluence_client.get_pages_content(sync_plan["add_or_update"])
-        
-        if processing_result.failed_page_ids:
-            logger.error(f"Failed to fetch pages: {processing_result.failed_page_ids}")
-        
-        if processing_result.successful_pages:
-            structured_pages = confluence_client.structure_page(processing_result.successful_pages)
-            
-            for structured in structured_pages:
-                markdown = converter.convert_html(structured.html_content)
-                prepared = format_for_vector_ingestion(markdown, structured)
-                contents_to_add.append(prepared)
+        # Only pages already in the store need their current version to decide between update and unchanged.
+        pages_to_check = [page_id for page_id in set(page_ids) if page_id in active_page_ids]
+        current_versions = confluence_client.get_page_versions(pages_to_check) if pages_to_check else {}
+        existing_versions = {page_id: existing_pages[page_id].version for page_id in active_page_ids}
+
+        sync_plan = build_sync_plan(page_ids, active_page_ids, existing_versions, current_versions)
+        span.set(**{action: len(sync_plan[action]) for action in ("add", "update", "unchanged", "delete")})
+    SYNC_STAGE_SECONDS.labels("plan").observe(time.perf_counter() - started)
+    logger.info(
+        f"Sync plan: {len(sync_plan['add'])} to add, {len(sync_plan['update'])} to update, "
+        f"{len(sync_plan['unchanged'])} unchanged, {len(sync_plan['delete'])} to delete."
+    )
 
-    if contents_to_add:
-        vector_manager.upload_documents_to_vector_store(vector_store_id, contents_to_add)
+    for stage in ("fetch", "convert", "upload"):
+        progress.set_total(stage, len(sync_plan["add_or_update"]))
+    progress.set_total("delete", len(sync_plan["delete"]))
+
+    uploaded_page_ids: list[str] = []
+    failed_page_ids: list[str] = []
+    unchanged: list[str] = list(sync_plan["unchanged"])
+    if sync_plan["add_or_update"]:
+        progress.set_stage("syncing")
+        uploaded_page_ids, failed_page_ids, skipped_page_ids = _stream_pages_to_vector_store(
+            vector_store_id,
+            sync_plan["add_or_update"],
+            existing_pages,
+            active_page_ids,
+            confluence_client,
+            vector_manager,
+            resources.conversion_pool,
+            progress
+        )
+        unchanged.extend(skipped_page_ids)
 
-    delete_results = vector_manager.delete_file_by_page_id(vector_store_id, sync_plan['delete'])
+    progress.set_stage("deleting")
+    with SYNC_STAGE_SECONDS.labels("delete").time(), tracing.span("delete", files=len(sync_plan["delete"])):
+        delete_results = vector_manager.delete_file_by_page_id(vector_store_id, sync_plan['delete'], existing_pages)
+    deleted_count = sum(delete_results.values())
+    progress.advance("delete", deleted_count)
+    progress.advance("delete", len(delete_results) - deleted_count, "failed")
 
     for page_id, success in delete_results.items():
         if success:
             pending_deletion_cache.add(page_id)
 
+    progress.set_stage("done")
     return {
         "sync_plan": sync_plan,
         "deleted": [pid for pid, success in delete_results.items() if success],
-        "added_or_updated": [p["id"] for p in contents_to_add]
-        }
\ No newline at end of file
+        "added_or_updated": uploaded_page_ids,
+        "unchanged": unchanged,
+        "failed": failed_page_ids
+        }
+
+def _stream_pages_to_vector_store(
+    vector_store_id: str,
+    page_ids: list[str],
+    existing_pages: dict[str, VectorStorePageFile],
+    active_page_ids: set[str],
+    confluence_client: ConfluencePageClient,
+    vector_manager: AzureVectorStoreManager,
+    conversion_pool: DoclingConversionPool,
+    progress: SyncProgress
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    Fetch, structure, convert and upload pages as a streaming pipeline.
+
+    Fetching runs in one thread and structuring plus conversion in another, each feeding a
+    bounded queue; the calling thread uploads documents in rolling batches without waiting
+    for indexing. Memory therefore stays bounded by the queue sizes regardless of the number of pages.
+    Once every batch finished indexing, the files replaced by successfully updated pages are deleted.
+    Updated pages whose content did not change keep their file and only get their new version indexed.
+
+    Returns:
+        The IDs of the uploaded pages, the IDs of pages whose upload failed, and the IDs of
+        updated pages skipped because their content did not change.
+    """
+    raw_pages: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    documents: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    _active_queues["fetched"].add(raw_pages)
+    _active_queues["converted"].add(documents)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    skipped_page_ids: list[str] = []
+    skipped_files: list[VectorStorePageFile] = []
+
+    def fetch_stage() -> None:
+        failed_page_ids: list[str] = []
+        fetch_seconds = SYNC_PAGE_SECONDS.labels("fetch")
+        started = time.perf_counter()
+        try:
+            with tracing.span("fetch", pages=len(page_ids)):
+                for page_id, page, latency in confluence_client.iter_pages_content(page_ids):
+                    fetch_seconds.observe(latency)
+                    if stop.is_set():
+                        return
+                    if page is None:
+                        failed_page_ids.append(page_id)
+                        progress.advance("fetch", outcome="failed")
+                        progress.skip_after("fetch")
+                        continue
+                    progress.advance("fetch")
+                    _put(raw_pages, page, stop)
+            if failed_page_ids:
+                logger.error(f"Failed to fetch pages: {failed_page_ids}")
+        except Exception as e:
+            logger.error("Fetch stage failed", exc_info=True)
+            errors.append(e)
+            stop.set()
+        finally:
+            SYNC_STAGE_SECONDS.labels("fetch").observe(time.perf_counter() - started)
+            _put(raw_pages, _END, stop)
+
+    # Wall clock time each page was handed to the conversion pool, for its convert span.
+    submitted_at: dict[str, int] = {}
+
+    def structured_pages():
+        structure_seconds = SYNC_PAGE_SECONDS.labels("structure")
+        while (page := _get(raw_pages, stop)) is not _END:
+            try:
+                with structure_seconds.time(), tracing.span("structure", page_id=page.id) as span:
+                    structured = confluence_client.structure_single_page(page)
+                    span.set(html_bytes=len(structured.html_content))
+            except Exception:
+                logger.error(f"Failed to structure page {page.id}, skipping.", exc_info=True)
+                progress.advance("convert", outcome="failed")
+                progress.skip_after("convert")
+                continue
+            submitted_at[structured.id] = time.time_ns()
+            yield structured, structured.html_content
+
+    def convert_stage() -> None:
+        started = time.perf_counter()
+        try:
+            with tracing.span("convert", pages=len(page_ids)):
+                for structured, markdown in conversion_pool.iter_convert(structured_pages()):
+                    if stop.is_set():
+                        return
+                    tracing.record_span(
+                        "convert", submitted_at.pop(structured.id, time.time_ns()),
+                        page_id=structured.id, markdown_bytes=len(markdown) if markdown is not None else None
+                    )
+                    if markdown is None:
+                        logger.error(f"Failed to convert page {structured.id}, skipping.")
+                        progress.advance("convert", outcome="failed")
+                        progress.skip_after("convert")
+                        continue
+                    progress.advance("convert")
+                    prepared = format_for_vector_ingestion(markdown, structured)
+
+                    # A new version can carry identical content (e.g. metadata-only edits); skip the re-upload.
+                    existing = existing_pages.get(structured.id)
+                    if existing is not None and existing.content_hash == prepared["content_hash"]:
+                        skipped_page_ids.append(structured.id)
+                        skipped_files.append(existing.model_copy(update={"version": structured.version}))
+                        progress.skip_after("convert")
+                        continue
+                    _put(documents, prepared, stop)
+        except Exception as e:
+            logger.error("Convert stage failed", exc_info=True)
+            errors.append(e)
+            stop.set()
+        finally:
+            SYNC_STAGE_SECONDS.labels("convert").observe(time.perf_counter() - started)
+            _put(documents, _END, stop)
+
+    stages = [
+        threading.Thread(target=tracing.in_context(fetch_stage), name="sync-fetch", daemon=True),
+        threading.Thread(target=tracing.in_context(convert_stage), name="sync-convert", daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    submitted_page_ids: list[str] = []
+    failed_page_ids: list[str] = []
+    pending_batch_ids: list[str] = []
+    batch: list[VectorStoreDocumentInput] = []
+
+    def upload(batch: list[VectorStoreDocumentInput]) -> None:
+        result = vector_manager.upload_documents_to_vector_store(vector_store_id, batch, wait=False)
+        submitted_page_ids.extend(p["id"] for p in batch)
+        failed_page_ids.extend(result.failed_page_ids)
+        progress.advance("upload", len(batch) - len(result.failed_page_ids))
+        progress.advance("upload", len(result.failed_page_ids), "failed")
+        pending_batch_ids.extend(b.batch_id for b in result.batches if b.batch_id)
+
+    upload_started = time.perf_counter()
+    try:
+        with tracing.span("upload", pages=len(page_ids)):
+            while (document := _get(documents, stop)) is not _END:
+                if stop.is_set():
+                    break
+                batch.append(document)
+                if len(batch) >= PIPELINE_UPLOAD_BATCH_SIZE:
+                    upload(batch)
+                    batch = []
+            if batch and not stop.is_set():
+                upload(batch)
+    except Exception:
+        stop.set()
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+        # Collect indexing results even on failure, so no background poll is left unclaimed.
+        with tracing.span("indexing", batches=len(pending_batch_ids)):
+            indexing_result = vector_manager.wait_for_batches(pending_batch_ids)
+        SYNC_STAGE_SECONDS.labels("upload").observe(time.perf_counter() - upload_started)
+        _active_queues["fetched"].discard(raw_pages)
+        _active_queues["converted"].discard(documents)
+
+    # Recorded even if the pipeline failed, so these pages are not converted again by the next sync.
+    vector_manager.update_page_versions(vector_store_id, skipped_files)
+
+    if errors:
+        raise errors[0]
+
+    failed_page_ids.extend(indexing_result.failed_page_ids)
+    failed = set(failed_page_ids)
+    uploaded_page_ids = [page_id for page_id in submitted_page_ids if page_id not in failed]
+
+    # The new files are indexed, remove the files they replace.
+    replaced_file_ids = [existing_pages[page_id].file_id for page_id in uploaded_page_ids if page_id in active_page_ids]
+    if replaced_file_ids:
+        vector_manager.delete_files(vector_store_id, replaced_file_ids)
+
+    if failed_page_ids:
+        logger.error(f"Failed to upload pages: {failed_page_ids}")
+    return uploaded_page_ids, failed_page_ids, skipped_page_ids
+
+def _put(target: queue.Queue, item: Any, stop: threading.Event) -> None:
+    """Put an item on a bounded queue, giving up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+def _get(source: queue.Queue, stop: threading.Event) -> Any:
+    """Take the next item from a queue, or the end marker once the pipeline is stopped."""
+    while True:
+        try:
+            return source.get(timeout=0.5)
+        except queue.Empty:
+            if stop.is_set():
+                return _END
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import uuid
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+from backend.src.orchestrators.app_resources import AppResources
+from backend.src.orchestrators.confluence_to_vectorstore_ingestion import ingest_confluence_pages
+from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.profiling import PROFILE_SLOW_SYNC_MS, ProfileSession, profile_request
+from backend.src.utils.sync_progress import SyncProgress
+
+logger = setup_logging(__name__)
+
+class SyncJob:
+    def __init__(self, vector_store_id: str, page_ids: list[str], resources: AppResources, profile: bool = False):
+        """A background run of ingest_confluence_pages with its live progress, profiled when requested or slow."""
+        self.id = uuid.uuid4().hex
+        self.vector_store_id = vector_store_id
+        self.page_ids = page_ids
+        self.resources = resources
+        self.status = "queued"  # queued -> running -> succeeded | failed
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self.profile_requested = profile
+        self.profile: ProfileSession | None = None
+
+        self._changed = threading.Condition()
+        self._revision = 0
+        self.progress = SyncProgress(on_change=self._notify)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "vector_store_id": self.vector_store_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "trace_id": self.id,
+            "profile_id": self.profile.profile_id if self.profile else None,
+            "progress": self.progress.snapshot(),
+            "result": self.result,
+            "error": self.error
+        }
+
+    def set_status(self, status: str, result: dict[str, Any] | None = None, error: str | None = None) -> None:
+        self.status = status
+        self.result = result
+        self.error = error
+        if self.finished:
+            self.finished_at = time.time()
+        self._notify()
+
+    def iter_updates(self, heartbeat_seconds: float = 15.0) -> Iterator[dict[str, Any] | None]:
+        """
+        Yields the job state whenever it changes, until the job finished.
+
+        Yields None after heartbeat_seconds without a change so streams can send keep-alives.
+        """
+        seen = -1
+        while True:
+            with self._changed:
+                if self._revision == seen:
+                    self._changed.wait(heartbeat_seconds)
+                if self._revision == seen:
+                    yield None
+                    continue
+                seen = self._revision
+            state = self.to_dict()
+            yield state
+            if state["status"] in ("succeeded", "failed"):
+                return
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._revision += 1
+            self._changed.notify_all()
+
+
+class SyncJobManager:
+    def __init__(self, max_workers: int | None = None, retention: int | None = None):
+        """
+        Runs syncs as background jobs and keeps the most recent ones for status queries.
+
+        Syncs of the same vector store run one at a time, in submission order: a sync submitted
+        while another one of its store is queued or running waits behind it, as both would plan
+        against the same index and upload or delete the same pages.
+
+        Args:
+            max_workers: Number of syncs running at once. Defaults to SYNC_JOB_WORKERS.
+            retention: Number of jobs kept in memory. Defaults to SYNC_JOB_RETENTION.
+        """
+        self.max_workers = max_workers or int(os.getenv("SYNC_JOB_WORKERS", "2"))
+        self.retention = retention or int(os.getenv("SYNC_JOB_RETENTION", "100"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sync-job")
+        self._jobs: OrderedDict[str, SyncJob] = OrderedDict()
+        self._store_queues: dict[str, deque[SyncJob]] = {}  # Per vector store, the running job first.
+        self._lock = threading.Lock()
+
+    def submit(self, vector_store_id: str, page_ids: list[str], resources: AppResources, profile: bool = False) -> SyncJob:
+        """Queues a sync, run with the given application resources, and returns its job immediately."""
+        job = SyncJob(vector_store_id, page_ids, resources, profile)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            queue = self._store_queues.setdefault(vector_store_id, deque())
+            queue.append(job)
+            waiting = len(queue) - 1
+        if not waiting:
+            self._executor.submit(self._run, job)
+        logger.info(
+            f"Queued sync job {job.id} for vector store {vector_store_id} with {len(page_ids)} pages"
+            f"{f', behind {waiting} sync jobs of the same store' if waiting else ''}."
+        )
+        return job
+
+    def get(self, job_id: str) -> SyncJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: SyncJob) -> None:
+        job.set_status("running")
+        try:
+            with profile_request("sync", job.id, requested=job.profile_requested, slow_ms=PROFILE_SLOW_SYNC_MS) as job.profile:
+                result = ingest_confluence_pages(
+                    vector_store_id=job.vector_store_id,
+                    page_ids=job.page_ids,
+                    resources=job.resources,
+                    progress=job.progress,
+                    trace_id=job.id
+                )
+            job.set_status("succeeded", result=result)
+            logger.info(f"Sync job {job.id} succeeded.")
+        except Exception as e:
+            logger.error(f"Sync job {job.id} failed", exc_info=True)
+            job.set_status("failed", error=str(e))
+        finally:
+            self._start_next(job.vector_store_id)
+
+    def _start_next(self, vector_store_id: str) -> None:
+        """Starts the next queued sync of the store once its running one finished."""
+        with self._lock:
+            queue = self._store_queues[vector_store_id]
+            queue.popleft()
+            if not queue:
+                del self._store_queues[vector_store_id]
+                return
+            next_job = queue[0]
+        self._executor.submit(self._run, next_job)
+
+    def _prune(self) -> None:
+        """Drops the oldest finished jobs beyond the retention limit. Called with the lock held."""
+        excess = len(self._jobs) - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+
+# Create a single instance of the manager to be used throughout the application.
+sync_job_manager = SyncJobManager()
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import threading
+
+from collections import OrderedDict
+from importlib import metadata
+from pathlib import Path
+
+from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import CACHE_LOOKUPS
+
+logger = setup_logging(log_name=__name__)
+
+def _converter_version() -> str:
+    try:
+        return metadata.version("docling")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+class ConversionCache:
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None):
+        """
+        Content-addressed, size-bounded disk cache of HTML -> Markdown conversions.
+
+        Entries are keyed by a hash of the exact structured HTML and the Docling
+        version, and evicted least recently used first once max_bytes is exceeded.
+
+        Args:
+            cache_dir: Directory holding the entries. Defaults to CONVERSION_CACHE_DIR.
+            max_bytes: Maximum total size of the entries. Defaults to CONVERSION_CACHE_MAX_MB megabytes.
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("CONVERSION_CACHE_DIR", "cache/conversions"))
+        self.max_bytes = max_bytes or int(os.getenv("CONVERSION_CACHE_MAX_MB", "512")) * 1024 * 1024
+        self.converter_version = _converter_version()
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def make_key(self, html_string: str) -> str:
+        """
+        Hashes the HTML as is, salted with the converter version.
+
+        NOTE: Whitespace is not normalized, as it is significant in <pre> blocks and code macros.
+        """
+        digest = hashlib.sha256(self.converter_version.encode("utf-8") + b"\0" + html_string.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached Markdown for a key, or None on a miss."""
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                self.misses += 1
+                CACHE_LOOKUPS.labels("conversion", "miss").inc()
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            markdown = path.read_text(encoding="utf-8")
+            os.utime(path)  # Keeps the LRU order across restarts.
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            CACHE_LOOKUPS.labels("conversion", "miss").inc()
+            return None
+
+        with self._lock:
+            self.hits += 1
+        CACHE_LOOKUPS.labels("conversion", "hit").inc()
+        return markdown
+
+    def put(self, key: str, markdown: str) -> None:
+        """Stores a conversion and evicts the least recently used entries beyond max_bytes."""
+        path = self._path(key)
+        data = markdown.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write conversion cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            self._load()
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            evicted = self._evict()
+
+        for evicted_key in evicted:
+            try:
+                self._path(evicted_key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, float]:
+        """Returns hit/miss counters and the current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.md"
+
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> list[str]:
+        evicted: list[str] = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _load(self) -> None:
+        """Indexes the entries already on disk, oldest access first. Called with the lock held."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_dir.exists():
+            return
+
+        files = []
+        for path in self.cache_dir.glob("*/*.md"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        logger.info(f"Loaded {len(self._entries)} conversion cache entries ({self._total_bytes} bytes).")
+
+
+# Create a single instance of the cache to be used throughout the application.
+conversion_cache = ConversionCache()
@@ -1,13 +1,34 @@
+import multiprocessing
+import os
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from docling.datamodel.base_models import InputFormat
 from docling.document_converter import DocumentConverter
+from typing import Iterable, Iterator, TypeVar
 
+from backend.src.processors.conversion_cache import ConversionCache, conversion_cache
 from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import Histogram
 
 logger = setup_logging(log_name=__name__)
 
+T = TypeVar("T")
+
+CONVERSION_SECONDS = Histogram(
+    "docling_conversion_duration_seconds",
+    "Time from submitting a document to the conversion pool until its Markdown is ready, including queueing."
+)
+
+# Converter owned by each pool worker process, built once by _init_worker.
+_worker_converter: DocumentConverter | None = None
+
 class DoclingConverter:
-    def __init__(self):
+    def __init__(self, cache: ConversionCache | None = None):
         self.converter = DocumentConverter()
+        self.cache = cache or conversion_cache
 
     def _to_markdown(self, result) -> str:
         """Shared post-processing to export Docling document as Markdown."""
@@ -15,11 +36,18 @@ class DoclingConverter:
         return docling_doc.export_to_markdown()
 
     def convert_html(self, html_string: str) -> str:
-        """Convert HTML content into Markdown."""
+        """Convert HTML content into Markdown, reusing cached conversions of identical HTML."""
+        key = self.cache.make_key(html_string)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
         result = self.converter.convert_string(
             html_string, InputFormat.HTML, name="html_input"
         )
-        return self._to_markdown(result)
+        markdown = self._to_markdown(result)
+        self.cache.put(key, markdown)
+        return markdown
 
     # ----- TODO: Implement these -----
     # NOTE: Now takes a pdf path but ideally use drag and drop pdf from frontend.
@@ -43,4 +71,217 @@ class DoclingConverter:
     def convert_image(self, ) -> str:
         # Check which format, and then call the format specific function:
         # PNG, JPEG, TIFF, BMP, WEBP
-        pass
\ No newline at end of file
+        pass
+
+
+def _init_worker() -> None:
+    """Builds the worker's DocumentConverter once, when the process starts."""
+    global _worker_converter
+    _worker_converter = DocumentConverter()
+
+
+def _convert_html_in_worker(html_string: str) -> str:
+    result = _worker_converter.convert_string(html_string, InputFormat.HTML, name="html_input")
+    return result.document.export_to_markdown()
+
+
+def _start_pool(max_workers: int) -> ProcessPoolExecutor:
+    # Spawn instead of fork: the parent runs request and fetch threads that must not be forked.
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    )
+
+
+class DoclingConversionPool:
+    def __init__(self, max_workers: int | None = None, cache: ConversionCache | None = None):
+        """
+        Converts HTML to Markdown in parallel on a pool of worker processes,
+        each holding a warm DocumentConverter.
+
+        The pool is started lazily on first use and kept for the lifetime of the process.
+        Conversions are looked up in and stored to the conversion cache by the parent process.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to DOCLING_WORKERS, or the CPU count.
+            cache: Conversion cache in front of the workers. Defaults to the shared conversion cache.
+        """
+        self.max_workers = max_workers or int(os.getenv("DOCLING_WORKERS", str(os.cpu_count() or 1)))
+        self.cache = cache or conversion_cache
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()  # Shared by concurrent syncs: one pool is started and replaced at a time.
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting Docling conversion pool with {self.max_workers} workers...")
+                self._executor = _start_pool(self.max_workers)
+            return self._executor
+
+    def warm_up(self) -> None:
+        """
+        Starts the worker processes and runs a tiny conversion on each, without waiting,
+        so the first sync does not pay for process start-up and Docling initialization.
+        """
+        for _ in range(self.max_workers):
+            self.submit("<p>warm-up</p>")
+
+    def submit(self, html_string: str) -> Future:
+        """Schedules one HTML conversion and returns a Future resolving to its Markdown."""
+        return self._submit(html_string)[0]
+
+    def _submit(self, html_string: str) -> tuple[Future, ProcessPoolExecutor]:
+        """Schedules one conversion; also returns the pool it runs on, to replace that pool if it crashes."""
+        executor = self._get_executor()
+        try:
+            return executor.submit(_convert_html_in_worker, html_string), executor
+        except BrokenProcessPool:
+            self._reset(executor)
+            executor = self._get_executor()
+            return executor.submit(_convert_html_in_worker, html_string), executor
+
+    def convert_many(self, html_strings: list[str]) -> list[str | None]:
+        """
+        Converts multiple HTML documents in parallel.
+
+        Returns:
+            The Markdown of each document in input order, or None for documents that failed to convert.
+            A failure is isolated to its own document.
+        """
+        results: list[str | None] = [None] * len(html_strings)
+        for position, markdown in self.iter_convert(enumerate(html_strings)):
+            results[position] = markdown
+        return results
+
+    def iter_convert(
+        self,
+        items: Iterable[tuple[T, str]],
+        max_in_flight: int | None = None
+    ) -> Iterator[tuple[T, str | None]]:
+        """
+        Converts a stream of HTML documents in parallel, yielding each result as soon as it is ready.
+
+        Items are pulled from the input lazily, keeping at most max_in_flight conversions
+        queued (twice the number of workers by default), so memory stays bounded.
+
+        Args:
+            items: Pairs of a caller-defined tag and the HTML to convert.
+            max_in_flight: Maximum number of conversions queued at once.
+
+        Yields:
+            Pairs of the tag and its Markdown, or None if the conversion failed, in completion order.
+        """
+        limit = max_in_flight or self.max_workers * 2
+        source = iter(items)
+        exhausted = False
+        in_flight: dict[Future, tuple[T, str, str, ProcessPoolExecutor]] = {}
+        submitted_at: dict[Future, float] = {}
+        converted = cached = 0
+
+        while True:
+            while not exhausted and len(in_flight) < limit:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                tag, html = item
+                key = self.cache.make_key(html)
+                markdown = self.cache.get(key)
+                if markdown is not None:
+                    cached += 1
+                    yield tag, markdown
+                    continue
+                future, executor = self._submit(html)
+                in_flight[future] = (tag, html, key, executor)
+                submitted_at[future] = time.perf_counter()
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            crashed: list[tuple[T, str, str, ProcessPoolExecutor]] = []
+
+            for future in done:
+                tag, html, key, executor = in_flight.pop(future)
+                CONVERSION_SECONDS.observe(time.perf_counter() - submitted_at.pop(future))
+                try:
+                    markdown = future.result()
+                except BrokenProcessPool:
+                    crashed.append((tag, html, key, executor))
+                    continue
+                except Exception as e:
+                    logger.error(f"Docling conversion failed for document {tag}: {e}", exc_info=True)
+                    yield tag, None
+                    continue
+                self.cache.put(key, markdown)
+                converted += 1
+                yield tag, markdown
+
+            # A worker crash (e.g. out of memory on a huge page) fails every pending document,
+            # also those of other syncs sharing the pool. Each caller retries only its own documents,
+            # one by one, so only the offending document fails.
+            if crashed:
+                crashed.extend(in_flight.values())
+                in_flight.clear()
+                submitted_at.clear()
+                logger.warning(f"Docling worker crashed, retrying {len(crashed)} documents individually.")
+                for executor in {executor for _, _, _, executor in crashed}:
+                    self._reset(executor)
+                for tag, markdown in self._convert_isolated((tag, html, key) for tag, html, key, _ in crashed):
+                    converted += markdown is not None
+                    yield tag, markdown
+
+        logger.info(f"Converted {converted} documents, {cached} served from the conversion cache.")
+
+    def _convert_isolated(self, items: Iterable[tuple[T, str, str]]) -> Iterator[tuple[T, str | None]]:
+        """
+        Converts documents one at a time on a private single-worker pool, so a crash is attributed to
+        the document that caused it and not to whatever other syncs run on the shared pool meanwhile.
+        """
+        executor: ProcessPoolExecutor | None = None
+        try:
+            for tag, html_string, key in items:
+                if executor is None:
+                    executor = _start_pool(1)
+                try:
+                    markdown = executor.submit(_convert_html_in_worker, html_string).result()
+                except BrokenProcessPool:
+                    logger.error(f"Docling conversion crashed the worker for document {tag}.")
+                    executor.shutdown(wait=False)
+                    executor = None
+                    yield tag, None
+                    continue
+                except Exception as e:
+                    logger.error(f"Docling conversion failed for document {tag}: {e}", exc_info=True)
+                    yield tag, None
+                    continue
+                self.cache.put(key, markdown)
+                yield tag, markdown
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replaces a crashed pool on next use. Only the given pool is dropped: when another sync already
+        replaced it, the new pool and the conversions running on it are left alone.
+        """
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+        # Its pending futures already failed with BrokenProcessPool; nothing is left to cancel.
+        broken.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Create a single instance of the pool to be used throughout the application,
+# so worker processes and their converters stay warm between syncs.
+docling_conversion_pool = DoclingConversionPool()
@@ -0,0 +1,382 @@
+import hashlib
+import os
+import threading
+import time
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from backend.src.clients.confluence.confluence_catalog_client import ConfluenceCatalog
+from backend.src.clients.confluence.confluence_schemas import (
+    ConfluencePageLevel,
+    ConfluencePageNode,
+    ConfluenceSpace,
+    ConfluenceSpaceCatalog,
+    ConfluenceSpaceSummary,
+    ConfluenceTreePage
+    )
+from backend.src.utils.catalog_search import CatalogSearchIndex
+from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import CACHE_LOOKUPS
+from backend.src.utils.wire_format import dumps, loads, to_compact
+
+logger = setup_logging(__name__)
+
+@dataclass(frozen=True)
+class SpaceTree:
+    space: ConfluenceSpaceCatalog
+    nodes: dict[str, ConfluenceTreePage]  # every page of the space by ID
+    loaded_at: float
+
+    @classmethod
+    def from_space(cls, space: ConfluenceSpaceCatalog, loaded_at: float) -> "SpaceTree":
+        nodes: dict[str, ConfluenceTreePage] = {}
+        stack = list(space["pages"])
+        while stack:
+            node = stack.pop()
+            nodes[node["id"]] = node
+            stack.extend(node["children"])
+        return cls(space=space, nodes=nodes, loaded_at=loaded_at)
+
+    def summary(self) -> ConfluenceSpaceSummary:
+        return {"id": self.space["id"], "key": self.space["key"], "name": self.space["name"], "page_count": len(self.nodes)}
+
+    def level(self, parent_id: str | None, limit: int, cursor: str | None = None, depth: int = 1) -> ConfluencePageLevel:
+        """
+        One result page of the root pages of the space, or of the children of a page.
+
+        Args:
+            parent_id: Page whose children are listed; None lists the root pages.
+            limit: Pages per result page.
+            cursor: next_cursor of the previous result page.
+            depth: Levels returned per page, the page itself included; 0 returns whole subtrees.
+
+        Raises:
+            KeyError: If parent_id is not a page of this space.
+            ValueError: If the cursor is invalid.
+        """
+        offset = _decode_level_cursor(cursor) if cursor else 0
+        siblings = self.space["pages"] if parent_id is None else self.nodes[parent_id]["children"]
+        items = [_page_node(node, depth) for node in siblings[offset:offset + limit]]
+        end = offset + len(items)
+        return {"items": items, "total": len(siblings), "next_cursor": str(end) if end < len(siblings) else None}
+
+
+def _page_node(node: ConfluenceTreePage, depth: int) -> ConfluencePageNode:
+    """Copies a page with its descendants down to depth levels (0: all), counting its children either way."""
+    children = node["children"] if depth != 1 else []
+    return {
+        "id": node["id"],
+        "title": node["title"],
+        "parentId": node["parentId"],
+        "child_count": len(node["children"]),
+        "children": [_page_node(child, max(depth - 1, 0)) for child in children]
+    }
+
+
+def _decode_level_cursor(cursor: str) -> int:
+    if not cursor.isdigit():
+        raise ValueError(f"Invalid cursor {cursor!r}.")
+    return int(cursor)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    catalog: list[ConfluenceSpaceCatalog]
+    body: bytes  # JSON-encoded catalog, serialized once per build
+    etag: str
+    built_at: float
+    spaces: dict[str, SpaceTree]  # the catalog by space ID, for serving spaces and subtrees one at a time
+    compact_body: bytes  # JSON-encoded compact (columnar) form of the catalog
+    compact_etag: str
+    # Compressed bodies, computed on first use.
+    _memo: dict[Any, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _memo_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_catalog(cls, catalog: list[ConfluenceSpaceCatalog], built_at: float) -> "CatalogSnapshot":
+        # Both forms are encoded at build time, from the catalog as it is published.
+        body = dumps(catalog)
+        compact_body = dumps(to_compact(catalog))
+        spaces = {space["id"]: SpaceTree.from_space(space, built_at) for space in catalog}
+        return cls(
+            catalog=catalog,
+            body=body,
+            etag=_etag(body),
+            built_at=built_at,
+            spaces=spaces,
+            compact_body=compact_body,
+            compact_etag=_etag(compact_body)
+        )
+
+    def memo(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Returns the value computed for key, computing it once per snapshot."""
+        with self._memo_lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    def compact(self) -> tuple[bytes, str]:
+        """JSON-encoded compact (columnar) form of the catalog and its ETag."""
+        return self.compact_body, self.compact_etag
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class CatalogCache:
+    def __init__(
+        self,
+        builder: ConfluenceCatalog,
+        ttl_seconds: int | None = None,
+        snapshot_path: str | None = None,
+        full_refresh_seconds: int | None = None
+    ):
+        """
+        Caches the Confluence catalog with a TTL and stale-while-revalidate semantics,
+        and keeps a title search index in step with it.
+
+        Spaces can also be served one at a time (get_spaces, get_space): they come from the full
+        catalog while it is fresh, otherwise only the spaces a user expands are fetched from Confluence.
+        Neither builds nor refreshes the full catalog.
+
+        Args:
+            builder: The ConfluenceCatalog used to (re)build the catalog.
+            ttl_seconds: Age after which a snapshot is considered stale. Defaults to CATALOG_CACHE_TTL_SECONDS.
+            snapshot_path: File the snapshot is persisted to. Defaults to CATALOG_SNAPSHOT_PATH.
+            full_refresh_seconds: Interval between full rebuilds; refreshes in between are incremental.
+                Defaults to CATALOG_FULL_REFRESH_SECONDS.
+        """
+        self.builder = builder
+        self.ttl_seconds = ttl_seconds or int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "900"))
+        self.snapshot_path = Path(snapshot_path or os.getenv("CATALOG_SNAPSHOT_PATH", "cache/confluence_catalog.json"))
+        self.full_refresh_seconds = full_refresh_seconds or int(os.getenv("CATALOG_FULL_REFRESH_SECONDS", "86400"))
+
+        self._snapshot: CatalogSnapshot | None = None
+        self._full_built_at: float = 0.0
+        self._refresh_lock = threading.Lock()  # Only one rebuild runs at a time.
+        self.search_index = CatalogSearchIndex()
+
+        # Spaces loaded one at a time while there is no full snapshot.
+        self._space_list: tuple[float, list[ConfluenceSpace]] | None = None
+        self._space_list_lock = threading.Lock()
+        self._space_trees: dict[str, SpaceTree] = {}
+        self._space_locks: dict[str, threading.Lock] = {}
+        self._space_locks_lock = threading.Lock()
+
+        self._load_from_disk()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot | None:
+        """Returns the current snapshot without triggering a refresh."""
+        return self._snapshot
+
+    def is_stale(self, snapshot: CatalogSnapshot) -> bool:
+        return time.time() - snapshot.built_at > self.ttl_seconds
+
+    def get(self, force_refresh: bool = False) -> CatalogSnapshot:
+        """
+        Returns the cached catalog snapshot.
+
+        A stale snapshot is returned immediately while a rebuild runs in the background.
+        Blocks only when there is no snapshot yet or when force_refresh is set.
+        """
+        snapshot = self._snapshot
+
+        if force_refresh:
+            CACHE_LOOKUPS.labels("catalog", "bypass").inc()
+            return self.refresh(force=True)
+        if snapshot is None:
+            CACHE_LOOKUPS.labels("catalog", "miss").inc()
+            return self.refresh()
+        if self.is_stale(snapshot):
+            CACHE_LOOKUPS.labels("catalog", "stale").inc()
+            self.refresh_in_background()
+            return snapshot
+        CACHE_LOOKUPS.labels("catalog", "hit").inc()
+        return snapshot
+
+    def refresh(self, force: bool = False) -> CatalogSnapshot:
+        """
+        Refreshes the catalog and stores the new snapshot in memory and on disk.
+
+        Refreshes are incremental, except for the first build, forced refreshes and
+        once every full_refresh_seconds, which rebuild the whole catalog.
+
+        Args:
+            force: Do a full rebuild, even if another caller refreshed the snapshot while we waited for the lock.
+        """
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if not force and snapshot is not None and not self.is_stale(snapshot):
+                return snapshot
+
+            started = time.time()
+            full = force or snapshot is None or started - self._full_built_at > self.full_refresh_seconds
+
+            if full:
+                catalog = self.builder.get_full_catalog()
+                self._full_built_at = started
+            else:
+                try:
+                    catalog = self.builder.refresh_catalog()
+                except Exception as e:
+                    logger.warning(f"Incremental catalog refresh failed, rebuilding fully: {e}")
+                    catalog = self.builder.get_full_catalog()
+                    self._full_built_at = started
+                    full = True
+
+            if full:
+                self.builder.pop_changed_pages()
+                self.search_index.rebuild(catalog)
+            else:
+                self.search_index.apply_changes(catalog, self.builder.pop_changed_pages())
+
+            snapshot = CatalogSnapshot.from_catalog(catalog, built_at=started)
+
+            if self._snapshot is not None and self._snapshot.etag == snapshot.etag:
+                logger.info("Confluence catalog refreshed, content unchanged.")
+            else:
+                kind = "Full" if full else "Incremental"
+                logger.info(f"{kind} Confluence catalog refresh took {time.time() - started:.2f}s.")
+
+            self._snapshot = snapshot
+            self._space_trees = {}
+            self._save_to_disk(snapshot)
+            return snapshot
+
+    def refresh_in_background(self) -> None:
+        """Starts a background rebuild unless one is already running."""
+        if self._refresh_lock.locked():
+            return
+
+        def _run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background catalog refresh failed, keeping previous snapshot: {e}", exc_info=True)
+
+        threading.Thread(target=_run, name="catalog-refresh", daemon=True).start()
+
+    def get_spaces(self) -> list[ConfluenceSpaceSummary]:
+        """
+        Lists the spaces with their page counts, without their page trees.
+
+        Served from the full snapshot while it is fresh. Otherwise only the spaces are listed;
+        their page counts are None until they are loaded with get_space.
+        """
+        snapshot = self._fresh_snapshot()
+        if snapshot is not None:
+            return [tree.summary() for tree in snapshot.spaces.values()]
+
+        trees = self._space_trees
+        return [
+            trees[space["id"]].summary() if space["id"] in trees else {**space, "page_count": None}
+            for space in self._list_spaces()
+        ]
+
+    def get_space(self, space_id: str) -> SpaceTree | None:
+        """
+        Returns the page tree of one space, or None if there is no such space.
+
+        Served from the full snapshot while it is fresh. Otherwise only this space is fetched
+        and cached, with the same TTL and stale-while-revalidate semantics as the catalog.
+        """
+        snapshot = self._fresh_snapshot()
+        if snapshot is not None:
+            return snapshot.spaces.get(space_id)
+
+        tree = self._space_trees.get(space_id)
+        if tree is None:
+            CACHE_LOOKUPS.labels("catalog_space", "miss").inc()
+            space = next((space for space in self._list_spaces() if space["id"] == space_id), None)
+            return self._load_space(space) if space is not None else None
+        if time.time() - tree.loaded_at > self.ttl_seconds:
+            CACHE_LOOKUPS.labels("catalog_space", "stale").inc()
+            self._load_space_in_background(tree.space)
+        else:
+            CACHE_LOOKUPS.labels("catalog_space", "hit").inc()
+        return tree
+
+    def _fresh_snapshot(self) -> CatalogSnapshot | None:
+        """The full snapshot if it is fresh. A stale one is left to be refreshed by the next catalog request."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self.is_stale(snapshot):
+            return snapshot
+        return None
+
+    def _list_spaces(self) -> list[ConfluenceSpace]:
+        with self._space_list_lock:
+            if self._space_list is None or time.time() - self._space_list[0] > self.ttl_seconds:
+                self._space_list = (time.time(), self.builder.get_all_spaces())
+            return self._space_list[1]
+
+    def _space_lock(self, space_id: str) -> threading.Lock:
+        with self._space_locks_lock:
+            return self._space_locks.setdefault(space_id, threading.Lock())
+
+    def _load_space(self, space: ConfluenceSpace) -> SpaceTree:
+        """Fetches one space, unless another caller loaded it while we waited for its lock."""
+        with self._space_lock(space["id"]):
+            tree = self._space_trees.get(space["id"])
+            if tree is not None and time.time() - tree.loaded_at <= self.ttl_seconds:
+                return tree
+
+            started = time.time()
+            tree = SpaceTree.from_space(self.builder.get_space_catalog(space), loaded_at=started)
+            self._space_trees[space["id"]] = tree
+            logger.info(f"Loaded space '{space['name']}' with {len(tree.nodes)} pages in {time.time() - started:.2f}s.")
+            return tree
+
+    def _load_space_in_background(self, space: ConfluenceSpace) -> None:
+        """Starts a background reload of one space unless one is already running."""
+        if self._space_lock(space["id"]).locked():
+            return
+
+        def _run():
+            try:
+                self._load_space(space)
+            except Exception as e:
+                logger.error(f"Background reload of space '{space['name']}' failed, keeping previous tree: {e}", exc_info=True)
+
+        threading.Thread(target=_run, name="catalog-space-refresh", daemon=True).start()
+
+    def _save_to_disk(self, snapshot: CatalogSnapshot) -> None:
+        """Atomically writes the snapshot so a restarted process can serve it right away."""
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(b'{"built_at":%r,"full_built_at":%r,"catalog":' % (snapshot.built_at, self._full_built_at))
+                f.write(snapshot.body)
+                f.write(b"}")
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist catalog snapshot to {self.snapshot_path}: {e}")
+
+    def _load_from_disk(self) -> None:
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                stored = loads(f.read())
+            built_at = float(stored["built_at"])
+            self._snapshot = CatalogSnapshot.from_catalog(stored["catalog"], built_at=built_at)
+            self._full_built_at = float(stored.get("full_built_at", built_at))
+            # Let the builder refresh the restored catalog incrementally from the time it was built.
+            self.builder.load_catalog(stored["catalog"], datetime.fromtimestamp(built_at, tz=timezone.utc))
+            self.search_index.rebuild(stored["catalog"])
+            logger.info(f"Loaded catalog snapshot from {self.snapshot_path}.")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable catalog snapshot {self.snapshot_path}: {e}")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Checks an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,309 @@
+import bisect
+import heapq
+import re
+import threading
+
+from typing import Any
+
+from backend.src.clients.confluence.confluence_schemas import ConfluenceSpaceCatalog, ConfluenceTreePage
+from backend.src.utils.logger_init import setup_logging
+
+logger = setup_logging(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# Match weights per query token, plus bonuses for the whole query.
+EXACT_WEIGHT = 3.0
+PREFIX_WEIGHT = 2.0
+FUZZY_WEIGHT = 1.0
+SUBSTRING_BONUS = 1.5
+TITLE_PREFIX_BONUS = 2.0
+TITLE_EXACT_BONUS = 5.0
+_MATCH_KINDS = {EXACT_WEIGHT: "exact", PREFIX_WEIGHT: "prefix", FUZZY_WEIGHT: "fuzzy"}
+_EMPTY: frozenset[str] = frozenset()
+
+# Tokens shorter than this are not matched fuzzily, as one edit changes too much of them.
+FUZZY_MIN_LENGTH = 4
+# Vocabulary tokens a prefix expands to; enough for a search-as-you-type prefix of one or two letters.
+MAX_PREFIX_EXPANSIONS = 500
+
+
+class _Page:
+    __slots__ = ("id", "title", "lowered", "parent_id", "space_id")
+
+    def __init__(self, page_id: str, title: str, parent_id: str | None, space_id: str):
+        self.id = page_id
+        self.title = title
+        self.lowered = title.lower()
+        self.parent_id = parent_id
+        self.space_id = space_id
+
+
+class CatalogSearchIndex:
+    def __init__(self):
+        """
+        In-memory title search over the Confluence catalog, across all spaces.
+
+        Answers prefix, substring and fuzzy (one edit per word) queries from:
+            - an inverted index of title tokens to page IDs,
+            - the sorted token vocabulary, searched by bisection for prefixes,
+            - a trigram index of whole titles, for substrings within words,
+            - the single-character deletions of every token, for fuzzy matches (SymSpell).
+
+        Built from a full catalog and updated page by page on incremental refreshes. Breadcrumbs
+        are resolved through the parent links at query time, so moving a page needs no reindexing
+        of its subtree.
+        """
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pages: dict[str, _Page] = {}
+        self._spaces: dict[str, dict[str, str]] = {}
+        self._tokens: dict[str, set[str]] = {}
+        self._vocabulary: list[str] = []
+        self._trigrams: dict[str, set[str]] = {}
+        self._deletes: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def rebuild(self, catalog: list[ConfluenceSpaceCatalog]) -> None:
+        """Replaces the index with the pages of a full catalog."""
+        fresh = CatalogSearchIndex()
+        fresh._set_spaces(catalog)
+        for space in catalog:
+            stack = [(node, None) for node in space["pages"]]
+            while stack:
+                node, parent_id = stack.pop()
+                fresh._add(_Page(node["id"], node["title"], node["parentId"] or parent_id, space["id"]))
+                stack.extend((child, node["id"]) for child in node["children"])
+        fresh._vocabulary = sorted(fresh._tokens)
+
+        with self._lock:
+            self._pages, self._spaces, self._tokens = fresh._pages, fresh._spaces, fresh._tokens
+            self._vocabulary, self._trigrams, self._deletes = fresh._vocabulary, fresh._trigrams, fresh._deletes
+        logger.info(f"Built catalog search index: {len(self._pages)} pages, {len(self._vocabulary)} tokens.")
+
+    def apply_changes(
+        self,
+        catalog: list[ConfluenceSpaceCatalog],
+        changes: dict[str, tuple[ConfluenceTreePage, str] | None]
+    ) -> None:
+        """
+        Updates the index after an incremental catalog refresh.
+
+        Args:
+            catalog: The refreshed catalog, for the spaces it contains.
+            changes: Changed page IDs, mapped to their node and space ID, or None when the page was removed.
+        """
+        with self._lock:
+            self._set_spaces(catalog)
+            for page_id, location in changes.items():
+                self._remove(page_id)
+                if location is not None:
+                    node, space_id = location
+                    self._add(_Page(page_id, node["title"], node["parentId"], space_id), keep_sorted=True)
+
+    def search(self, query: str, limit: int = 20, space_key: str | None = None) -> list[dict[str, Any]]:
+        """
+        Ranked title search.
+
+        Every query word must match a title word exactly, as a prefix or with one edit
+        (the last word is usually still being typed). When that finds fewer than `limit` pages,
+        titles containing the whole query as a substring, also within words, are added.
+        Exact, prefix and whole-title matches rank first.
+
+        Returns:
+            Up to `limit` results with the page, its space, breadcrumb of ancestors and score.
+        """
+        lowered = query.strip().lower()
+        if not lowered:
+            return []
+
+        with self._lock:
+            scores: dict[str, float] = {}
+            kinds: dict[str, str] = {}
+            query_tokens = _TOKEN.findall(lowered)
+            if query_tokens:
+                self._match_tokens(query_tokens, scores, kinds)
+            # Substrings within words only matter when the words alone do not fill the results.
+            if len(scores) < limit:
+                self._match_substring(lowered, scores, kinds)
+
+            space_id = None
+            if space_key is not None:
+                space_id = next((sid for sid, space in self._spaces.items() if space["key"] == space_key), None)
+                if space_id is None:
+                    return []
+
+            ranked = []
+            for page_id, score in scores.items():
+                page = self._pages[page_id]
+                if space_id is not None and page.space_id != space_id:
+                    continue
+                if page.lowered == lowered:
+                    score += TITLE_EXACT_BONUS
+                elif page.lowered.startswith(lowered):
+                    score += TITLE_PREFIX_BONUS
+                ranked.append((score, -len(page.title), page_id))
+
+            top = heapq.nlargest(limit, ranked)
+            return [self._result(self._pages[page_id], score, kinds[page_id]) for score, _, page_id in top]
+
+    def _match_tokens(self, query_tokens: list[str], scores: dict[str, float], kinds: dict[str, str]) -> None:
+        """Scores the pages matching every query token by their best match per token; the weakest one names the match."""
+        candidates: set[str] | None = None
+        token_matches: list[tuple[set[str], set[str]]] = []
+        for token in query_tokens:
+            exact, prefix, fuzzy = self._expand(token)
+            matching = exact.union(prefix, fuzzy)
+            candidates = matching if candidates is None else candidates & matching
+            if not candidates:
+                return
+            token_matches.append((exact, prefix))
+
+        for page_id in candidates:
+            score = 0.0
+            weakest = EXACT_WEIGHT
+            for exact, prefix in token_matches:
+                weight = EXACT_WEIGHT if page_id in exact else PREFIX_WEIGHT if page_id in prefix else FUZZY_WEIGHT
+                score += weight
+                if weight < weakest:
+                    weakest = weight
+            scores[page_id] = score
+            kinds[page_id] = _MATCH_KINDS[weakest]
+
+    def _expand(self, token: str) -> tuple[set[str], set[str], set[str]]:
+        """
+        Pages matching a query token: through the token itself, through the tokens it prefixes,
+        and through the tokens one edit away.
+        """
+        exact = self._tokens.get(token, _EMPTY)
+
+        start = bisect.bisect_left(self._vocabulary, token)
+        prefixed = []
+        for vocabulary_token in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not vocabulary_token.startswith(token):
+                break
+            if vocabulary_token != token:
+                prefixed.append(self._tokens[vocabulary_token])
+
+        similar = []
+        if len(token) >= FUZZY_MIN_LENGTH:
+            candidates = set(self._deletes.get(token, ()))
+            for variant in _deletions(token):
+                candidates.update(self._deletes.get(variant, ()))
+                if variant in self._tokens:
+                    candidates.add(variant)
+            similar = [
+                self._tokens[candidate] for candidate in candidates
+                if candidate != token and not candidate.startswith(token) and _within_one_edit(token, candidate)
+            ]
+        return exact, set().union(*prefixed), set().union(*similar)
+
+    def _match_substring(self, lowered: str, scores: dict[str, float], kinds: dict[str, str]) -> None:
+        """Adds the pages whose title contains the whole query, found through the trigrams of the query."""
+        if len(lowered) < 3:
+            return
+        trigram_sets = [self._trigrams.get(trigram) for trigram in _trigrams(lowered)]
+        if not all(trigram_sets):
+            return
+        trigram_sets.sort(key=len)
+        candidates = set(trigram_sets[0]).intersection(*trigram_sets[1:])
+        for page_id in candidates:
+            if lowered in self._pages[page_id].lowered:
+                scores[page_id] = scores.get(page_id, 0.0) + SUBSTRING_BONUS
+                kinds.setdefault(page_id, "substring")
+
+    def _result(self, page: _Page, score: float, kind: str) -> dict[str, Any]:
+        breadcrumb = []
+        seen = {page.id}
+        parent_id = page.parent_id
+        while parent_id is not None and parent_id not in seen:
+            parent = self._pages.get(parent_id)
+            if parent is None or parent.space_id != page.space_id:
+                break
+            breadcrumb.append({"id": parent.id, "title": parent.title})
+            seen.add(parent_id)
+            parent_id = parent.parent_id
+        breadcrumb.reverse()
+
+        space = self._spaces.get(page.space_id, {})
+        return {
+            "id": page.id,
+            "title": page.title,
+            "space_id": page.space_id,
+            "space_key": space.get("key"),
+            "space_name": space.get("name"),
+            "breadcrumb": breadcrumb,
+            "path": " / ".join([space.get("name", page.space_id), *(crumb["title"] for crumb in breadcrumb), page.title]),
+            "match": kind,
+            "score": round(score, 2)
+        }
+
+    def _set_spaces(self, catalog: list[ConfluenceSpaceCatalog]) -> None:
+        self._spaces = {space["id"]: {"key": space["key"], "name": space["name"]} for space in catalog}
+
+    def _add(self, page: _Page, keep_sorted: bool = False) -> None:
+        self._pages[page.id] = page
+        for token in set(_TOKEN.findall(page.lowered)):
+            page_ids = self._tokens.get(token)
+            if page_ids is None:
+                page_ids = self._tokens[token] = set()
+                for variant in _deletions(token):
+                    self._deletes.setdefault(variant, set()).add(token)
+                if keep_sorted:
+                    bisect.insort(self._vocabulary, token)
+            page_ids.add(page.id)
+        for trigram in _trigrams(page.lowered):
+            self._trigrams.setdefault(trigram, set()).add(page.id)
+
+    def _remove(self, page_id: str) -> None:
+        page = self._pages.pop(page_id, None)
+        if page is None:
+            return
+        for token in set(_TOKEN.findall(page.lowered)):
+            page_ids = self._tokens[token]
+            page_ids.discard(page_id)
+            if not page_ids:
+                del self._tokens[token]
+                for variant in _deletions(token):
+                    _discard(self._deletes, variant, token)
+                index = bisect.bisect_left(self._vocabulary, token)
+                if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                    del self._vocabulary[index]
+        for trigram in _trigrams(page.lowered):
+            _discard(self._trigrams, trigram, page_id)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _deletions(token: str) -> set[str]:
+    if len(token) < FUZZY_MIN_LENGTH or token.isdigit():
+        return set()
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insertion, deletion, substitution or adjacent transposition."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+    return a[i:] == b[i + 1:]
+
+
+def _discard(index: dict[str, set[str]], key: str, value: str) -> None:
+    values = index.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del index[key]
@@ -0,0 +1,197 @@
+import math
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import Gauge
+
+logger = setup_logging(__name__)
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window_size: int = 100
+    ):
+        """
+        AIMD concurrency limit for calls to one external service, shared by all its worker threads.
+
+        The limit grows by one after a full limit's worth of successful calls while latency is
+        stable (additive increase), and is cut by backoff_ratio on an overload signal
+        (multiplicative decrease): a 429 or 5xx reported by the caller, or a p95 latency rising
+        above latency_tolerance times its long-term baseline. At most one cut is applied per
+        limit's worth of completed calls, so a burst of failures from the same wave of
+        requests does not collapse the limit.
+
+        Args:
+            name: Name of the service, used in logs and monitoring.
+            initial_limit: Concurrent calls allowed at start.
+            min_limit: Lower bound of the limit.
+            max_limit: Upper bound of the limit; worker pools should be at least this large.
+            backoff_ratio: Factor applied to the limit on overload.
+            latency_tolerance: Ratio of recent p95 to baseline p95 treated as overload.
+            window_size: Number of recent latencies the p95 is computed over.
+        """
+        self.name = name
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._baseline_p95: float | None = None
+        self._since_increase = 0
+        self._since_decrease = self.limit
+        self._successes = 0
+        self._overloads = 0
+        self._decreases = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def slot(self) -> Iterator["CallSlot"]:
+        """
+        Holds one concurrency slot for the duration of a call, waiting for one to free up.
+
+        The call reports its outcome on the yielded slot; calls that do not are recorded as successes.
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+        slot = CallSlot()
+        try:
+            yield slot
+        finally:
+            self._release(time.perf_counter() - slot.started_at, slot.outcome)
+
+    def snapshot(self) -> dict:
+        """Returns the current limit, calls in flight and observed latencies, for monitoring."""
+        with self._condition:
+            latencies = sorted(self._latencies)
+            return {
+                "name": self.name,
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "latency_p50_ms": _percentile_ms(latencies, 0.50),
+                "latency_p95_ms": _percentile_ms(latencies, 0.95),
+                "baseline_p95_ms": round(self._baseline_p95 * 1000, 1) if self._baseline_p95 is not None else None,
+                "successes": self._successes,
+                "overloads": self._overloads,
+                "decreases": self._decreases
+            }
+
+    def _release(self, latency: float, outcome: str) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._since_decrease += 1
+
+            if outcome == "overload":
+                self._overloads += 1
+                self._decrease("overload response")
+            elif outcome == "success":
+                self._successes += 1
+                self._latencies.append(latency)
+                self._on_success()
+            # "ignore": the call failed for a reason unrelated to load (e.g. 404).
+
+            self._condition.notify_all()
+
+    def _on_success(self) -> None:
+        """Called with the condition held after a successful call."""
+        if len(self._latencies) < self._latencies.maxlen // 4:
+            self._grow()
+            return
+
+        p95 = _percentile(sorted(self._latencies), 0.95)
+        if self._baseline_p95 is None:
+            self._baseline_p95 = p95
+        elif p95 > self._baseline_p95 * self.latency_tolerance:
+            self._decrease(f"p95 latency {p95 * 1000:.0f}ms above baseline {self._baseline_p95 * 1000:.0f}ms")
+            return
+        # Slow moving baseline, so a lasting change in service speed becomes the new normal.
+        self._baseline_p95 += (p95 - self._baseline_p95) * 0.01
+        self._grow()
+
+    def _grow(self) -> None:
+        self._since_increase += 1
+        if self._since_increase >= self.limit and self._limit < self.max_limit:
+            self._limit = min(self._limit + 1, self.max_limit)
+            self._since_increase = 0
+
+    def _decrease(self, reason: str) -> None:
+        # Only one cut per limit's worth of completions: the calls already in flight were sent under the old limit.
+        if self._since_decrease < self.limit:
+            return
+        previous = self.limit
+        self._limit = max(self._limit * self.backoff_ratio, self.min_limit)
+        self._since_decrease = 0
+        self._since_increase = 0
+        self._decreases += 1
+        # Latencies measured under the old limit no longer describe the current load.
+        self._latencies.clear()
+        logger.warning(f"{self.name} concurrency limit lowered from {previous} to {self.limit}: {reason}.")
+
+
+class CallSlot:
+    __slots__ = ("outcome", "started_at")
+
+    def __init__(self):
+        """Outcome of one call made under a concurrency limiter; a success unless marked otherwise."""
+        self.outcome = "success"
+        self.started_at = time.perf_counter()
+
+    def start(self) -> None:
+        """Starts timing the call here, e.g. after waiting for a rate limit token while holding the slot."""
+        self.started_at = time.perf_counter()
+
+    def overload(self) -> None:
+        """Marks the call as rejected for load reasons (429, 5xx, timeout)."""
+        self.outcome = "overload"
+
+    def ignore(self) -> None:
+        """Marks the call as failed for a reason unrelated to load; it does not affect the limit."""
+        self.outcome = "ignore"
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(len(sorted_values) * fraction) - 1)]
+
+
+def _percentile_ms(sorted_values: list[float], fraction: float) -> float | None:
+    return round(_percentile(sorted_values, fraction) * 1000, 1) if sorted_values else None
+
+
+# Limiters of all services, for monitoring.
+concurrency_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+CONCURRENCY_LIMIT = Gauge("outbound_concurrency_limit", "Current adaptive concurrency limit per external service.", ["service"])
+IN_FLIGHT = Gauge("outbound_in_flight", "Calls to an external service currently in flight.", ["service"])
+
+def register_limiter(limiter: AdaptiveConcurrencyLimiter) -> AdaptiveConcurrencyLimiter:
+    """Makes a limiter visible to monitoring under its name and returns it."""
+    concurrency_limiters[limiter.name] = limiter
+    CONCURRENCY_LIMIT.labels(limiter.name).set_function(lambda: limiter.limit)
+    IN_FLIGHT.labels(limiter.name).set_function(lambda: limiter.in_flight)
+    return limiter
@@ -1,5 +1,60 @@
+import hashlib
+import re
+
 from backend.src.clients.confluence.confluence_page_client import StructuredConfluencePage
 
+# Vector store filenames carry the page metadata needed for sync planning:
+# "<title>__PAGEID__<id>__V__<version>__SHA__<content hash>.json".
+# Files uploaded before versions were tracked only carry "__PAGEID__<id>".
+FILENAME_PATTERN = re.compile(r'^(.*?)__PAGEID__(\d+)(?:__V__(\d+))?(?:__SHA__([0-9a-f]+))?(?:\.json)?$')
+
+def compute_content_hash(content: str) -> str:
+    """Return a short, stable hash of converted page content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+def sanitize_title(title: str) -> str:
+    """Return the page title in the form it takes in vector store filenames, which is also the form indexed."""
+    return re.sub(r'[\\/*?:"<>|]', "-", title)
+
+def build_vector_store_filename(title: str, page_id: str, version: int | None = None, content_hash: str | None = None) -> str:
+    """
+    Build the vector store filename for a page, embedding its ID, version and content hash.
+
+    Args:
+        title: The page title, sanitized for use in a filename
+        page_id: The Confluence page ID
+        version: The Confluence version number that was converted, if known
+        content_hash: Hash of the converted content, if known
+
+    Returns:
+        The filename to upload the page under
+    """
+    filename = f"{sanitize_title(title)}__PAGEID__{page_id}"
+    if version is not None:
+        filename += f"__V__{version}"
+    if content_hash:
+        filename += f"__SHA__{content_hash}"
+    return f"{filename}.json"
+
+def parse_vector_store_filename(filename: str) -> dict | None:
+    """
+    Extract page metadata from a vector store filename.
+
+    Returns:
+        Dictionary with "title", "page_id", "version" and "content_hash" (the latter two may be None),
+        or None if the filename does not belong to a Confluence page.
+    """
+    match = FILENAME_PATTERN.search(filename)
+    if not match:
+        return None
+    title, page_id, version, content_hash = match.groups()
+    return {
+        "title": title,
+        "page_id": page_id,
+        "version": int(version) if version else None,
+        "content_hash": content_hash
+    }
+
 def format_for_vector_ingestion(markdown_content: str, structured_page: StructuredConfluencePage) -> dict:
     """
     Format page content for vector store ingestion.
@@ -12,10 +67,14 @@ def format_for_vector_ingestion(markdown_content: str, structured_page: Structur
         Dictionary formatted for vector store ingestion
     """
     prepared_data = structured_page.model_dump(exclude={'html_content'})
+    content_hash = compute_content_hash(markdown_content)
     
     prepared_data.update({
         "content": markdown_content,
-        "filename": f"{structured_page.title}__PAGEID__{structured_page.id}.json"
+        "content_hash": content_hash,
+        "filename": build_vector_store_filename(
+            structured_page.title, structured_page.id, structured_page.version, content_hash
+        )
     })
     
-    return prepared_data
\ No newline at end of file
+    return prepared_data
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from backend.src.utils.logger_init import setup_logging
+
+logger = setup_logging(__name__)
+
+# Directory and number of profiles kept on disk.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "cache/profiles")
+PROFILE_RETENTION = int(os.getenv("PROFILE_RETENTION", "50"))
+# Sampling interval of profiles requested by an admin.
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+# Slow requests are profiled automatically once they run past these thresholds, at a lower rate. 0 disables.
+PROFILE_SLOW_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SLOW_SAMPLE_INTERVAL_MS", "20"))
+PROFILE_SLOW_CATALOG_MS = float(os.getenv("PROFILE_SLOW_CATALOG_MS", "5000"))
+PROFILE_SLOW_SYNC_MS = float(os.getenv("PROFILE_SLOW_SYNC_MS", "600000"))
+
+# Thread pools number their threads (e.g. sync-job_0, ThreadPoolExecutor-3_1); samples are grouped without the number.
+_THREAD_NUMBER = re.compile(r"[-_]\d+(_\d+)?$")
+_SAMPLER_THREAD_NAME = "profile-sampler"
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"] + os.sep
+
+class SamplingProfiler:
+    def __init__(self, interval_ms: float):
+        """
+        Wall-clock sampling profiler of every thread of the process, built on sys._current_frames().
+
+        Every interval the stacks of all threads are recorded with the thread name as root frame,
+        so a flamegraph shows where each pipeline stage and pool spends its time, waiting included.
+        The profiled code is not instrumented; the cost is the sampler thread walking the stacks.
+
+        NOTE: Threads cannot be attributed to a request, so work running concurrently with the
+        profiled one (other requests, other syncs) is sampled too, under its own thread names.
+        """
+        self.interval = interval_ms / 1000
+        self.samples: Counter[str] = Counter()
+        self.thread_names: set[str] = set()  # Sampled threads, without pool numbers
+        self.sample_count = 0
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self._labels: dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=_SAMPLER_THREAD_NAME, daemon=True)
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.stopped_at = time.time()
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format read by flamegraph.pl, inferno and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            name = names.get(ident, "unknown")
+            if name.startswith(_SAMPLER_THREAD_NAME):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            thread_name = _THREAD_NUMBER.sub("", name)
+            self.thread_names.add(thread_name)
+            stack.append(thread_name)
+            stack.reverse()
+            self.samples[";".join(stack)] += 1
+        self.sample_count += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+def _short_path(filename: str) -> str:
+    """Shortens a source path to the package-relative part, e.g. backend/src/..., requests/... or threading.py"""
+    if filename.startswith(_STDLIB_DIR):
+        return filename[len(_STDLIB_DIR):]
+    for marker in ("site-packages/", "dist-packages/"):
+        if marker in filename:
+            return filename.rsplit(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    return filename[len(cwd):] if filename.startswith(cwd) else filename
+
+
+class ProfileSession:
+    def __init__(self, kind: str, target: str):
+        """
+        Profile of one request or sync job. profile_id is set once sampling started,
+        the profile can be downloaded once the request finished.
+        """
+        self.kind = kind
+        self.target = target
+        self.profile_id: str | None = None
+        self.trigger: str | None = None  # requested | slow
+        self.profiler: SamplingProfiler | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self, trigger: str, interval_ms: float) -> None:
+        with self._lock:
+            if self.profiler is not None or self._closed:
+                return
+            self.profile_id = uuid.uuid4().hex
+            self.trigger = trigger
+            self.profiler = SamplingProfiler(interval_ms)
+            self.profiler.start()
+        if trigger == "slow":
+            logger.warning(f"{self.kind} {self.target} is slow, profiling it as {self.profile_id}.")
+
+    def stop(self) -> SamplingProfiler | None:
+        with self._lock:
+            self._closed = True
+            if self.profiler is not None:
+                self.profiler.stop()
+            return self.profiler
+
+
+class SlowRequestWatchdog:
+    def __init__(self):
+        """
+        Starts the profiles of slow requests from a single thread, so watching a request costs
+        a heap entry rather than a timer thread. The thread is started on first use.
+        """
+        self._deadlines: list[tuple[float, int, ProfileSession]] = []
+        self._sequence = itertools.count()  # Orders sessions with the same deadline
+        self._changed = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, session: ProfileSession, delay_seconds: float) -> None:
+        """Starts profiling the session after delay_seconds, unless it was stopped by then."""
+        with self._changed:
+            heapq.heappush(self._deadlines, (time.monotonic() + delay_seconds, next(self._sequence), session))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{_SAMPLER_THREAD_NAME}-watchdog", daemon=True)
+                self._thread.start()
+            self._changed.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                while not self._deadlines or self._deadlines[0][0] > time.monotonic():
+                    self._changed.wait(self._deadlines[0][0] - time.monotonic() if self._deadlines else None)
+                _, _, session = heapq.heappop(self._deadlines)
+            try:
+                # A no-op for sessions that already finished.
+                session.start("slow", PROFILE_SLOW_SAMPLE_INTERVAL_MS)
+            except Exception:
+                logger.error(f"Failed to start profiling slow {session.kind} {session.target}", exc_info=True)
+
+
+slow_request_watchdog = SlowRequestWatchdog()
+
+
+@contextmanager
+def profile_request(kind: str, target: str, requested: bool = False, slow_ms: float = 0.0, store: "ProfileStore | None" = None) -> Iterator[ProfileSession]:
+    """
+    Profiles the enclosed block when requested, or from the moment it runs longer than slow_ms.
+
+    Below the threshold the only cost is an entry in the shared watchdog, so slow-request profiling
+    can stay on in production.
+    The profile is saved to the store (default: profile_store) once the block exits.
+
+    Args:
+        kind: What is profiled, e.g. "sync" or "catalog".
+        target: ID of the profiled job or request, stored with the profile.
+        requested: Profile the whole block at PROFILE_SAMPLE_INTERVAL_MS.
+        slow_ms: Start profiling at PROFILE_SLOW_SAMPLE_INTERVAL_MS after this many milliseconds. 0 disables.
+    """
+    session = ProfileSession(kind, target)
+    if requested:
+        session.start("requested", PROFILE_SAMPLE_INTERVAL_MS)
+    elif slow_ms > 0:
+        slow_request_watchdog.watch(session, slow_ms / 1000)
+    try:
+        yield session
+    finally:
+        profiler = session.stop()
+        if profiler is not None:
+            (store or profile_store).save(session, profiler)
+
+
+class ProfileStore:
+    def __init__(self, directory: str | None = None, retention: int | None = None):
+        """
+        Keeps the most recent profiles on disk: the collapsed stacks and a JSON file with their metadata.
+
+        Args:
+            directory: Defaults to PROFILE_DIR.
+            retention: Number of profiles kept. Defaults to PROFILE_RETENTION.
+        """
+        self.directory = Path(directory or PROFILE_DIR)
+        self.retention = retention or PROFILE_RETENTION
+        self._lock = threading.Lock()
+
+    def save(self, session: ProfileSession, profiler: SamplingProfiler) -> None:
+        metadata = {
+            "profile_id": session.profile_id,
+            "kind": session.kind,
+            "target": session.target,
+            "trigger": session.trigger,
+            "started_at": profiler.started_at,
+            "duration_ms": round((profiler.stopped_at - profiler.started_at) * 1000, 1),
+            "interval_ms": profiler.interval * 1000,
+            "samples": profiler.sample_count,
+            "stacks": len(profiler.samples),
+            # Every thread of the process is sampled, not only the profiled request's.
+            "threads": "all",
+            "thread_names": sorted(profiler.thread_names),
+            "format": "collapsed"
+        }
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                (self.directory / f"{session.profile_id}.collapsed").write_text(profiler.collapsed(), encoding="utf-8")
+                (self.directory / f"{session.profile_id}.json").write_text(json.dumps(metadata), encoding="utf-8")
+                self._prune()
+            logger.info(f"Saved profile {session.profile_id} of {session.kind} {session.target} ({profiler.sample_count} samples).")
+        except OSError:
+            logger.error(f"Failed to save profile {session.profile_id}", exc_info=True)
+
+    def list(self) -> list[dict[str, Any]]:
+        """Metadata of the stored profiles, most recent first."""
+        profiles = []
+        for path in self.directory.glob("*.json"):
+            try:
+                profiles.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda profile: profile["started_at"], reverse=True)
+
+    def load(self, profile_id: str) -> str | None:
+        """Collapsed stacks of a profile, or None if it does not exist (anymore)."""
+        if not profile_id.isalnum():
+            return None
+        try:
+            return (self.directory / f"{profile_id}.collapsed").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _prune(self) -> None:
+        """Deletes the oldest profiles beyond the retention limit. Called with the lock held."""
+        profiles = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in profiles[:max(len(profiles) - self.retention, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".collapsed").unlink(missing_ok=True)
+
+
+# Store of the profiles served by the API.
+profile_store = ProfileStore()
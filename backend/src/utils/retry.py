@@ -0,0 +1,220 @@
+import random
+import threading
+import time
+
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, NamedTuple, TypeVar
+
+from backend.src.utils import tracing
+from backend.src.utils.concurrency import AdaptiveConcurrencyLimiter, CallSlot
+from backend.src.utils.logger_init import setup_logging
+from backend.src.utils.metrics import Counter, Histogram
+
+logger = setup_logging(__name__)
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: rate limited, or a transient server-side failure.
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+OUTBOUND_REQUEST_SECONDS = Histogram(
+    "outbound_request_duration_seconds",
+    "Duration of each attempt of a call to an external service.",
+    ["service", "operation"]
+)
+OUTBOUND_REQUESTS = Counter(
+    "outbound_requests_total",
+    "Attempts of calls to external services, by outcome (success, retried, failed).",
+    ["service", "operation", "outcome"]
+)
+
+class RetryDecision(NamedTuple):
+    """How to handle a failed call: whether to retry, and the delay requested by the server (Retry-After), if any."""
+    retry: bool
+    retry_after: float | None = None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Returns:
+        The delay in seconds, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float | None = None):
+        """
+        Thread-safe token bucket limiting the rate of outbound requests.
+
+        One bucket is shared by every worker thread talking to the same service, so their
+        combined throughput stays under the configured rate. A rate-limited response pauses
+        the whole bucket for the delay the server asked for, instead of each worker retrying on its own.
+
+        Args:
+            rate: Tokens (requests) added per second. 0 disables the limit, only pauses apply.
+            burst: Maximum tokens saved up for bursts. Defaults to one second worth of tokens.
+        """
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available and takes it.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self.rate <= 0:
+                        return waited
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                    self._updated_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Holds back every caller for the given time, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated_at = time.monotonic()
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        service: str,
+        classify: Callable[[Exception], RetryDecision],
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        limiter: TokenBucket | None = None,
+        concurrency: AdaptiveConcurrencyLimiter | None = None
+    ):
+        """
+        Retries failed calls to an external service with exponential backoff and full jitter.
+
+        Delays requested by the server (Retry-After) take precedence over the backoff and
+        pause the shared limiter, so all workers back off together.
+
+        Args:
+            service: Name of the service, used in log messages and, lowercased, as metrics label.
+            classify: Decides whether an exception is worth retrying and extracts Retry-After.
+            max_attempts: Total attempts per call, including the first one.
+            base_delay: Backoff in seconds before the first retry; doubled on every retry.
+            max_delay: Upper bound of a single backoff or Retry-After delay.
+            limiter: Optional token bucket every attempt takes a token from, once it holds its concurrency slot.
+            concurrency: Optional adaptive limit on attempts in flight. Each attempt holds a slot and
+                reports retryable failures (429, 5xx, timeouts) as overload, which shrinks the limit.
+        """
+        self.service = service
+        self.classify = classify
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter
+        self.concurrency = concurrency
+
+    def call(
+        self,
+        operation: str,
+        func: Callable[[], T],
+        limit_concurrency: bool = True,
+        classify: Callable[[Exception], RetryDecision] | None = None
+    ) -> T:
+        """
+        Runs func, retrying it on retryable failures.
+
+        Args:
+            operation: Name of the call, used in log messages and as metrics label; keep it free of IDs.
+            func: The call to make; invoked once per attempt.
+            limit_concurrency: Hold a concurrency slot during each attempt. Disable for long-running
+                calls (e.g. polling until a job finishes) whose duration says nothing about load.
+            classify: Overrides the policy's classification for this call, e.g. to retry
+                non-idempotent calls only when the server cannot have acted on them.
+
+        Raises:
+            The last exception once it is not retryable or the attempts are exhausted.
+        """
+        service = self.service.lower()
+        classify = classify or self.classify
+        attempt = 1
+        while True:
+            # Slot first, then token: callers queued for a slot must not hold tokens they then spend in a burst.
+            with self._slot(limit_concurrency) as slot:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                    slot.start()
+                started = time.perf_counter()
+                try:
+                    result = func()
+                except Exception as e:
+                    OUTBOUND_REQUEST_SECONDS.labels(service, operation).observe(time.perf_counter() - started)
+                    error = e
+                    decision = classify(e)
+                    if decision.retry:
+                        slot.overload()
+                    else:
+                        slot.ignore()
+                    if not decision.retry or attempt >= self.max_attempts:
+                        OUTBOUND_REQUESTS.labels(service, operation, "failed").inc()
+                        raise
+                    OUTBOUND_REQUESTS.labels(service, operation, "retried").inc()
+                else:
+                    OUTBOUND_REQUEST_SECONDS.labels(service, operation).observe(time.perf_counter() - started)
+                    OUTBOUND_REQUESTS.labels(service, operation, "success").inc()
+                    return result
+
+                if decision.retry_after is not None:
+                    delay = min(decision.retry_after, self.max_delay)
+                    if self.limiter is not None:
+                        self.limiter.pause(delay)
+                else:
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+            # Back off outside the concurrency slot, so waiting does not hold capacity.
+            span = tracing.current_span()
+            span.add("retries")
+            span.add("retry_wait_ms", round(delay * 1000, 1))
+            logger.warning(
+                f"{self.service} {operation} failed (attempt {attempt}/{self.max_attempts}): {error}. "
+                f"Retrying in {delay:.2f}s."
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _slot(self, limit_concurrency: bool):
+        if self.concurrency is None or not limit_concurrency:
+            return nullcontext(CallSlot())
+        return self.concurrency.slot()
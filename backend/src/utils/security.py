@@ -1,3 +1,9 @@
+import hmac
+import os
+
+# Token admins send in the X-Admin-Token header for diagnostics such as profiling. Unset disables them.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
 def validate_user_vector_store_access(user_id: str, vector_store_id: str) -> bool:
     """Check if the user has access to the vector store."""
     # Example Postgres logic (commented):
@@ -9,4 +15,10 @@ def validate_user_vector_store_access(user_id: str, vector_store_id: str) -> boo
     #     return cur.fetchone() is not None
 
     # Temporary placeholder: always return True
-    return True
\ No newline at end of file
+    return True
+
+def is_admin(token: str | None) -> bool:
+    """Check if the request carries the admin token."""
+    if not ADMIN_API_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), ADMIN_API_TOKEN.encode())
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from typing import Callable
+
+from backend.src.utils.metrics import Counter
+
+# Pipeline stages reported by a sync, in the order pages flow through them.
+SYNC_STAGES = ("fetch", "convert", "upload", "delete")
+
+SYNC_PAGES = Counter("sync_pages_total", "Pages that left a sync stage, by outcome (done, failed, skipped).", ["stage", "outcome"])
+
+class SyncProgress:
+    def __init__(self, on_change: Callable[[], None] | None = None):
+        """
+        Thread-safe live progress of one sync, per pipeline stage.
+
+        Each stage counts pages done, failed and skipped (e.g. not converted because the
+        fetch failed) against its total, from which throughput and ETA are derived.
+
+        Args:
+            on_change: Optional callback invoked after every update, e.g. to wake up event stream listeners.
+        """
+        self.started_at = time.time()
+        self.stage = "planning"
+        self._totals = {stage: 0 for stage in SYNC_STAGES}
+        self._counts = {stage: {"done": 0, "failed": 0, "skipped": 0} for stage in SYNC_STAGES}
+        self._first_at: dict[str, float] = {}
+        self._on_change = on_change
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str) -> None:
+        """Sets the stage the sync is currently in (planning, syncing, deleting, done)."""
+        with self._lock:
+            self.stage = stage
+        self._notify()
+
+    def set_total(self, stage: str, total: int) -> None:
+        with self._lock:
+            self._totals[stage] = total
+        self._notify()
+
+    def advance(self, stage: str, count: int = 1, outcome: str = "done") -> None:
+        """
+        Records pages that left a stage.
+
+        Args:
+            stage: One of SYNC_STAGES.
+            count: Number of pages.
+            outcome: "done", "failed" or "skipped".
+        """
+        if count <= 0:
+            return
+        SYNC_PAGES.labels(stage, outcome).inc(count)
+        with self._lock:
+            self._counts[stage][outcome] += count
+            self._first_at.setdefault(stage, time.time())
+        self._notify()
+
+    def skip_after(self, stage: str, count: int = 1) -> None:
+        """Marks pages as skipped in every stage after `stage`, e.g. when their fetch failed."""
+        for later in SYNC_STAGES[SYNC_STAGES.index(stage) + 1:]:
+            if later != "delete":
+                self.advance(later, count, "skipped")
+
+    def snapshot(self) -> dict:
+        """Returns the progress of every stage with throughput (pages/s) and an overall ETA in seconds."""
+        now = time.time()
+        stages: dict[str, dict] = {}
+        eta: float | None = 0.0
+
+        with self._lock:
+            for stage in SYNC_STAGES:
+                counts = self._counts[stage]
+                processed = counts["done"] + counts["failed"] + counts["skipped"]
+                remaining = max(self._totals[stage] - processed, 0)
+                active_for = now - self._first_at[stage] if stage in self._first_at else 0.0
+                per_second = counts["done"] / active_for if active_for > 0 else 0.0
+
+                stages[stage] = {
+                    "total": self._totals[stage],
+                    **counts,
+                    "per_second": round(per_second, 2)
+                }
+
+                # The slowest stage with work left bounds the remaining time.
+                if remaining:
+                    if per_second > 0 and eta is not None:
+                        eta = max(eta, remaining / per_second)
+                    else:
+                        eta = None
+
+            return {
+                "stage": self.stage,
+                "elapsed_seconds": round(now - self.started_at, 2),
+                "eta_seconds": round(eta, 1) if eta is not None else None,
+                "stages": stages
+            }
+
+    def _notify(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
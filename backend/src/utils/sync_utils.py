@@ -1,21 +1,50 @@
-def build_sync_plan(frontend_page_ids: list[str], existing_page_ids: set[str]) -> dict[str, list[str]]:
+def build_sync_plan(
+    frontend_page_ids: list[str],
+    existing_page_ids: set[str],
+    existing_versions: dict[str, int | None] | None = None,
+    current_versions: dict[str, int] | None = None
+) -> dict[str, list[str]]:
     """
     Compares the current files in the vector store and the list received from the frontend,
-    to build a plan which pages to add/update and which one to delete.
+    to build a plan which pages to add, update, leave unchanged and delete.
+
+    A page that is already in the vector store is updated when its current Confluence version
+    differs from the uploaded one, or when either version is unknown. Without version
+    information, pages already in the vector store are left unchanged.
 
     Args:
         frontend_page_ids: List of page IDs from the frontend
         existing_page_ids: Set of page IDs currently in the vector store
+        existing_versions: Optional mapping of page ID to the version uploaded to the vector store
+        current_versions: Optional mapping of page ID to the current version in Confluence
 
     Returns:
-        A dictionary with two keys: "add_or_update" and "delete", each containing a list of page IDs.
+        A dictionary with the keys "add", "update", "unchanged" and "delete", each containing a list
+        of page IDs, plus "add_or_update" combining "add" and "update".
     """
     frontend_set = set(frontend_page_ids)
     
-    to_add_or_update = list(frontend_set - existing_page_ids)
+    to_add = list(frontend_set - existing_page_ids)
     to_delete = list(existing_page_ids - frontend_set)
+    to_update: list[str] = []
+    unchanged: list[str] = []
+
+    for page_id in frontend_set & existing_page_ids:
+        if existing_versions is None or current_versions is None:
+            unchanged.append(page_id)
+            continue
+
+        uploaded_version = existing_versions.get(page_id)
+        current_version = current_versions.get(page_id)
+        if uploaded_version is None or current_version is None or uploaded_version != current_version:
+            to_update.append(page_id)
+        else:
+            unchanged.append(page_id)
     
     return {
-        "add_or_update": to_add_or_update,
-        "delete": to_delete
-    }
\ No newline at end of file
+        "add": to_add,
+        "update": to_update,
+        "unchanged": unchanged,
+        "delete": to_delete,
+        "add_or_update": to_add + to_update
+    }
@@ -0,0 +1,348 @@
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import secrets
+import threading
+import time
+
+import requests
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from backend.src.utils.logger_init import setup_logging
+
+logger = setup_logging(__name__)
+
+T = TypeVar("T")
+
+# Directory and number of sync traces kept on disk.
+TRACE_DIR = os.getenv("SYNC_TRACE_DIR", "cache/traces")
+TRACE_RETENTION = int(os.getenv("SYNC_TRACE_RETENTION", "50"))
+# Per-page spans kept per trace; beyond that only the slowest are kept, so large syncs stay bounded in memory.
+MAX_PAGE_SPANS = int(os.getenv("SYNC_TRACE_MAX_PAGE_SPANS", "20000"))
+# OTLP/HTTP JSON endpoint of a collector (e.g. http://localhost:4318/v1/traces). Unset disables the export.
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or (
+    f"{os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT').rstrip('/')}/v1/traces" if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") else None
+)
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ai-knowledge-base-manager")
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: str | None, attributes: dict[str, Any], start_ns: int | None = None):
+        """One timed operation of a trace, e.g. a page fetch. Durations are measured on the wall clock."""
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """Increments a numeric attribute, e.g. the retries made within the span."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def __lt__(self, other: "Span") -> bool:
+        return self.duration_ns < other.duration_ns
+
+
+class _NoopSpan:
+    """Returned when no trace is active, so instrumented code does not need to check."""
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SyncTrace:
+    def __init__(self, name: str, trace_id: str | None = None, attributes: dict[str, Any] | None = None, max_page_spans: int | None = None):
+        """
+        Spans recorded during one sync, exported as a waterfall document or in OpenTelemetry (OTLP) format.
+
+        Stage and batch spans are always kept. Per-page spans (those with a page_id attribute)
+        are kept up to max_page_spans; beyond that only the slowest ones are, and the others are counted as dropped.
+
+        Args:
+            name: Name of the root span.
+            trace_id: 32 hex characters. Defaults to a random ID.
+            attributes: Attributes of the root span.
+            max_page_spans: Defaults to SYNC_TRACE_MAX_PAGE_SPANS.
+        """
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.max_page_spans = max_page_spans or MAX_PAGE_SPANS
+        self.root = Span(name, None, dict(attributes or {}))
+        self.dropped_spans = 0
+        self._spans: list[Span] = []
+        self._page_spans: list[Span] = []  # Min-heap by duration
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Span | None, attributes: dict[str, Any], start_ns: int | None = None) -> Span:
+        return Span(name, (parent or self.root).span_id, attributes, start_ns)
+
+    def end_span(self, span: Span, end_ns: int | None = None) -> None:
+        span.end_ns = end_ns or time.time_ns()
+        with self._lock:
+            if "page_id" not in span.attributes:
+                self._spans.append(span)
+            elif len(self._page_spans) < self.max_page_spans:
+                heapq.heappush(self._page_spans, span)
+            else:
+                heapq.heappushpop(self._page_spans, span)
+                self.dropped_spans += 1
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.root.end_ns = time.time_ns()
+        if error is not None:
+            self.root.error = str(error) or type(error).__name__
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Waterfall document: spans ordered by start time with their offset and duration in
+        milliseconds from the start of the sync, plus the slowest page spans per span name.
+        """
+        with self._lock:
+            spans = [self.root, *self._spans, *self._page_spans]
+            dropped = self.dropped_spans
+        spans.sort(key=lambda span: span.start_ns)
+
+        depths = {self.root.span_id: 0}
+        for span in spans:
+            if span.parent_id is not None:
+                depths[span.span_id] = depths.get(span.parent_id, 0) + 1
+
+        slowest: dict[str, list[Span]] = {}
+        for name, group in itertools.groupby(
+            sorted((s for s in spans if "page_id" in s.attributes), key=lambda s: s.name), key=lambda s: s.name
+        ):
+            slowest[name] = heapq.nlargest(10, group, key=lambda s: s.duration_ns)
+
+        started = self.root.start_ns
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "start_unix_nano": started,
+            "duration_ms": _ms(self.root.duration_ns),
+            "status": "error" if self.root.error else "ok",
+            "error": self.root.error,
+            "attributes": self.root.attributes,
+            "span_count": len(spans),
+            "dropped_spans": dropped,
+            "slowest": {
+                name: [{"span_id": s.span_id, "page_id": s.attributes["page_id"], "duration_ms": _ms(s.duration_ns)} for s in group]
+                for name, group in slowest.items()
+            },
+            "spans": [
+                {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "name": span.name,
+                    "depth": depths[span.span_id],
+                    "start_ms": _ms(span.start_ns - started),
+                    "duration_ms": _ms(span.duration_ns),
+                    "status": "error" if span.error else "ok",
+                    "error": span.error,
+                    "attributes": span.attributes
+                }
+                for span in spans
+            ]
+        }
+
+
+def _ms(nanoseconds: int) -> float:
+    return round(nanoseconds / 1_000_000, 3)
+
+
+_current_trace: contextvars.ContextVar[SyncTrace | None] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_trace(name: str, trace_id: str | None = None, store: "TraceStore | None" = None, **attributes: Any) -> Iterator[SyncTrace]:
+    """
+    Records the spans of the enclosed block, and of work it hands to threads through in_context, in a new trace.
+
+    Once the block exits the trace is saved to the store, if any, and exported to the OTLP collector when configured.
+    """
+    trace = SyncTrace(name, trace_id, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    error: BaseException | None = None
+    try:
+        yield trace
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.finish(error)
+        if store is not None:
+            store.save(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Times the enclosed block as a child of the current span. A no-op outside of a trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    current = trace.start_span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = str(e) or type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        trace.end_span(current)
+
+
+def record_span(name: str, start_ns: int, end_ns: int | None = None, **attributes: Any) -> None:
+    """Records an operation timed elsewhere (e.g. in a worker process) as a child of the current span."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.end_span(trace.start_span(name, _current_span.get(), attributes, start_ns), end_ns)
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current_span.get() or _NOOP_SPAN
+
+
+def in_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wraps func to run in a copy of the caller's trace context, for thread pools and threads
+    (which start with an empty context). Each call gets its own copy, so the wrapper can run
+    on several threads at once.
+    """
+    if _current_trace.get() is None:
+        return func
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs) -> T:
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+class TraceStore:
+    def __init__(self, directory: str | None = None, retention: int | None = None, otlp_endpoint: str | None = None):
+        """
+        Keeps the most recent sync traces on disk as waterfall documents, one JSON file per trace.
+
+        Args:
+            directory: Defaults to SYNC_TRACE_DIR.
+            retention: Number of traces kept. Defaults to SYNC_TRACE_RETENTION.
+            otlp_endpoint: Collector every saved trace is also exported to. Defaults to OTEL_EXPORTER_OTLP_(TRACES_)ENDPOINT.
+        """
+        self.directory = Path(directory or TRACE_DIR)
+        self.retention = retention or TRACE_RETENTION
+        self.otlp_endpoint = otlp_endpoint or OTLP_ENDPOINT
+        self._lock = threading.Lock()
+
+    def save(self, trace: SyncTrace) -> None:
+        document = trace.to_dict()
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.directory / f"{trace.trace_id}.json.tmp"
+                tmp_path.write_text(json.dumps(document, separators=(",", ":")), encoding="utf-8")
+                tmp_path.replace(self.directory / f"{trace.trace_id}.json")
+                self._prune()
+        except OSError:
+            logger.error(f"Failed to save trace {trace.trace_id}", exc_info=True)
+
+        if self.otlp_endpoint:
+            threading.Thread(
+                target=export_otlp, args=(document, self.otlp_endpoint), name="otlp-export", daemon=True
+            ).start()
+
+    def load(self, trace_id: str) -> dict[str, Any] | None:
+        if not trace_id.isalnum():
+            return None
+        path = self.directory / f"{trace_id}.json"
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def _prune(self) -> None:
+        """Deletes the oldest traces beyond the retention limit. Called with the lock held."""
+        traces = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in traces[:max(len(traces) - self.retention, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def to_otlp(document: dict[str, Any]) -> dict[str, Any]:
+    """Converts a waterfall document to an OTLP/JSON ExportTraceServiceRequest."""
+    started = document["start_unix_nano"]
+
+    def otlp_span(span: dict[str, Any]) -> dict[str, Any]:
+        start = started + int(span["start_ms"] * 1_000_000)
+        otlp = {
+            "traceId": document["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int(span["duration_ms"] * 1_000_000)),
+            "attributes": _otlp_attributes(span["attributes"]),
+            "status": {"code": 2, "message": span["error"]} if span["error"] else {"code": 1}
+        }
+        if span["parent_id"]:
+            otlp["parentSpanId"] = span["parent_id"]
+        return otlp
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": "backend.sync"},
+                "spans": [otlp_span(span) for span in document["spans"]]
+            }]
+        }]
+    }
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    def value(v: Any) -> dict[str, Any]:
+        if isinstance(v, bool):
+            return {"boolValue": v}
+        if isinstance(v, int):
+            return {"intValue": str(v)}
+        if isinstance(v, float):
+            return {"doubleValue": v}
+        return {"stringValue": str(v)}
+    return [{"key": key, "value": value(v)} for key, v in attributes.items() if v is not None]
+
+
+def export_otlp(document: dict[str, Any], endpoint: str) -> bool:
+    """Sends a trace to an OTLP/HTTP collector as JSON. Returns whether the collector accepted it."""
+    try:
+        response = requests.post(endpoint, json=to_otlp(document), timeout=10)
+        response.raise_for_status()
+        return True
+    except requests.RequestException as e:
+        logger.warning(f"Failed to export trace {document['trace_id']} to {endpoint}: {e}")
+        return False
+
+
+# Store of the sync traces served by the API.
+sync_trace_store = TraceStore()
@@ -0,0 +1,301 @@
+import base64
+import binascii
+import os
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from backend.src.clients.azure.azure_schemas import VectorStorePageFile, VectorStorePageList
+from backend.src.utils.logger_init import setup_logging
+
+logger = setup_logging(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vector_store_files (
+    vector_store_id TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    version INTEGER,
+    content_hash TEXT,
+    created_at INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    title TEXT,
+    space_key TEXT,
+    status TEXT,
+    PRIMARY KEY (vector_store_id, page_id)
+);
+CREATE TABLE IF NOT EXISTS vector_store_reconciles (
+    vector_store_id TEXT PRIMARY KEY,
+    reconciled_at REAL NOT NULL
+);
+"""
+
+# Columns added after the first release, added to existing databases on open.
+MIGRATED_COLUMNS = {"title": "TEXT", "space_key": "TEXT", "status": "TEXT"}
+
+# Created after the migration, as they cover migrated columns. Page listings are ordered by page ID,
+# so the filtered listings end with it to page through a filter without sorting.
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_vector_store_files_file_id ON vector_store_files (vector_store_id, file_id);
+CREATE INDEX IF NOT EXISTS idx_vector_store_files_space ON vector_store_files (vector_store_id, space_key, page_id);
+CREATE INDEX IF NOT EXISTS idx_vector_store_files_status ON vector_store_files (vector_store_id, status, page_id);
+CREATE INDEX IF NOT EXISTS idx_vector_store_files_title ON vector_store_files (vector_store_id, title COLLATE NOCASE);
+"""
+
+COLUMNS = "page_id, file_id, filename, version, content_hash, created_at, title, space_key, status, synced_at"
+
+class VectorStoreIndex:
+    def __init__(self, db_path: str | None = None):
+        """
+        Persistent local index of the Confluence pages in each vector store,
+        mapping (vector store ID, page ID) to the file, version and content hash uploaded.
+
+        The connection is opened lazily on first use.
+
+        Args:
+            db_path: Path of the SQLite database. Defaults to VECTOR_STORE_INDEX_PATH.
+        """
+        self.db_path = db_path or os.getenv("VECTOR_STORE_INDEX_PATH", "cache/vector_store_index.db")
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(vector_store_files)")}
+            for column, column_type in MIGRATED_COLUMNS.items():
+                if column not in existing_columns:
+                    conn.execute(f"ALTER TABLE vector_store_files ADD COLUMN {column} {column_type}")
+            conn.executescript(INDEXES)
+            self._conn = conn
+            logger.info(f"Opened vector store index at {self.db_path}.")
+        return self._conn
+
+    def is_reconciled(self, vector_store_id: str) -> bool:
+        """Returns True once the index of this vector store has been checked against Azure."""
+        return self.reconciled_at(vector_store_id) is not None
+
+    def reconciled_at(self, vector_store_id: str) -> float | None:
+        """Returns the time of the last reconcile of this vector store, if any."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT reconciled_at FROM vector_store_reconciles WHERE vector_store_id = ?",
+                (vector_store_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_pages(self, vector_store_id: str) -> dict[str, VectorStorePageFile]:
+        """Returns the indexed pages of a vector store, keyed by page ID."""
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT {COLUMNS} FROM vector_store_files WHERE vector_store_id = ?",
+                (vector_store_id,)
+            ).fetchall()
+
+        return {row[0]: _to_page_file(row) for row in rows}
+
+    def query_pages(
+        self,
+        vector_store_id: str,
+        limit: int,
+        cursor: str | None = None,
+        space_key: str | None = None,
+        title_prefix: str | None = None,
+        status: str | None = None,
+        synced_after: float | None = None,
+        synced_before: float | None = None
+    ) -> VectorStorePageList:
+        """
+        Returns one result page of the indexed pages of a vector store, ordered by page ID.
+
+        Uses keyset pagination: the cursor holds the last page ID returned, so every result page
+        is an index range scan, however deep into the listing it is.
+
+        Args:
+            limit: Maximum number of pages returned.
+            cursor: next_cursor of the previous result page, None for the first one.
+            space_key: Only pages of this Confluence space.
+            title_prefix: Only pages whose title starts with this prefix, ignoring case.
+            status: Only files with this indexing status (in_progress, completed, failed, cancelled).
+            synced_after / synced_before: Only files uploaded or reconciled in this range, in seconds since the epoch.
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        conditions = ["vector_store_id = ?"]
+        params: list = [vector_store_id]
+        if space_key is not None:
+            conditions.append("space_key = ?")
+            params.append(space_key)
+        if title_prefix:
+            escaped = title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("title LIKE ? ESCAPE '\\'")
+            params.append(f"{escaped}%")
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if synced_after is not None:
+            conditions.append("synced_at >= ?")
+            params.append(synced_after)
+        if synced_before is not None:
+            conditions.append("synced_at < ?")
+            params.append(synced_before)
+
+        where = " AND ".join(conditions)
+        page_where, page_params = where, list(params)
+        if cursor is not None:
+            page_where += " AND page_id > ?"
+            page_params.append(decode_cursor(cursor))
+
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(f"SELECT COUNT(*) FROM vector_store_files WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM vector_store_files WHERE {page_where} ORDER BY page_id LIMIT ?",
+                (*page_params, limit + 1)
+            ).fetchall()
+
+        items = [_to_page_file(row) for row in rows[:limit]]
+        return VectorStorePageList(
+            items=items,
+            total=total,
+            next_cursor=encode_cursor(items[-1].page_id) if len(rows) > limit else None
+        )
+
+    def upsert(self, vector_store_id: str, files: Iterable[VectorStorePageFile]) -> None:
+        """Adds or replaces the indexed file of each page."""
+        now = time.time()
+        rows = [_to_row(vector_store_id, f, now) for f in files]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO vector_store_files "
+                    "(vector_store_id, page_id, file_id, filename, version, content_hash, created_at, synced_at, title, space_key, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def set_status(self, vector_store_id: str, file_ids: Iterable[str], status: str) -> None:
+        """Updates the indexing status of files, e.g. once their batch completed."""
+        rows = [(status, vector_store_id, file_id) for file_id in file_ids]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE vector_store_files SET status = ? WHERE vector_store_id = ? AND file_id = ?",
+                    rows
+                )
+
+    def remove_files(self, vector_store_id: str, file_ids: Iterable[str]) -> None:
+        """
+        Removes pages by file ID.
+
+        NOTE: Removing by file ID (not page ID) keeps the entry of a page whose
+        replacement file was already indexed when the old file is deleted.
+        """
+        rows = [(vector_store_id, file_id) for file_id in file_ids]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM vector_store_files WHERE vector_store_id = ? AND file_id = ?",
+                    rows
+                )
+
+    def replace(self, vector_store_id: str, files: dict[str, VectorStorePageFile]) -> dict[str, int]:
+        """
+        Replaces the index of a vector store with a fresh listing from Azure and marks it reconciled.
+        The space of a page is not part of the listing and is kept from the previous index.
+
+        Returns:
+            Counts of pages "added", "removed" and "changed" compared to the previous index.
+        """
+        previous = self.get_pages(vector_store_id)
+        now = time.time()
+        rows = [
+            _to_row(vector_store_id, f if f.space_key or f.page_id not in previous else f.model_copy(
+                update={"space_key": previous[f.page_id].space_key}
+            ), now)
+            for f in files.values()
+        ]
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM vector_store_files WHERE vector_store_id = ?", (vector_store_id,))
+                conn.executemany(
+                    "INSERT INTO vector_store_files "
+                    "(vector_store_id, page_id, file_id, filename, version, content_hash, created_at, synced_at, title, space_key, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO vector_store_reconciles (vector_store_id, reconciled_at) VALUES (?, ?)",
+                    (vector_store_id, now)
+                )
+
+        return {
+            "added": len(files.keys() - previous.keys()),
+            "removed": len(previous.keys() - files.keys()),
+            "changed": sum(
+                1 for page_id in files.keys() & previous.keys()
+                if files[page_id].file_id != previous[page_id].file_id
+            )
+        }
+
+
+def _to_epoch(value: datetime | int) -> int:
+    return int(value.timestamp()) if isinstance(value, datetime) else int(value)
+
+
+def _to_row(vector_store_id: str, f: VectorStorePageFile, synced_at: float) -> tuple:
+    return (
+        vector_store_id, f.page_id, f.file_id, f.filename, f.version, f.content_hash,
+        _to_epoch(f.created_at), synced_at, f.title, f.space_key, f.status
+    )
+
+
+def _to_page_file(row: tuple) -> VectorStorePageFile:
+    return VectorStorePageFile(
+        page_id=row[0],
+        file_id=row[1],
+        filename=row[2],
+        version=row[3],
+        content_hash=row[4],
+        created_at=row[5],
+        title=row[6],
+        space_key=row[7],
+        status=row[8],
+        synced_at=row[9]
+    )
+
+
+def encode_cursor(page_id: str) -> str:
+    """Opaque pagination cursor pointing after the given page ID."""
+    return base64.urlsafe_b64encode(page_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor {cursor!r}.")
+
+
+# Create a single instance of the index to be used throughout the application.
+vector_store_index = VectorStoreIndex()
@@ -0,0 +1,98 @@
+import gzip
+import json
+
+from typing import Any
+
+from backend.src.clients.confluence.confluence_schemas import ConfluenceSpaceCatalog
+
+try:
+    import orjson
+except ImportError:  # Optional, the standard library encoder is used without it.
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional, responses are compressed with gzip only without it.
+    brotli = None
+
+# Formats of the catalog served by /v1/confluence/catalog.
+CATALOG_FORMATS = ("nested", "compact")
+# Compression levels of cached response bodies; they are compressed once per catalog build.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+
+def dumps(value: Any) -> bytes:
+    """Encodes a value as compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def to_compact(catalog: list[ConfluenceSpaceCatalog]) -> list[dict[str, Any]]:
+    """
+    Columnar form of the catalog: per space, parallel arrays of page IDs, titles and parent indexes.
+
+    Pages are listed depth first, so every parent comes before its children and siblings keep
+    their order. parents[i] is the index of the parent of page i within the space, -1 for root pages.
+    No keys are repeated per page, which makes the body a fraction of the nested tree and fast to encode and parse.
+    """
+    spaces = []
+    for space in catalog:
+        ids: list[str] = []
+        titles: list[str] = []
+        parents: list[int] = []
+        stack = [(node, -1) for node in reversed(space["pages"])]
+        while stack:
+            node, parent = stack.pop()
+            index = len(ids)
+            ids.append(node["id"])
+            titles.append(node["title"])
+            parents.append(parent)
+            stack.extend((child, index) for child in reversed(node["children"]))
+
+        spaces.append({
+            "id": space["id"],
+            "key": space["key"],
+            "name": space["name"],
+            "ids": ids,
+            "titles": titles,
+            "parents": parents
+        })
+    return spaces
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Picks br (when brotli is installed) or gzip from an Accept-Encoding header; None to send the body as is."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compresses a body for the Content-Encoding chosen by negotiate_encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
@@ -18,9 +18,12 @@ import { useToast } from "@/hooks/use-toast";
 
 // --- Configuration ---
 const ADD_LIMIT = 100;
+const SYNC_POLL_INTERVAL_MS = 2000;
+const VECTOR_STORE_PAGES_PAGE_SIZE = 1000;
+const CATALOG_TREE_PAGE_SIZE = 1000;
 
 // Module-scope cache that stores data per vector store
-const catalogCache: Map<string, { spaces: ConfluenceSpace[]; enabledPageIds: string[] }> = new Map();
+const catalogCache: Map<string, { spaces: ConfluenceSpace[]; enabledPageIds: string[]; pageSpaceKeys: Map<string, string> }> = new Map();
 const fetchingStores = new Set<string>();
 
 // --- TypeScript Interfaces ---
@@ -35,9 +38,62 @@ interface ConfluenceSpace {
   id: string;
   name: string;
   key: string;
+  page_count: number | null;
   pages: ConfluencePage[];
+  loaded: boolean; // pages are fetched when the space is first expanded or toggled
 }
 
+interface VectorStorePage {
+  page_id: string;
+  space_key: string | null;
+}
+
+interface VectorStorePageList {
+  items: VectorStorePage[];
+  total: number;
+  next_cursor: string | null;
+}
+
+// Follows the cursor of /v1/vectorstore/{id}/pages until every page of the store is loaded.
+const fetchVectorStorePages = async (vectorStoreId: string): Promise<VectorStorePage[]> => {
+  const pages: VectorStorePage[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: String(VECTOR_STORE_PAGES_PAGE_SIZE) });
+    if (cursor) params.set("cursor", cursor);
+    const response = await fetch(`http://127.0.0.1:8000/v1/vectorstore/${vectorStoreId}/pages?${params}`);
+    const json = await response.json();
+    if (json.status !== "success") throw new Error(json.message || "Failed to fetch vector store pages");
+    const result: VectorStorePageList = json.data;
+    pages.push(...result.items);
+    cursor = result.next_cursor;
+  } while (cursor);
+  return pages;
+};
+
+interface ConfluencePageLevel {
+  items: ConfluencePage[];
+  total: number;
+  next_cursor: string | null;
+}
+
+// Loads the whole page tree of one space, following the cursor over its root pages.
+const fetchSpacePages = async (spaceId: string): Promise<ConfluencePage[]> => {
+  const pages: ConfluencePage[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ depth: "0", limit: String(CATALOG_TREE_PAGE_SIZE) });
+    if (cursor) params.set("cursor", cursor);
+    const response = await fetch(`http://127.0.0.1:8000/v1/confluence/spaces/${spaceId}/pages?${params}`);
+    const json = await response.json();
+    if (json.status !== "success") throw new Error(json.message || "Failed to fetch space pages");
+    const result: ConfluencePageLevel = json.data;
+    pages.push(...result.items);
+    cursor = result.next_cursor;
+  } while (cursor);
+  return pages;
+};
+
 interface ToggleState {
   checked: boolean;
   indeterminate: boolean;
@@ -61,6 +117,9 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
   const { toast } = useToast();
   const parentMapsRef = useRef<{ pageToParent: Map<string, string>; pageToSpace: Map<string, string> } | null>(null);
   const parentPageIdsRef = useRef<Set<string>>(new Set());
+  const loadingSpacesRef = useRef<Map<string, Promise<ConfluencePage[] | null>>>(new Map());
+  // Space key of each page in the vector store, for the state of spaces whose pages are not loaded yet
+  const pageSpaceKeysRef = useRef<Map<string, string>>(new Map());
 
   const syncChanges = useMemo(() => {
     const parentIds = parentPageIdsRef.current;
@@ -98,6 +157,7 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
     };
   }, [enabledPageIds, originalPageIds]);
 
+  // Rebuilds the page maps whenever a space's pages are loaded
   useEffect(() => {
     const buildTreeMetadata = (spacesToMap: ConfluenceSpace[]) => {
       const pageToParent = new Map<string, string>();
@@ -120,7 +180,14 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
       parentMapsRef.current = { pageToParent, pageToSpace };
       parentPageIdsRef.current = parentIds;
     };
-    
+
+    buildTreeMetadata(spaces);
+    if (vectorStoreId && catalogCache.has(vectorStoreId)) {
+      catalogCache.get(vectorStoreId)!.spaces = spaces;
+    }
+  }, [spaces, vectorStoreId]);
+
+  useEffect(() => {
     const fetchData = async () => {
       if (!vectorStoreId) { 
         setLoading(false); 
@@ -131,6 +198,7 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
       try {
         let fetchedSpaces: ConfluenceSpace[];
         let fetchedPageIds: string[];
+        let fetchedPageSpaceKeys: Map<string, string>;
 
         // Check if we have cached data for THIS specific vector store
         const cachedData = catalogCache.get(vectorStoreId);
@@ -138,32 +206,38 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
         if (cachedData) {
           fetchedSpaces = cachedData.spaces;
           fetchedPageIds = cachedData.enabledPageIds;
+          fetchedPageSpaceKeys = cachedData.pageSpaceKeys;
         } else {
           // Prevent duplicate fetches for the same vector store
           if (fetchingStores.has(vectorStoreId)) return;
           fetchingStores.add(vectorStoreId);
           
-          const [catalogRes, existingRes] = await Promise.all([
-            fetch(`http://127.0.0.1:8000/v1/confluence/catalog`),
-            fetch(`http://127.0.0.1:8000/v1/vectorstore/${vectorStoreId}/pages`)
+          // Only the spaces are listed up front; their pages load when a space is expanded
+          const [spacesRes, existingPages] = await Promise.all([
+            fetch(`http://127.0.0.1:8000/v1/confluence/spaces`),
+            fetchVectorStorePages(vectorStoreId)
           ]);
 
-          const catalogJson = await catalogRes.json();
-          const existingJson = await existingRes.json();
+          const spacesJson = await spacesRes.json();
 
-          fetchedSpaces = catalogJson.status === "success" ? catalogJson.data : [];
-          fetchedPageIds = existingJson.status === "success" && Array.isArray(existingJson.data) ? existingJson.data : [];
+          fetchedSpaces = spacesJson.status === "success"
+            ? spacesJson.data.map((space: ConfluenceSpace) => ({ ...space, pages: [], loaded: false }))
+            : [];
+          fetchedPageIds = existingPages.map(page => page.page_id);
+          fetchedPageSpaceKeys = new Map(
+            existingPages.filter(page => page.space_key).map(page => [page.page_id, page.space_key!])
+          );
           
           // Store in cache with vector store ID as key
-          catalogCache.set(vectorStoreId, { spaces: fetchedSpaces, enabledPageIds: fetchedPageIds });
+          catalogCache.set(vectorStoreId, { spaces: fetchedSpaces, enabledPageIds: fetchedPageIds, pageSpaceKeys: fetchedPageSpaceKeys });
           fetchingStores.delete(vectorStoreId);
         }
         
         const initialPageIdsSet = new Set(fetchedPageIds);
+        pageSpaceKeysRef.current = fetchedPageSpaceKeys;
         setSpaces(fetchedSpaces);
         setEnabledPageIds(initialPageIdsSet);
         setOriginalPageIds(initialPageIdsSet);
-        buildTreeMetadata(fetchedSpaces);
 
       } catch (error) {
         console.error("Failed to fetch catalog or existing pages", error);
@@ -223,7 +297,43 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
     return () => clearTimeout(handler);
   }, [searchTerm, searchPageId, spaces]);
 
-  const toggleSpace = (spaceId: string) => {
+  // Concurrent calls for the same space share one request.
+  const loadSpace = (space: ConfluenceSpace): Promise<ConfluencePage[] | null> => {
+    if (space.loaded) return Promise.resolve(space.pages);
+    const pending = loadingSpacesRef.current.get(space.id);
+    if (pending) return pending;
+    const request = fetchAndStoreSpace(space);
+    loadingSpacesRef.current.set(space.id, request);
+    return request;
+  };
+
+  const fetchAndStoreSpace = async (space: ConfluenceSpace): Promise<ConfluencePage[] | null> => {
+    try {
+      const pages = await fetchSpacePages(space.id);
+      const pageCount = getAllPageIds(pages).length;
+      setSpaces(prev => prev.map(s => s.id === space.id ? { ...s, pages, page_count: pageCount, loaded: true } : s));
+      return pages;
+    } catch (error) {
+      console.error(`Failed to fetch pages of space ${space.key}`, error);
+      toast({
+        title: "Failed to load space",
+        description: `Could not load the pages of ${space.name}.`,
+        variant: "destructive",
+      });
+      setExpandedSpaces(prev => {
+        const newSet = new Set(prev);
+        newSet.delete(space.id);
+        return newSet;
+      });
+      return null;
+    } finally {
+      loadingSpacesRef.current.delete(space.id);
+    }
+  };
+
+  const toggleSpace = (space: ConfluenceSpace) => {
+    const spaceId = space.id;
+    if (!expandedSpaces.has(spaceId)) loadSpace(space);
     setExpandedSpaces(prev => {
       const newSet = new Set(prev);
       if (newSet.has(spaceId)) newSet.delete(spaceId); else newSet.add(spaceId);
@@ -258,7 +368,9 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
     });
   };
 
-  const toggleSpaceEnabled = (spaceId: string, enabled: boolean, space: ConfluenceSpace) => {
+  const toggleSpaceEnabled = async (spaceId: string, enabled: boolean, space: ConfluenceSpace) => {
+    const pages = await loadSpace(space);
+    if (!pages) return;
     setEnabledPageIds(prev => {
       const newSet = new Set(prev);
       const toggleAllPagesInSpace = (pages: ConfluencePage[], enable: boolean) => {
@@ -267,7 +379,7 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
           toggleAllPagesInSpace(page.children, enable);
         });
       };
-      toggleAllPagesInSpace(space.pages, enabled);
+      toggleAllPagesInSpace(pages, enabled);
       return newSet;
     });
   };
@@ -280,7 +392,23 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
     return [page.id, ...page.children.flatMap(child => getAllPageIdsInTree(child))];
   };
 
+  // Enabled pages per space key, counted from the vector store's space keys for spaces not loaded yet
+  const enabledCountBySpaceKey = useMemo(() => {
+    const counts = new Map<string, number>();
+    enabledPageIds.forEach(id => {
+      const spaceKey = pageSpaceKeysRef.current.get(id);
+      if (spaceKey) counts.set(spaceKey, (counts.get(spaceKey) ?? 0) + 1);
+    });
+    return counts;
+  }, [enabledPageIds]);
+
   const getSpaceToggleState = (space: ConfluenceSpace): ToggleState => {
+    if (!space.loaded) {
+      const enabledCount = enabledCountBySpaceKey.get(space.key) ?? 0;
+      if (enabledCount === 0) return { checked: false, indeterminate: false };
+      if (enabledCount === space.page_count) return { checked: true, indeterminate: false };
+      return { checked: false, indeterminate: true };
+    }
     const allPageIds = getAllPageIds(space.pages);
     if (allPageIds.length === 0) return { checked: false, indeterminate: false };
     const enabledCount = allPageIds.filter(id => enabledPageIds.has(id)).length;
@@ -300,6 +428,22 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
     return { checked: false, indeterminate: true };
   };
 
+  // Sync runs as a background job on the server; poll it until it finishes.
+  const waitForSyncJob = async (jobId: string) => {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, SYNC_POLL_INTERVAL_MS));
+      const response = await fetch(`http://127.0.0.1:8000/v1/pages/sync-jobs/${jobId}`);
+      const job = await response.json();
+      if (job.status !== "success") return job;
+      if (job.data.status === "succeeded") {
+        return { status: "success", data: job.data.result, message: job.message };
+      }
+      if (job.data.status === "failed") {
+        return { status: "error", data: {}, message: job.data.error };
+      }
+    }
+  };
+
   const handleSync = async () => {
     setSyncing(true);
     try {
@@ -319,7 +463,10 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
         body: JSON.stringify(payload),
       });
 
-      const result = await response.json();
+      const started = await response.json();
+      const result = started.status === "success"
+        ? await waitForSyncJob(started.data.job_id)
+        : started;
       if (result.status === "success") {
         toast({
           title: "Sync completed",
@@ -345,7 +492,8 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
 
   const filteredSpaces = spaces.filter(space => {
     if (selectedSpace !== "all" && space.id !== selectedSpace) return false;
-    if (searchTerm.trim() || searchPageId.trim()) {
+    // Spaces not loaded yet cannot be searched, so they stay listed
+    if (space.loaded && (searchTerm.trim() || searchPageId.trim())) {
       const hasMatchingPage = (pages: ConfluencePage[]): boolean => {
         return pages.some(page => {
           const titleMatch = searchTerm ? page.title.toLowerCase().includes(searchTerm.trim().toLowerCase()) : true;
@@ -513,7 +661,7 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
                 <div key={space.id} className="border border-admin-border rounded-lg p-4">
                   <div className="flex items-center gap-2 mb-4">
                     <button
-                      onClick={() => toggleSpace(space.id)}
+                      onClick={() => toggleSpace(space)}
                       className="p-1 hover:bg-muted rounded"
                     >
                       {expandedSpaces.has(space.id) ? <ChevronDown className="h-5 w-5" /> : <ChevronRight className="h-5 w-5" />}
@@ -521,6 +669,7 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
                     <Folder className={`h-5 w-5 ${spaceToggleState.indeterminate ? 'text-orange-500' : spaceToggleState.checked ? 'text-primary' : 'text-muted-foreground'}`} />
                     <span className="font-medium flex-1">{space.name}</span>
                     <Badge variant="secondary">{space.key}</Badge>
+                    {space.page_count !== null && <Badge variant="outline" className="text-xs">{space.page_count} pages</Badge>}
                     {spaceToggleState.indeterminate && <Badge variant="outline" className="text-xs">Partial</Badge>}
                     <IndeterminateCheckbox
                       checked={spaceToggleState.checked}
@@ -534,7 +683,9 @@ const ConfluenceTab = ({ vectorStoreId }: ConfluenceTabProps) => {
                   
                   {expandedSpaces.has(space.id) && (
                     <div className="mt-4 space-y-1">
-                      {space.pages.map(page => renderPage(page))}
+                      {space.loaded
+                        ? space.pages.map(page => renderPage(page))
+                        : <p className="text-sm text-muted-foreground px-3">Loading pages...</p>}
                     </div>
                   )}
                 </div>